@@ -14,13 +14,17 @@ from src.inference_examples import (
     example_batch_test,
     example_compare_variations,
 )
+from src.predictor import PillarPredictor
 
 
 if __name__ == "__main__":
-    example_single_prediction()
+    # Carrega os modelos uma única vez para todos os exemplos
+    predictor = PillarPredictor()
+    
+    example_single_prediction(predictor)
     print("\n" * 2)
     
-    example_batch_test()
+    example_batch_test(predictor)
     print("\n" * 2)
     
-    example_compare_variations()
\ No newline at end of file
+    example_compare_variations(predictor)
\ No newline at end of file
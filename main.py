@@ -1,6 +1,21 @@
 """
 Main script: Two-Stage Training Pipeline (Classifier + Regressor)
+
+Uso:
+    python main.py                    # parse + features + binning a cada execução
+    python main.py --reuse-datasets   # reaproveita X (float32, mmap) e os binários lgb.Dataset
+    python main.py --params models/tuning/best_params.json   # parâmetros de run_tuning.py
+    python main.py --concurrent       # treina os dois estágios ao mesmo tempo (processos)
 """
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 import lightgbm as lgb
 from src.config import (
@@ -9,7 +24,6 @@ from src.config import (
 )
 from src.data_loader import get_data_info, load_dataset
 from src.feature_engineering import (
-    create_engineered_features,
     create_target_variable,
     prepare_features,
 )
@@ -18,14 +32,19 @@ from src.model_trainer import (
     evaluate_regressor,
     split_data, 
     save_model, 
-    print_feature_importance
+    print_feature_importance,
+    train_booster,
 )
-from src.utils import print_separator, setup_logger
+from src.training_data import load_training_data
+from src.tuning import load_tuned_params
+from src.utils import print_separator, setup_logger, timed
 
 logger = setup_logger(__name__)
 
+STAGES = ('classifier', 'regressor')
 
-def train_classifier(df: pd.DataFrame, X: pd.DataFrame) -> lgb.LGBMClassifier:
+
+def train_classifier(df: pd.DataFrame, X: pd.DataFrame, params: dict = None) -> lgb.LGBMClassifier:
     """
     Trains the Feasibility Classifier.
     Predicts if a pillar configuration is viable (1) or will fail (0).
@@ -39,7 +58,7 @@ def train_classifier(df: pd.DataFrame, X: pd.DataFrame) -> lgb.LGBMClassifier:
     X_train, X_val, y_train, y_val = split_data(X, y)
     
     # Initialize and Train
-    model = lgb.LGBMClassifier(**CLASSIFIER_PARAMS)
+    model = lgb.LGBMClassifier(**(params or CLASSIFIER_PARAMS))
     model.fit(
         X_train, y_train,
         eval_set=[(X_val, y_val)],
@@ -62,7 +81,7 @@ def train_classifier(df: pd.DataFrame, X: pd.DataFrame) -> lgb.LGBMClassifier:
     return model
 
 
-def train_regressor(df: pd.DataFrame, X: pd.DataFrame) -> lgb.LGBMRegressor:
+def train_regressor(df: pd.DataFrame, X: pd.DataFrame, params: dict = None) -> lgb.LGBMRegressor:
     """
     Trains the Steel Area Regressor.
     Predicts 'rho' (steel ratio) ONLY for feasible pillars.
@@ -89,7 +108,7 @@ def train_regressor(df: pd.DataFrame, X: pd.DataFrame) -> lgb.LGBMRegressor:
     df_val_original = df_original_feasible.loc[X_val.index]
     
     # Initialize and Train
-    model = lgb.LGBMRegressor(**REGRESSOR_PARAMS)
+    model = lgb.LGBMRegressor(**(params or REGRESSOR_PARAMS))
     model.fit(
         X_train, y_train,
         eval_set=[(X_val, y_val)],
@@ -111,37 +130,212 @@ def train_regressor(df: pd.DataFrame, X: pd.DataFrame) -> lgb.LGBMRegressor:
     return model
 
 
-def main() -> None:
+def train_classifier_from_datasets(data: dict, params: dict = None):
+    """
+    Stage 1 on the prebuilt lgb.Dataset binaries (see src/training_data.py).
+    """
+    print_separator("STAGE 1: TRAINING CLASSIFIER (FEASIBILITY)")
+    
+    stage = data['classifier']
+    model = train_booster(params or CLASSIFIER_PARAMS, stage['train'], stage['valid'], classifier=True)
+    
+    # Evaluate (rows of the memory-mapped feature matrix)
+    X_val = pd.DataFrame(data['X'][stage['val_idx']], columns=FEATURE_COLUMNS)
+    y_val = data['labels']['is_feasible'][stage['val_idx']]
+    evaluate_classifier(model, X_val, y_val)
+    
+    save_model(model, str(MODEL_PATH_CLASSIFIER))
+    
+    print("Classifier Feature Importance:")
+    print_feature_importance(model, FEATURE_COLUMNS, top_n=5)
+    
+    return model
+
+
+def train_regressor_from_datasets(data: dict, params: dict = None):
+    """
+    Stage 2 on the prebuilt lgb.Dataset binaries (feasible rows only).
+    """
+    print_separator("STAGE 2: TRAINING REGRESSOR (STEEL AREA)")
+    
+    stage = data['regressor']
+    print(f"Training Regressor on {len(stage['train_idx']) + len(stage['val_idx'])} feasible samples.")
+    model = train_booster(params or REGRESSOR_PARAMS, stage['train'], stage['valid'], classifier=False)
+    
+    val_idx = stage['val_idx']
+    labels = data['labels']
+    X_val = pd.DataFrame(data['X'][val_idx], columns=FEATURE_COLUMNS)
+    df_val_original = pd.DataFrame({'Ac': labels['Ac'][val_idx], 'As': labels['As'][val_idx]})
+    evaluate_regressor(model, X_val, labels['rho'][val_idx], df_val_original)
+    
+    print("Regressor Feature Importance:")
+    print_feature_importance(model, FEATURE_COLUMNS, top_n=10)
+    
+    save_model(model, str(MODEL_PATH_REGRESSOR))
+    return model
+
+
+def stage_threads() -> dict:
+    """LightGBM num_threads per stage when both stages train concurrently."""
+    cores = os.cpu_count() or 1
+    # O regressor (mais árvores e folhas) é o estágio longo: fica com a metade maior
+    n_classifier = max(1, cores // 2)
+    return {'classifier': n_classifier, 'regressor': max(1, cores - n_classifier)}
+
+
+def stage_training_data(data: dict, stage: str) -> dict:
+    """
+    Part of the training artifacts one stage needs, small enough to send to a
+    worker process: its (not yet constructed) lgb.Dataset binaries plus only
+    the validation rows of X and of the labels, re-indexed from 0.
+    """
+    val_idx = data[stage]['val_idx']
+    return {
+        'X': np.asarray(data['X'][val_idx]),
+        'labels': {name: values[val_idx] for name, values in data['labels'].items()},
+        stage: {**data[stage], 'val_idx': np.arange(len(val_idx))},
+    }
+
+
+def train_stage(stage: str, params: dict, num_threads: int = None, data: dict = None,
+                df: pd.DataFrame = None, X: pd.DataFrame = None, capture: bool = False) -> dict:
+    """
+    Train one stage and measure it.
+    
+    Args:
+        num_threads: Thread count forced on LightGBM (concurrent mode). Histograms
+                     are then built column-wise (force_col_wise), which keeps the
+                     trees independent of the thread split. None trains with the
+                     params unchanged (sequential mode).
+        data: Training artifacts (reuse-datasets mode)
+        df, X: Engineered frame and feature matrix (default mode)
+        capture: Return the console output instead of printing it (concurrent mode)
+    
+    Returns:
+        dict with 'wall' and 'cpu' seconds of the stage, 'threads' and 'output'
+    """
+    if num_threads is not None:
+        params = {**params, 'num_threads': num_threads, 'force_col_wise': True}
+    buffer = io.StringIO()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    
+    with contextlib.redirect_stdout(buffer) if capture else contextlib.nullcontext():
+        if df is None:
+            train = train_classifier_from_datasets if stage == 'classifier' else train_regressor_from_datasets
+            train(data, params)
+        else:
+            train = train_classifier if stage == 'classifier' else train_regressor
+            train(df, X, params)
+    
+    # process_time soma todas as threads do processo (OpenMP do LightGBM incluso)
+    return {
+        'wall': time.perf_counter() - start_wall,
+        'cpu': time.process_time() - start_cpu,
+        'threads': num_threads or os.cpu_count() or 1,
+        'output': buffer.getvalue(),
+    }
+
+
+def train_stages_concurrently(stage_params: dict, threads: dict, data: dict = None,
+                              df=None, X=None) -> dict:
+    """
+    Train both stages at the same time, one spawned process per stage.
+    Each process prints into a buffer; the outputs are shown in stage order.
+    With data (reuse-datasets mode), the artifacts loaded by the caller are
+    sent to each process (stage_training_data) instead of being reloaded there.
+    """
+    # 'spawn': o LightGBM/OpenMP não é seguro após fork (ver src/parallel.py)
+    with ProcessPoolExecutor(max_workers=len(STAGES),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {
+            stage: pool.submit(train_stage, stage, stage_params[stage], threads[stage],
+                               data=stage_training_data(data, stage) if data is not None else None,
+                               df=df, X=X, capture=True)
+            for stage in STAGES
+        }
+        stats = {stage: future.result() for stage, future in futures.items()}
+    
+    for stage in STAGES:
+        print(stats[stage]['output'], end='')
+    return stats
+
+
+def print_stage_usage(stats: dict, concurrent: bool) -> None:
+    print_separator(f"CPU PER STAGE ({'concurrent' if concurrent else 'sequential'}, "
+                    f"{os.cpu_count()} core(s))")
+    print(f"  {'stage':<12} {'threads':>7} {'wall':>9} {'cpu':>9} {'cpu/wall':>9} {'util':>7}")
+    for stage, s in stats.items():
+        busy = s['cpu'] / s['wall'] if s['wall'] else 0.0
+        print(f"  {stage:<12} {s['threads']:>7} {s['wall']:8.2f}s {s['cpu']:8.2f}s "
+              f"{busy:9.2f} {busy / s['threads']:7.0%}")
+        logger.info(f"Stage {stage}: wall {s['wall']:.2f}s, cpu {s['cpu']:.2f}s, "
+                    f"{s['threads']} thread(s)")
+
+
+def main(reuse_datasets: bool = False, params_path: str = None, concurrent: bool = False) -> None:
     """
     Main execution pipeline.
+    
+    Args:
+        reuse_datasets: Train on the cached lgb.Dataset binaries
+        params_path: JSON {stage: params} from run_tuning.py; stages missing
+                     from it keep CLASSIFIER_PARAMS / REGRESSOR_PARAMS
+        concurrent: Train both stages at the same time in two processes,
+                    splitting the cores between them
     """
+    timings = {}
+    tuned = load_tuned_params(params_path) if params_path else {}
+    stage_params = {
+        'classifier': tuned.get('classifier', CLASSIFIER_PARAMS),
+        'regressor': tuned.get('regressor', REGRESSOR_PARAMS),
+    }
     try:
         print_separator("STARTING PILLAR DESIGN AI TRAINING")
         
-        # =====================================================================
-        # 1. LOAD & ENGINEER DATA
-        # =====================================================================
-        df = load_dataset()
-        get_data_info(df)
-        
-        # Create engineered features
-        df = create_engineered_features(df)
-        
-        # Create target variable (rho)
-        df = create_target_variable(df)
-        
-        # Prepare feature matrix X (common to both models)
-        X, _ = prepare_features(df, FEATURE_COLUMNS)
-        
-        # =====================================================================
-        # 2. TRAIN MODELS
-        # =====================================================================
+        if reuse_datasets:
+            # =================================================================
+            # 1. LOAD (OR BUILD) TRAINING ARTIFACTS
+            # =================================================================
+            data = load_training_data(timings=timings)
+            df = X = None
+        else:
+            data = None
+            # =================================================================
+            # 1. LOAD & ENGINEER DATA
+            # =================================================================
+            with timed('load_data', timings):
+                # Cleaned + engineered frame (served from the binary cache when the CSV is unchanged)
+                df = load_dataset(engineer=True)
+                get_data_info(df)
+                
+                # Create target variable (rho)
+                df = create_target_variable(df)
+            
+            with timed('features', timings):
+                # Prepare feature matrix X (common to both models)
+                X, _ = prepare_features(df, FEATURE_COLUMNS)
+            
+        # =================================================================
+        # 2. TRAIN MODELS (binning happens inside each fit, unless reusing datasets)
+        # =================================================================
+        if concurrent:
+            # Os dois estágios dependem só de X: cada um em seu processo
+            with timed('concurrent_train', timings):
+                stats = train_stages_concurrently(stage_params, stage_threads(), data=data,
+                                                  df=df, X=X)
+        else:
+            stats = {}
+            # A. Classifier (The "Inspector"), B. Regressor (The "Engineer")
+            for stage in STAGES:
+                with timed(stage, timings):
+                    stats[stage] = train_stage(stage, stage_params[stage], data=data, df=df, X=X)
         
-        # A. Train Classifier (The "Inspector")
-        train_classifier(df, X)
+        print_stage_usage(stats, concurrent)
         
-        # B. Train Regressor (The "Engineer")
-        train_regressor(df, X)
+        print_separator("TRAINING TIME PER PHASE")
+        for phase, seconds in timings.items():
+            print(f"  {phase:<16} {seconds:8.3f} s")
+        print(f"  {'total':<16} {sum(timings.values()):8.3f} s")
         
         logger.info("Pipeline Finished Successfully.")
         print_separator("TRAINING COMPLETED SUCCESSFULLY")
@@ -153,4 +347,13 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Two-stage training pipeline.")
+    parser.add_argument('--reuse-datasets', action='store_true',
+                        help="reaproveita a matriz float32 em mmap e os binários lgb.Dataset "
+                             "(reconstruídos quando o CSV ou o código mudam)")
+    parser.add_argument('--params', help="JSON de parâmetros gerado por run_tuning.py")
+    parser.add_argument('--concurrent', action='store_true',
+                        help="treina classificador e regressor ao mesmo tempo, em dois processos "
+                             "com os núcleos divididos entre eles")
+    args = parser.parse_args()
+    main(reuse_datasets=args.reuse_datasets, params_path=args.params, concurrent=args.concurrent)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Otimização de um edifício inteiro em lote.
+Otimiza a seção (largura x Altura) de centenas/milhares de pilares com uma
+única passada vetorizada do PillarOptimizer.optimize_building.
+
+Uso:
+    python run_building_optimization.py                       # usa pilares do dataset
+    python run_building_optimization.py --input pilares.csv   # tabela própria (CSV com ',')
+"""
+import argparse
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.config import OPTIMIZER_CHUNK_SIZE, PARALLEL_CHUNK_SIZE
+from src.data_loader import load_dataset
+from src.optimizer import PillarOptimizer
+from src.parallel import ParallelPredictor
+from src.predictor import PillarPredictor
+from src.utils import print_separator
+
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+SEARCH_SPACE = {
+    'largura': range(15, 81, 5),
+    'Altura': range(15, 121, 5),
+}
+
+CONSTRAINTS = {
+    'min_dimension': 15,
+    'max_aspect_ratio': 5,
+}
+
+COSTS = {
+    'aco_kg': 12.00,
+    'concreto_m3': 450.00,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--input', help="CSV com uma linha por pilar (cargas + fck, PeDireito, Cobrimento)")
+    parser.add_argument('--pillars', type=int, default=1000, help="pilares do dataset (sem --input)")
+    parser.add_argument('--output', help="salva a tabela de resultados em CSV")
+    parser.add_argument('--workers', type=int, help="avalia os candidatos em N processos")
+    args = parser.parse_args()
+
+    if args.input:
+        pillars = pd.read_csv(args.input)
+    else:
+        pillars = load_dataset().head(args.pillars)
+
+    print_separator("OTIMIZAÇÃO EM LOTE DO EDIFÍCIO")
+    n_grid = np.prod([len(values) for values in SEARCH_SPACE.values()])
+    print(f"Pilares: {len(pillars)} | candidatos por pilar: {n_grid} | "
+          f"total: {len(pillars) * n_grid}")
+
+    if args.workers:
+        predictor = ParallelPredictor(n_workers=args.workers)
+        predictor.warm_up()
+        # Blocos grandes o suficiente para ocupar todos os workers
+        chunk_size = args.workers * PARALLEL_CHUNK_SIZE
+    else:
+        predictor = PillarPredictor()
+        chunk_size = OPTIMIZER_CHUNK_SIZE
+    optimizer = PillarOptimizer(predictor)
+    df_result, timings = optimizer.optimize_building(pillars, SEARCH_SPACE, COSTS, CONSTRAINTS,
+                                                     chunk_size=chunk_size)
+
+    cols = ['N_top', 'Mx_base', 'My_base', 'largura_otimo', 'Altura_otimo',
+            'As_predicted', 'custo_total']
+    print(df_result[cols].head(20).to_string(float_format="%.2f"))
+
+    n_found = np.isfinite(df_result['custo_total']).sum()
+    print(f"\nPilares com solução viável: {n_found}/{len(df_result)}")
+    print(f"Custo total do edifício:    R$ {df_result.loc[np.isfinite(df_result['custo_total']), 'custo_total'].sum():.2f}")
+    print(f"Avaliações do modelo:       {optimizer.n_evaluations} "
+          f"({optimizer.n_refined} com o regressor completo)")
+    print("\nTempo por fase:")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<8} {seconds:8.3f} s")
+
+    if args.output:
+        df_result.to_csv(args.output, index=False)
+        print(f"\nResultados salvos em: {args.output}")
+
+    if args.workers:
+        predictor.close()
+
+
+if __name__ == "__main__":
+    main()
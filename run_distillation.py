@@ -0,0 +1,111 @@
+"""
+Destila o regressor de aço num modelo pequeno (modo 'fast' do PillarPredictor).
+Amostra pilares sintéticos em torno do CSV, rotula os viáveis com o
+regressor completo, treina o aluno e mostra o erro de As (cm²) em relação
+ao regressor completo e o ganho de vazão, no regressor isolado e numa
+varredura largura x Altura do caso de calibração de run_optimization.py.
+O aluno só é gravado (e passa a ser usado pelo modo 'fast') se o ótimo da
+varredura, reavaliado pelo regressor completo, ficar dentro de
+DISTILL_MAX_COST_GAP do ótimo exato; caso contrário nada é salvo.
+
+Uso:
+    python run_distillation.py                    # salva models/modelo_regressor_rapido.pkl se aprovado
+    python run_distillation.py --samples 500000
+    PillarPredictor(mode='fast')                  # usa o aluno no lugar do regressor completo
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.config import DISTILL_MAX_COST_GAP, DISTILL_SAMPLES, MODEL_PATH_STUDENT
+from src.distillation import distill
+from src.optimizer import PillarOptimizer
+from src.predictor import PillarPredictor
+from src.utils import print_separator
+
+for name in ("src.data_loader", "src.feature_engineering", "src.model_trainer", "src.predictor",
+             "src.optimizer"):
+    logging.getLogger(name).setLevel(logging.WARNING)
+
+# Caso de calibração de run_optimization.py (pilar real 30x95, As = 20.1 cm²)
+FIXED_PARAMS = {'fck': 50, 'PeDireito': 235, 'Cobrimento': 2.5}
+LOAD_VECTOR = {'N_top': 392, 'Mx_top': 129, 'My_top': -92, 'N_base': 392, 'Mx_base': 205, 'My_base': 430}
+COSTS = {'aco_kg': 12.00, 'concreto_m3': 450.00}
+
+
+def print_report(name: str, report: dict) -> None:
+    print(f"\n{name} ({report['rows']} pilares viáveis):")
+    print(f"  |As aluno - As completo|: média {report['As_mae_cm2']:.3f} cm² "
+          f"({report['As_mae_pct']:.2f}%), p95 {report['As_p95_cm2']:.3f} cm², "
+          f"máx {report['As_max_cm2']:.2f} cm²")
+    print(f"  vazão do regressor: {report['teacher_rows_per_s']:,.0f} -> "
+          f"{report['student_rows_per_s']:,.0f} linhas/s ({report['speedup']:.1f}x)")
+
+
+def evaluate(n_samples: int, path: Path) -> float:
+    """Destila o aluno em path e retorna a diferença de custo do seu ótimo (inf se inviável)."""
+    print_separator("DESTILAÇÃO DO REGRESSOR")
+    start = time.perf_counter()
+    exact = PillarPredictor(mode='exact')
+    result = distill(exact, n_samples=n_samples, output_path=path)
+    print(f"{result['samples']} amostras, {result['feasible_samples']} viáveis rotuladas; "
+          f"aluno com {result['n_trees']} árvores ({time.perf_counter() - start:.1f} s)")
+    print_report("Holdout sintético", result['holdout'])
+    print_report("Linhas do CSV", result['csv'])
+
+    # Varredura de ponta a ponta (classificador + regressor) nos dois modos
+    print_separator("VARREDURA largura x Altura (caso de calibração)")
+    fast = PillarPredictor(regressor_path=result['path'], mode='fast')
+    search_space = {'largura': np.arange(15, 80.5, 0.5), 'Altura': np.arange(20, 201, 1)}
+    best = {}
+    for name, predictor in (('exact', exact), ('fast', fast)):
+        optimizer = PillarOptimizer(predictor)
+        start = time.perf_counter()
+        df = optimizer.find_optimal_section(FIXED_PARAMS, LOAD_VECTOR, search_space, COSTS)
+        elapsed = time.perf_counter() - start
+        best[name] = df.iloc[0]
+        print(f"  {name:<6} {elapsed * 1e3:8.1f} ms -> {best[name]['largura']:.0f}x"
+              f"{best[name]['Altura']:.0f} cm, As {best[name]['As_predicted']:.2f} cm², "
+              f"R$ {best[name]['custo_total']:.2f}")
+    # O ótimo do modo fast reavaliado pelo regressor completo
+    choice = {'largura': [best['fast']['largura']], 'Altura': [best['fast']['Altura']]}
+    check = PillarOptimizer(exact).find_optimal_section(FIXED_PARAMS, LOAD_VECTOR, choice, COSTS)
+    if not len(check):
+        print("\n⚠️ Seção do fast é inviável para o modelo completo")
+        return float('inf')
+    gap = check.iloc[0]['custo_total'] / best['exact']['custo_total'] - 1
+    print(f"  Seção do fast pelo modelo completo: As {check.iloc[0]['As_predicted']:.2f} cm², "
+          f"R$ {check.iloc[0]['custo_total']:.2f} ({100 * gap:+.2f}% vs ótimo exato)")
+    return gap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=DISTILL_SAMPLES)
+    parser.add_argument('--output', help="caminho do aluno (padrão: MODEL_PATH_STUDENT)")
+    parser.add_argument('--max-cost-gap', type=float, default=DISTILL_MAX_COST_GAP,
+                        help="diferença máxima de custo (fração) do ótimo fast vs exato")
+    args = parser.parse_args()
+    output = Path(args.output or MODEL_PATH_STUDENT)
+
+    # O aluno é treinado num arquivo temporário e só substitui o do modo 'fast' se aprovado
+    with tempfile.TemporaryDirectory() as tmp:
+        candidate = Path(tmp) / output.name
+        gap = evaluate(args.samples, candidate)
+        if gap > args.max_cost_gap:
+            print(f"\n⚠️ Ótimo do modo fast fora do limite de {100 * args.max_cost_gap:.1f}% acima do exato: "
+                  f"aluno descartado, {output} não foi alterado")
+            sys.exit(1)
+        shutil.move(candidate, output)
+    print(f"\n✅ Aluno aprovado ({100 * gap:+.2f}% vs ótimo exato), salvo em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -70,5 +70,53 @@ def main():
         print("\n❌ FALHA. Mesmo com dados conhecidos, o modelo não aprovou nenhuma largura.")
         print("Isso indicaria que o Classificador está rejeitando o próprio dado de treino (Overfitting reverso ou erro de dados).")
 
+    # --- 5. BISSECÇÃO NA FRONTEIRA vs GRID EXAUSTIVO ---
+    print_separator("BUSCA POR BISSECÇÃO vs GRID EXAUSTIVO")
+    FINE_CONSTRAINTS = {'min_largura': 15, 'max_largura': 80, 'step': 1}
+    
+    optimizer.n_evaluations = 0
+    df_grid = optimizer.find_optimal_width(FIXED_PARAMS, LOAD_VECTOR, FINE_CONSTRAINTS, COSTS)
+    n_grid = optimizer.n_evaluations
+    
+    optimizer.n_evaluations = 0
+    df_bisect = optimizer.find_optimal_width(FIXED_PARAMS, LOAD_VECTOR, FINE_CONSTRAINTS, COSTS,
+                                             search='bisect')
+    n_bisect = optimizer.n_evaluations
+    
+    print(f"\n1D (largura 15-80 cm, passo 1):")
+    print(f"  Grid:                {n_grid:5d} avaliações -> largura {df_grid.iloc[0]['largura']:.0f} cm")
+    print(f"  Bissecção:           {n_bisect:5d} avaliações -> largura {df_bisect.iloc[0]['largura']:.0f} cm "
+          f"(economia {1 - n_bisect / n_grid:.0%})")
+    
+    # 2D: largura x Altura com fck e cobrimento fixos
+    larguras = list(range(15, 81))
+    alturas = list(range(20, 121, 5))
+    fixed_2d = {k: v for k, v in FIXED_PARAMS.items() if k != 'Altura'}
+    
+    # Referência: todos os candidatos avaliados com o modelo completo
+    exhaustive = PillarOptimizer(predictor, coarse_iterations=0)
+    df_grid_2d = exhaustive.find_optimal_section(
+        fixed_2d, LOAD_VECTOR, {'largura': larguras, 'Altura': alturas}, COSTS, top_k=1)
+    n_grid_2d = exhaustive.n_evaluations
+    grid_2d = df_grid_2d.iloc[0]
+    
+    print(f"\n2D (largura 15-80 x Altura 20-120):")
+    print(f"  Grid exaustivo:      {n_grid_2d:5d} avaliações -> "
+          f"{grid_2d['largura']:.0f}x{grid_2d['Altura']:.0f} cm (R$ {grid_2d['custo_total']:.2f})")
+    optimizer.n_evaluations = 0
+    df_2d = optimizer.find_optimal_section_bisect(fixed_2d, LOAD_VECTOR, larguras, alturas, COSTS)
+    n_2d = optimizer.n_evaluations
+    best_2d = df_2d.iloc[0]
+    print(f"  Fronteira:           {n_2d:5d} avaliações -> "
+          f"{best_2d['largura']:.0f}x{best_2d['Altura']:.0f} cm (R$ {best_2d['custo_total']:.2f}, "
+          f"economia {1 - n_2d / n_grid_2d:.0%})")
+    
+    same_1d = df_bisect.iloc[0]['largura'] == df_grid.iloc[0]['largura']
+    same_2d = (best_2d['largura'], best_2d['Altura']) == (grid_2d['largura'], grid_2d['Altura']) and \
+        abs(best_2d['custo_total'] - grid_2d['custo_total']) <= 1e-9 * grid_2d['custo_total']
+    if not (same_1d and same_2d):
+        raise SystemExit("❌ A bissecção não reproduziu o ótimo do grid exaustivo.")
+    print("\n✅ Bissecção e grid exaustivo convergem para o mesmo ótimo (1D e 2D).")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Busca de hiperparâmetros dos dois estágios por successive halving.
+Treina os candidatos em processos paralelos sobre os binários lgb.Dataset
+compartilhados (os mesmos de main.py --reuse-datasets), descarta os piores
+a cada rodada e salva os parâmetros vencedores e uma tabela
+latência x acurácia por estágio em models/tuning/.
+
+Uso:
+    python run_tuning.py                                  # os dois estágios
+    python run_tuning.py --stage regressor --candidates 27 --eta 3 --workers 4
+    python main.py --params models/tuning/best_params.json   # treina com os vencedores
+"""
+import argparse
+import logging
+
+from src.config import (
+    TUNING_CANDIDATES,
+    TUNING_DIR,
+    TUNING_ETA,
+    TUNING_MAX_ROUNDS,
+    TUNING_MIN_ROUNDS,
+    TUNING_SEARCH_SPACE,
+)
+from src.tuning import STAGE_PARAMS, rung_schedule, save_tuning_results, successive_halving, total_rounds
+from src.utils import print_separator, timed
+
+logging.getLogger("src.training_data").setLevel(logging.WARNING)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stage', choices=['classifier', 'regressor', 'both'], default='both')
+    parser.add_argument('--candidates', type=int, default=TUNING_CANDIDATES)
+    parser.add_argument('--eta', type=int, default=TUNING_ETA)
+    parser.add_argument('--min-rounds', type=int, default=TUNING_MIN_ROUNDS)
+    parser.add_argument('--max-rounds', type=int, default=TUNING_MAX_ROUNDS)
+    parser.add_argument('--workers', type=int, help="processos de treino (padrão: núcleos da máquina)")
+    parser.add_argument('--output', default=str(TUNING_DIR))
+    args = parser.parse_args()
+
+    stages = list(STAGE_PARAMS) if args.stage == 'both' else [args.stage]
+    schedule = rung_schedule(args.candidates, args.eta, args.min_rounds, args.max_rounds)
+    print_separator("SUCCESSIVE HALVING")
+    print("Rodadas (configs x boosting rounds): "
+          + ", ".join(f"{n}x{rounds}" for n, rounds in schedule))
+    print(f"Até {total_rounds(schedule)} rounds por estágio "
+          f"(vs {args.candidates * args.max_rounds} treinando todos até {args.max_rounds})")
+
+    best_params, trials, timings = {}, {}, {}
+    for stage in stages:
+        with timed(stage, timings):
+            best_params[stage], trials[stage] = successive_halving(
+                stage, n_candidates=args.candidates, eta=args.eta, min_rounds=args.min_rounds,
+                max_rounds=args.max_rounds, n_workers=args.workers,
+            )
+
+        table = trials[stage]
+        metric = STAGE_PARAMS[stage]['metric']
+        print_separator(f"{stage.upper()}: LATÊNCIA x ACURÁCIA")
+        searched = [name for name in TUNING_SEARCH_SPACE if name in table.columns]
+        cols = ['trial', 'baseline', *searched, 'rung', 'best_iteration', metric, 'n_trees',
+                'total_leaves', 'latency_us_per_row', 'pareto', 'selected']
+        print(table[cols].to_string(index=False, float_format="%.4g"))
+        print(f"\nVencedor: {best_params[stage]}")
+
+    path = save_tuning_results(best_params, trials, args.output)
+    print(f"\nParâmetros salvos em: {path}")
+    for stage, seconds in timings.items():
+        print(f"  {stage:<12} {seconds:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
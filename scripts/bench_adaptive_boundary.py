@@ -0,0 +1,117 @@
+"""
+Fronteira de 50% por refinamento adaptativo vs grid uniforme de mesma
+resolução final: chamadas ao modelo, tempo e quantas células de fronteira
+do grid uniforme o refinamento adaptativo encontrou.
+Uso: python scripts/bench_adaptive_boundary.py --coarse 17 --levels 5
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.predictor import PillarPredictor
+from src.visualization import (
+    compute_interaction_boundary,
+    compute_interaction_grid,
+    compute_section_boundary,
+    compute_section_grid,
+)
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+BASE_LOADS = {
+    'fck': 50, 'PeDireito': 200, 'Cobrimento': 2.5,
+    'N_top': 27, 'Mx_top': 3, 'My_top': -28,
+    'N_base': 27, 'Mx_base': -19, 'My_base': 0,
+}
+
+
+def boundary_cells(Z, threshold):
+    """Células (i, j) do grid uniforme cujos cantos cruzam o limiar."""
+    above = Z >= threshold
+    corners = np.stack([above[:-1, :-1], above[1:, :-1], above[:-1, 1:], above[1:, 1:]])
+    straddle = corners.any(axis=0) & ~corners.all(axis=0)
+    return set(map(tuple, np.argwhere(straddle)))
+
+
+def compare(name, adaptive_fn, uniform_fn, threshold):
+    start = time.perf_counter()
+    result = adaptive_fn()
+    t_adaptive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Z = uniform_fn(result['stats']['resolution'])
+    t_uniform = time.perf_counter() - start
+
+    samples = result['samples']
+    stats = result['stats']
+    expected = boundary_cells(Z, threshold)
+    found = _adaptive_cells(result, Z.shape)
+    recall = len(expected & found) / len(expected) if expected else 1.0
+
+    print(f"\n{name}")
+    print(f"  resolução final:      {stats['resolution'][0]} x {stats['resolution'][1]}")
+    print(f"  avaliações adaptativo: {stats['n_evaluations']:>9} em {stats['n_calls']} chamadas ({t_adaptive:.2f} s)")
+    print(f"  avaliações uniforme:   {Z.size:>9} em 1 chamada ({t_uniform:.2f} s)")
+    print(f"  fração do uniforme:    {stats['fraction_of_uniform']:.1%}")
+    print(f"  polilinhas:            {len(result['polylines'])} | amostras: {len(samples)}")
+    print(f"  células de fronteira encontradas: {len(expected & found)}/{len(expected)} ({recall:.1%})")
+
+
+def _adaptive_cells(result, shape):
+    """Células finas (i, j) que contêm pontos das polilinhas adaptativas."""
+    samples = result['samples']
+    x0, y0 = samples['x'].min(), samples['y'].min()
+    dx = (samples['x'].max() - x0) / (shape[0] - 1)
+    dy = (samples['y'].max() - y0) / (shape[1] - 1)
+    cells = set()
+    for line in result['polylines']:
+        # Ponto médio de cada segmento cai dentro da célula que o gerou
+        mid = (line[1:] + line[:-1]) / 2
+        i = np.clip(np.floor((mid[:, 0] - x0) / dx), 0, shape[0] - 2).astype(int)
+        j = np.clip(np.floor((mid[:, 1] - y0) / dy), 0, shape[1] - 2).astype(int)
+        cells.update(zip(i.tolist(), j.tolist()))
+    return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--coarse', type=int, default=17)
+    parser.add_argument('--levels', type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = PillarPredictor()
+    threshold = predictor.threshold
+
+    w_range, h_range = (10, 60), (10, 60)
+    compare(
+        "Seção B x H",
+        lambda: compute_section_boundary(predictor, BASE_LOADS, w_range, h_range,
+                                         n_points=args.coarse, levels=args.levels),
+        # compute_section_grid devolve Z[altura, largura]; transpõe para (x, y)
+        lambda res: compute_section_grid(predictor, BASE_LOADS, w_range, h_range,
+                                         resolution=(res[1], res[0]))[2].T,
+        threshold,
+    )
+
+    pillar = {**BASE_LOADS, 'largura': 20, 'Altura': 20}
+    n_range, m_range = (0, 3000), (0, 300)
+    compare(
+        "Interação N x M (pilar 20x20)",
+        lambda: compute_interaction_boundary(predictor, pillar, n_range, m_range,
+                                             n_points=args.coarse, levels=args.levels),
+        # compute_interaction_grid devolve Z[normal, momento]; transpõe para (x=M, y=N)
+        lambda res: compute_interaction_grid(predictor, pillar, n_range, m_range,
+                                             resolution=(res[1], res[0]))[2].T,
+        threshold,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Kernel de features (build_feature_matrix): confere a equivalência com o
+caminho pandas (create_engineered_features) e mede tempo e pico de memória
+em float64 e float32.
+
+- float64: deve ser idêntico bit a bit ao pandas;
+- float32: erro relativo pequeno e mesmas decisões do classificador.
+
+Uso: python scripts/bench_feature_kernel.py --rows 1000000
+"""
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import FEATURE_COLUMNS, INPUT_COLUMNS
+from src.data_loader import load_dataset
+from src.feature_engineering import build_feature_matrix, create_engineered_features
+from src.predictor import PillarPredictor
+
+for name in ("src.data_loader", "src.feature_engineering", "src.predictor"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+warnings.filterwarnings('ignore')
+
+
+def pandas_matrix(columns):
+    df = create_engineered_features(pd.DataFrame(columns))
+    return df[FEATURE_COLUMNS].to_numpy()
+
+
+def measure(fn, repeat=3):
+    """Melhor tempo de `repeat` execuções e pico de memória (tracemalloc) de uma delas."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak / 1024 ** 2
+
+
+def check_equivalence(df):
+    columns = {col: df[col].values for col in INPUT_COLUMNS}
+    reference = pandas_matrix(columns)
+
+    X64, _ = build_feature_matrix(columns)
+    X32, _ = build_feature_matrix(columns, dtype=np.float32)
+    assert np.array_equal(X64, reference, equal_nan=True), "float64 difere do caminho pandas"
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel = np.abs(X32 - reference) / np.maximum(np.abs(reference), 1e-12)
+    print(f"Equivalência ({len(df)} pilares do dataset):")
+    print("  float64 vs pandas: idêntico")
+    print(f"  float32 vs pandas: erro relativo máximo {np.nanmax(rel):.2e}")
+
+    exact = PillarPredictor(feature_dtype='float64').predict_arrays(**columns)
+    single = PillarPredictor(feature_dtype='float32').predict_arrays(**columns)
+    agree = (exact['is_feasible'] == single['is_feasible']).mean()
+    print(f"  predições float32: {agree:.2%} das decisões iguais, "
+          f"|dP| máx {np.abs(exact['prob_feasible'] - single['prob_feasible']).max():.2e}, "
+          f"|dAs| máx {np.abs(exact['As_predicted'] - single['As_predicted']).max():.2e} cm²")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = load_dataset()
+    check_equivalence(df)
+
+    # Amostra com reposição das linhas reais até o tamanho pedido
+    rng = np.random.default_rng(0)
+    rows = rng.integers(0, len(df), args.rows)
+    columns = {col: df[col].values[rows] for col in INPUT_COLUMNS}
+    out = np.empty((args.rows, len(FEATURE_COLUMNS)), order='F')
+
+    cases = {
+        'pandas (create_engineered_features)': lambda: pandas_matrix(columns),
+        'kernel float64': lambda: build_feature_matrix(columns),
+        'kernel float32': lambda: build_feature_matrix(columns, dtype=np.float32),
+        'kernel float64 com out= reaproveitado': lambda: build_feature_matrix(columns, out=out),
+    }
+
+    print(f"\n{args.rows} linhas x {len(FEATURE_COLUMNS)} features "
+          f"(matriz float64 = {args.rows * len(FEATURE_COLUMNS) * 8 / 1024 ** 2:.0f} MB)")
+    print(f"  {'caminho':<40} {'tempo':>9} {'pico':>10}")
+    for name, fn in cases.items():
+        seconds, peak = measure(fn)
+        print(f"  {name:<40} {seconds:8.3f}s {peak:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
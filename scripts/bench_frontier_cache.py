@@ -0,0 +1,80 @@
+"""
+Cache de fronteiras em disco: tempo do diagrama N x M calculado (frio) vs
+lido do cache (quente), conferência do resultado e teste da eviction LRU.
+Uso: python scripts/bench_frontier_cache.py --resolution 300
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.frontier_cache import FrontierCache
+from src.predictor import PillarPredictor
+from src.visualization import compute_interaction_boundary, compute_interaction_grid
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+PILLAR = {
+    'fck': 50, 'PeDireito': 200, 'Cobrimento': 2.5, 'largura': 20, 'Altura': 20,
+    'N_top': 27, 'Mx_top': 3, 'My_top': -28,
+    'N_base': 27, 'Mx_base': -19, 'My_base': 0,
+}
+N_RANGE, M_RANGE = (0, 3000), (0, 300)
+
+
+def timed_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--resolution', type=int, default=300)
+    args = parser.parse_args()
+
+    predictor = PillarPredictor()
+    _, t_fp = timed_call(lambda: predictor.model_fingerprint)
+    print(f"Fingerprint dos modelos: {predictor.model_fingerprint} ({t_fp:.1f} ms na 1ª vez)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FrontierCache(tmp)
+
+        grid = lambda: compute_interaction_grid(predictor, PILLAR, N_RANGE, M_RANGE,
+                                                resolution=args.resolution, cache=cache)
+        (_, _, Z_cold), t_cold = timed_call(grid)
+        (_, _, Z_warm), t_warm = timed_call(grid)
+        np.testing.assert_array_equal(Z_cold, Z_warm)
+        print(f"\nGrid {args.resolution}x{args.resolution}: frio {t_cold:8.1f} ms | "
+              f"quente {t_warm:6.1f} ms ({t_cold / t_warm:.0f}x)")
+
+        boundary = lambda: compute_interaction_boundary(predictor, PILLAR, N_RANGE, M_RANGE,
+                                                        levels=5, cache=cache)
+        cold, t_cold = timed_call(boundary)
+        warm, t_warm = timed_call(boundary)
+        assert len(cold['polylines']) == len(warm['polylines'])
+        for a, b in zip(cold['polylines'], warm['polylines']):
+            np.testing.assert_array_equal(a, b)
+        print(f"Fronteira adaptativa:  frio {t_cold:8.1f} ms | "
+              f"quente {t_warm:6.1f} ms ({t_cold / t_warm:.0f}x)")
+        print(f"Cache: {cache.stats()}")
+
+        # Eviction: teto pequeno mantém só as entradas usadas mais recentemente
+        small = FrontierCache(Path(tmp) / 'lru', max_mb=0.05)
+        keys = [small.key(i=i) for i in range(5)]
+        for key in keys:
+            small.put(key, {'Z': np.zeros(2000)})  # ~16 kB por entrada
+            time.sleep(0.01)
+        survivors = [i for i, key in enumerate(keys) if small.get(key) is not None]
+        print(f"\nLRU com teto de 50 kB após 5 entradas de 16 kB: restam {survivors}")
+
+
+if __name__ == "__main__":
+    main()
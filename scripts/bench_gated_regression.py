@@ -0,0 +1,56 @@
+"""
+Benchmark: inferência em dois estágios com regressor "gated" vs "predict all",
+em função da fração de candidatos viáveis.
+Uso: python scripts/bench_gated_regression.py --rows 100000
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_predict_arrays import make_candidates
+from src.predictor import PillarPredictor
+
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+FRACTIONS = [0.01, 0.05, 0.10, 0.25, 0.50, 0.75, 1.00]
+
+
+def timed_predict(predictor, columns, gated):
+    predictor.gated = gated
+    start = time.perf_counter()
+    df = predictor.predict_arrays(**columns)
+    return time.perf_counter() - start, df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    predictor = PillarPredictor()
+    columns = make_candidates(args.rows)
+
+    # Probabilidades de referência: o limiar é ajustado para obter cada fração viável
+    probs = predictor.predict_arrays(**columns)['prob_feasible'].values
+
+    print(f"{'Viáveis':>8} {'Predict all (s)':>16} {'Gated (s)':>10} {'Speedup':>8}")
+    print("-" * 46)
+    for fraction in FRACTIONS:
+        predictor.threshold = np.quantile(probs, 1.0 - fraction) if fraction < 1 else 0.0
+
+        t_all, df_all = timed_predict(predictor, columns, gated=False)
+        t_gated, df_gated = timed_predict(predictor, columns, gated=True)
+
+        np.testing.assert_allclose(df_gated['As_predicted'].values, df_all['As_predicted'].values)
+        actual = df_gated['is_feasible'].mean()
+        print(f"{actual:>8.0%} {t_all:>16.3f} {t_gated:>10.3f} {t_all / t_gated:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
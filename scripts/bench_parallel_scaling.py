@@ -0,0 +1,56 @@
+"""
+Benchmark de escalabilidade do ParallelPredictor (1/2/4/8 workers) contra o
+PillarPredictor serial, em uma varredura grande de candidatos.
+Uso: python scripts/bench_parallel_scaling.py --rows 400000 --workers 1 2 4 8
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_predict_arrays import make_candidates
+from src.parallel import ParallelPredictor
+from src.predictor import PillarPredictor
+
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=400_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunk-size', type=int, default=25_000)
+    args = parser.parse_args()
+
+    columns = make_candidates(args.rows)
+
+    predictor = PillarPredictor()
+    start = time.perf_counter()
+    expected = predictor.predict_arrays(**columns)
+    t_serial = time.perf_counter() - start
+
+    print(f"Linhas: {args.rows} | shard: {args.chunk_size}")
+    print(f"{'Workers':>8} {'Tempo (s)':>10} {'Speedup':>8}")
+    print("-" * 28)
+    print(f"{'serial':>8} {t_serial:>10.3f} {1.0:>7.2f}x")
+
+    for n_workers in args.workers:
+        with ParallelPredictor(n_workers=n_workers, chunk_size=args.chunk_size) as parallel:
+            # Carregamento dos modelos nos workers fica fora da medição
+            parallel.warm_up()
+
+            start = time.perf_counter()
+            got = parallel.predict_arrays(**columns)
+            elapsed = time.perf_counter() - start
+
+        np.testing.assert_allclose(got['As_predicted'].values, expected['As_predicted'].values)
+        print(f"{n_workers:>8} {elapsed:>10.3f} {t_serial / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Cache de predições: confere que CachedPredictor devolve o mesmo que o
+PillarPredictor e mede consultas repetidas (memória e SQLite em disco),
+incluindo otimizações repetidas do mesmo pilar.
+Uso: python scripts/bench_prediction_cache.py --rows 50000
+"""
+import argparse
+import contextlib
+import io
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_predict_arrays import make_candidates
+from src.optimizer import PillarOptimizer
+from src.prediction_cache import CachedPredictor, PredictionCache
+from src.predictor import PillarPredictor
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+
+def timed_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    args = parser.parse_args()
+
+    predictor = PillarPredictor()
+    columns = make_candidates(args.rows)
+
+    expected, t_direct = timed_call(lambda: predictor.predict_arrays(**columns))
+    _, t_cold_memory = timed_call(lambda: CachedPredictor(predictor).predict_arrays(**columns))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'predictions.sqlite'
+        cached = CachedPredictor(predictor, PredictionCache(disk_path=db_path))
+
+        cold, t_cold = timed_call(lambda: cached.predict_arrays(**columns))
+        warm, t_warm = timed_call(lambda: cached.predict_arrays(**columns))
+        pd.testing.assert_frame_equal(cold, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(warm, expected, check_dtype=False)
+        memory_stats = cached.cache.stats()
+
+        # Nova sessão: memória vazia, mesmas linhas servidas pelo SQLite
+        fresh = CachedPredictor(predictor, PredictionCache(disk_path=db_path))
+        from_disk, t_disk = timed_call(lambda: fresh.predict_arrays(**columns))
+        pd.testing.assert_frame_equal(from_disk, expected, check_dtype=False)
+        disk_stats = fresh.cache.stats()
+        fresh.cache.close()
+        cached.cache.close()
+
+    print(f"{args.rows} linhas")
+    print(f"  PillarPredictor direto:  {t_direct * 1000:8.1f} ms")
+    print(f"  Frio, só memória:        {t_cold_memory * 1000:8.1f} ms")
+    print(f"  Frio, memória + SQLite:  {t_cold * 1000:8.1f} ms")
+    print(f"  Cache quente (memória):  {t_warm * 1000:8.1f} ms")
+    print(f"  Nova sessão (SQLite):    {t_disk * 1000:8.1f} ms")
+    print(f"  Memória: {memory_stats}")
+    print(f"  Disco:   {disk_stats}")
+
+    # Otimizações repetidas do mesmo pilar (ex.: usuário ajustando custos),
+    # com o pilar de calibração de run_optimization.py (viável a partir de ~25 cm)
+    fixed = {'fck': 50, 'PeDireito': 235, 'Altura': 95, 'Cobrimento': 2.5}
+    loads = {'N_top': 392, 'Mx_top': 129, 'My_top': -92, 'N_base': 392, 'Mx_base': 205, 'My_base': 430}
+    constraints = {'min_largura': 15, 'max_largura': 80, 'step': 1}
+    costs = {'aco_kg': 12.0, 'concreto_m3': 450.0}
+    cached = CachedPredictor(predictor)
+    for name, p in [("direto", predictor), ("com cache", cached)]:
+        optimizer = PillarOptimizer(p)
+        # A busca em grade imprime uma linha por candidato; descartada aqui
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, elapsed = timed_call(lambda: [
+                optimizer.find_optimal_width(fixed, loads, constraints, dict(costs, aco_kg=price))
+                for price in np.linspace(8, 16, 10)
+            ])
+        n_feasible = int(results[0]['is_feasible'].sum())
+        print(f"\n10 otimizações repetidas ({name}): {elapsed * 1000:8.1f} ms "
+              f"({n_feasible} larguras viáveis)")
+    stats = cached.cache.stats()
+    print(f"Cache: {stats}")
+    assert n_feasible > 0, "Nenhuma largura viável: o benchmark não exercita o regressor"
+    assert stats['hits'] > 0, "As otimizações repetidas não tiveram nenhum acerto no cache"
+
+
+if __name__ == "__main__":
+    main()
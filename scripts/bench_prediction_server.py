@@ -0,0 +1,75 @@
+"""
+Teste local do servidor de predição: sobe o servidor em localhost, dispara
+requisições concorrentes de um pilar e compara com o PillarPredictor direto.
+Uso: python scripts/bench_prediction_server.py --clients 16 --requests 400
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_predict_arrays import make_candidates
+from src.config import INPUT_COLUMNS
+from src.prediction_server import PredictionServer, request_prediction
+from src.predictor import PillarPredictor
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400)
+    args = parser.parse_args()
+
+    columns = make_candidates(args.requests)
+    pillars = [
+        {col: float(columns[col][i]) for col in INPUT_COLUMNS}
+        for i in range(args.requests)
+    ]
+
+    predictor = PillarPredictor()
+    server = PredictionServer(('127.0.0.1', 0), predictor)
+    port = server.server_port
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Referência: uma chamada direta por pilar (sem servidor, sem micro-batching)
+    start = time.perf_counter()
+    expected = [predictor.predict_batch([p]).iloc[0]['As_predicted'] for p in pillars]
+    t_direct = time.perf_counter() - start
+
+    def call(pillar):
+        t0 = time.perf_counter()
+        reply = request_prediction({'pillar': pillar}, port=port)
+        return reply, (time.perf_counter() - t0) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        replies = list(pool.map(call, pillars))
+    t_server = time.perf_counter() - start
+
+    got = [reply['result']['As_predicted'] for reply, _ in replies]
+    np.testing.assert_allclose(got, expected, rtol=1e-9)
+
+    latencies = np.array([latency for _, latency in replies])
+    print(f"Requisições: {args.requests} | clientes concorrentes: {args.clients}")
+    print(f"Direto (1 pilar por chamada): {args.requests / t_direct:8.1f} pilares/s")
+    print(f"Servidor (micro-batching):    {args.requests / t_server:8.1f} pilares/s")
+    print(f"Latência cliente  p50={np.percentile(latencies, 50):.2f} ms  "
+          f"p99={np.percentile(latencies, 99):.2f} ms")
+    print(f"Estatísticas do servidor: {server.stats()}")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
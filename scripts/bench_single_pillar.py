@@ -0,0 +1,91 @@
+"""
+Latência de um pilar por vez: PillarPredictor.predict_single (lightgbm e
+compiled) vs FusedPredictor (kernel NumPy e, se instalado, Numba).
+Confere que os resultados batem com predict_single, que o kernel Numba (se
+importável) reproduz o kernel NumPy pilar a pilar, e separa a latência de
+pilares viáveis (classificador + regressor) e inviáveis (só classificador).
+Uso: python scripts/bench_single_pillar.py --pillars 500
+"""
+import argparse
+import logging
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_loader import load_dataset
+from src.config import INPUT_COLUMNS
+from src.fused import HAS_NUMBA, FusedPredictor
+from src.predictor import PillarPredictor
+
+for name in ("src.data_loader", "src.predictor", "src.tree_engine", "src.fused"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+warnings.filterwarnings('ignore')
+
+
+def latencies(predict, pillars):
+    predict(pillars[0])  # aquecimento (JIT, caches)
+    times, results = [], []
+    for pillar in pillars:
+        start = time.perf_counter()
+        results.append(predict(pillar))
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1e6, results
+
+
+def check_numba_kernel(numba_kernel, numpy_kernel, pillars):
+    """(prob, rho, Ac) do kernel JIT iguais aos do kernel NumPy em todos os pilares."""
+    inputs = [[pillar[col] for col in INPUT_COLUMNS] for pillar in pillars]
+    got = np.array([numba_kernel.score(*row) for row in inputs])
+    expected = np.array([numpy_kernel.score(*row) for row in inputs])
+    mismatch = ~np.isclose(got, expected, rtol=1e-9, atol=1e-12).all(axis=1)
+    if mismatch.any():
+        raise SystemExit(f"kernel numba difere do NumPy em {mismatch.sum()} de {len(pillars)} pilares "
+                         f"(primeiro: {pillars[np.argmax(mismatch)]})")
+    print(f"kernel numba == kernel NumPy em {len(pillars)} pilares (prob, rho, Ac; rtol 1e-9)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pillars', type=int, default=500)
+    args = parser.parse_args()
+
+    df = load_dataset().sample(args.pillars, random_state=0)
+    pillars = df.to_dict('records')
+
+    base = PillarPredictor()
+    fused_numpy = FusedPredictor(base, use_numba=False)
+    methods = {
+        'predict_single (lightgbm)': base.predict_single,
+        'predict_single (compiled)': PillarPredictor(engine='compiled').predict_single,
+        'FusedPredictor (numpy)': fused_numpy.predict_single,
+    }
+    if HAS_NUMBA:
+        fused_numba = FusedPredictor(base, use_numba=True)
+        fused_numba.warm_up()
+        check_numba_kernel(fused_numba, fused_numpy, pillars)
+        methods['FusedPredictor (numba)'] = fused_numba.predict_single
+    else:
+        print("numba não instalado: kernel JIT não medido")
+
+    reference = None
+    print(f"\n{args.pillars} pilares, µs por pilar")
+    print(f"  {'método':<28} {'mediana':>9} {'p99':>9} {'viável':>9} {'inviável':>9} {'|dAs| máx':>11}")
+    for name, predict in methods.items():
+        micros, results = latencies(predict, pillars)
+        feasible = np.array([r['status'] == 'Feasible' for r in results])
+        As = np.array([r['As_predicted'] for r in results])
+        if reference is None:
+            reference = (feasible, As)
+        assert np.array_equal(feasible, reference[0]), f"{name}: decisões diferentes"
+        print(f"  {name:<28} {np.median(micros):9.1f} {np.percentile(micros, 99):9.1f} "
+              f"{np.median(micros[feasible]):9.1f} {np.median(micros[~feasible]):9.1f} "
+              f"{np.abs(As - reference[1]).max():11.2e}")
+
+
+if __name__ == "__main__":
+    main()
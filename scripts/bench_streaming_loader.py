@@ -0,0 +1,112 @@
+"""
+Pico de memória e tempo: load_dataset + create_engineered_features (tudo em
+memória) vs iter_dataset (blocos), sobre um CSV sintético com N linhas
+gerado repetindo o dataset. Cada modo roda em um subprocesso próprio para
+que o RSS máximo de um não contamine o outro.
+Uso: python scripts/bench_streaming_loader.py --rows 2000000 --chunksize 200000
+"""
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import DATA_PATH
+
+for name in ("src.data_loader", "src.feature_engineering"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def make_csv(path: Path, n_rows: int) -> None:
+    """Copia as 2 linhas de cabeçalho e repete as linhas de dados até n_rows."""
+    with open(DATA_PATH, encoding='latin-1') as f:
+        header = [next(f), next(f)]
+        body = f.readlines()
+    with open(path, 'w', encoding='latin-1') as out:
+        out.writelines(header)
+        written = 0
+        while written < n_rows:
+            block = body[:n_rows - written]
+            out.writelines(block)
+            written += len(block)
+
+
+def run_mode(mode: str, path: str, chunksize: int) -> dict:
+    import warnings
+    warnings.filterwarnings('ignore')
+    from src.data_loader import iter_dataset, load_dataset
+    from src.feature_engineering import create_engineered_features
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    # Agregados simples para provar que os dois modos processam o mesmo conteúdo
+    n_rows = n_feasible = 0
+    sum_nu = 0.0
+    if mode == 'eager':
+        df = create_engineered_features(load_dataset(path))
+        n_rows, n_feasible, sum_nu = len(df), int(df['is_feasible'].sum()), float(df['nu'].sum())
+    else:
+        for block in iter_dataset(path, chunksize=chunksize):
+            n_rows += len(block)
+            n_feasible += int(block['is_feasible'].sum())
+            sum_nu += float(block['nu'].sum())
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'rows': n_rows, 'feasible': n_feasible, 'sum_nu': sum_nu, 'seconds': elapsed,
+        'tracemalloc_peak_mb': peak / 2**20, 'rss_growth_mb': (rss_after - rss_before) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    parser.add_argument('--mode', choices=['eager', 'stream'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.path, args.chunksize)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'pilares.csv'
+        make_csv(path, args.rows)
+        print(f"CSV sintético: {args.rows} linhas, {path.stat().st_size / 2**20:.0f} MB")
+
+        results = {}
+        for mode in ('eager', 'stream'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--path', str(path),
+                 '--chunksize', str(args.chunksize)],
+                capture_output=True, text=True, check=True,
+            )
+            results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    eager, stream = results['eager'], results['stream']
+    assert eager['rows'] == stream['rows'] and eager['feasible'] == stream['feasible']
+    assert abs(eager['sum_nu'] - stream['sum_nu']) <= 1e-9 * abs(eager['sum_nu'])
+
+    print(f"\n{'Modo':<28} {'tempo (s)':>10} {'pico tracemalloc (MB)':>22} {'RSS +MB':>9}")
+    print("-" * 72)
+    for name, res in [("load_dataset (em memória)", eager),
+                      (f"iter_dataset ({args.chunksize}/bloco)", stream)]:
+        print(f"{name:<28} {res['seconds']:>10.2f} {res['tracemalloc_peak_mb']:>22.1f} "
+              f"{res['rss_growth_mb']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
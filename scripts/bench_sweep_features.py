@@ -0,0 +1,79 @@
+"""
+Features de varreduras: entradas em broadcast (sub-expressões calculadas
+uma vez por eixo, _sweep_features) vs entradas já expandidas para o grid
+inteiro (kernel in-place) vs caminho pandas (create_engineered_features).
+Confere que as três matrizes são idênticas.
+Uso: python scripts/bench_sweep_features.py --points 500
+"""
+import argparse
+import logging
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import FEATURE_COLUMNS, INPUT_COLUMNS
+from src.feature_engineering import build_feature_matrix, create_engineered_features
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+warnings.filterwarnings('ignore')
+
+BASE = {'fck': 30, 'PeDireito': 280, 'largura': 20, 'Altura': 40, 'Cobrimento': 2.5,
+        'N_top': 500, 'Mx_top': 10, 'My_top': 5, 'N_base': 520, 'Mx_base': 12, 'My_base': 6}
+
+
+def sweeps(n):
+    N, M = np.linspace(-200, 3000, n), np.linspace(-50, 400, n)
+    W, H = np.linspace(15, 80, n), np.linspace(15, 120, n)
+    return {
+        f'diagrama N x M ({n}x{n}, geometria fixa)':
+            {**BASE, 'N_top': N[:, None], 'N_base': N[:, None],
+             'Mx_top': M[None, :], 'Mx_base': M[None, :]},
+        f'seção largura x Altura ({n}x{n}, cargas fixas)':
+            {**BASE, 'largura': W[None, :], 'Altura': H[:, None]},
+        f'largura ({n * n} valores, cargas fixas)':
+            {**BASE, 'largura': np.linspace(15, 80, n * n)},
+    }
+
+
+def expand(columns):
+    shape = np.broadcast_shapes(*(np.shape(columns[col]) for col in INPUT_COLUMNS))
+    return {col: np.broadcast_to(np.asarray(columns[col], dtype=np.float64), shape).ravel()
+            for col in INPUT_COLUMNS}
+
+
+def best_time(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"  {'varredura':<46} {'pandas':>9} {'expandido':>10} {'broadcast':>10}")
+    for name, columns in sweeps(args.points).items():
+        t_pandas, df = best_time(
+            lambda: create_engineered_features(pd.DataFrame(expand(columns)))[FEATURE_COLUMNS].to_numpy())
+        # Inclui a expansão das entradas, como faziam os chamadores com np.meshgrid/np.full
+        t_full, (X_full, _) = best_time(lambda: build_feature_matrix(expand(columns)))
+        t_sweep, (X_sweep, _) = best_time(lambda: build_feature_matrix(columns))
+
+        assert np.array_equal(X_sweep, X_full, equal_nan=True)
+        assert np.array_equal(X_sweep, df, equal_nan=True)
+        print(f"  {name:<46} {t_pandas * 1e3:7.1f}ms {t_full * 1e3:8.1f}ms {t_sweep * 1e3:8.1f}ms")
+    print("\nMatrizes idênticas nos três caminhos.")
+
+
+if __name__ == "__main__":
+    main()
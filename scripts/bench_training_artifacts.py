@@ -0,0 +1,103 @@
+"""
+Tempo por fase do treino com e sem os artefatos reaproveitáveis
+(src/training_data.py) em um CSV sintético grande, mais uma varredura
+curta de hiperparâmetros sobre os mesmos binários lgb.Dataset.
+Os modelos treinados aqui são descartados (models/ não é tocado).
+Uso: python scripts/bench_training_artifacts.py --rows 1000000 --rounds 30
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_streaming_loader import make_csv
+from src.config import CLASSIFIER_PARAMS, FEATURE_COLUMNS
+from src.data_loader import clear_dataset_cache, load_dataset
+from src.feature_engineering import create_target_variable, prepare_features
+from src.model_trainer import split_data, train_booster
+from src.training_data import load_training_data
+from src.utils import timed
+
+for name in ("src.data_loader", "src.feature_engineering", "src.model_trainer",
+             "src.training_data"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+warnings.filterwarnings('ignore')
+
+
+def sklearn_path(path, params, timings):
+    """Caminho original do main.py para o estágio 1 (sem nenhum cache)."""
+    with timed('load_data', timings):
+        df = create_target_variable(load_dataset(path, engineer=True, use_cache=False))
+    with timed('features', timings):
+        X, _ = prepare_features(df, FEATURE_COLUMNS)
+    with timed('train (binning + boosting)', timings):
+        X_train, X_val, y_train, y_val = split_data(X, df['is_feasible'])
+        model = lgb.LGBMClassifier(**params)
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)],
+                  callbacks=[lgb.early_stopping(50, verbose=False)])
+
+
+def datasets_path(path, cache_dir, params, timings):
+    data = load_training_data(path, cache_dir, timings=timings)
+    with timed('train (boosting)', timings):
+        stage = data['classifier']
+        train_booster(params, stage['train'], stage['valid'], classifier=True)
+    return data
+
+
+def report(title, timings):
+    print(f"\n{title}")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<28} {seconds:8.3f} s")
+    print(f"  {'total':<28} {sum(timings.values()):8.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--rounds', type=int, default=30, help="árvores por treino")
+    args = parser.parse_args()
+
+    params = dict(CLASSIFIER_PARAMS, n_estimators=args.rounds)
+    lgb.register_logger(logging.getLogger("lightgbm.silent"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'pilares.csv'
+        make_csv(path, args.rows)
+        cache_dir = Path(tmp) / 'training'
+        print(f"CSV sintético: {args.rows} linhas | estágio 1, {args.rounds} árvores")
+
+        timings = {}
+        sklearn_path(path, params, timings)
+        report("Antes (parse + features + binning a cada execução)", timings)
+
+        timings = {}
+        datasets_path(path, cache_dir, params, timings)
+        report("--reuse-datasets, 1ª execução (constrói os artefatos)", timings)
+
+        timings = {}
+        data = datasets_path(path, cache_dir, params, timings)
+        report("--reuse-datasets, execuções seguintes", timings)
+
+        # Varredura: cada configuração reaproveita os mesmos binários
+        print("\nVarredura de num_leaves sobre os mesmos Datasets:")
+        stage = data['classifier']
+        for num_leaves in (15, 31, 63):
+            start = time.perf_counter()
+            model = train_booster(dict(params, num_leaves=num_leaves), stage['train'],
+                                  stage['valid'], classifier=True)
+            auc = model.booster_.best_score['valid_0']['auc']
+            print(f"  num_leaves={num_leaves:<3} AUC={auc:.4f}  {time.perf_counter() - start:6.2f} s")
+        clear_dataset_cache(path)
+
+
+if __name__ == "__main__":
+    main()
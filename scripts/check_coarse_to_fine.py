@@ -0,0 +1,101 @@
+"""
+Otimizador grosso-fino (passada com as primeiras --iterations iterações do
+regressor + refinamento dos candidatos que ainda podem ser o ótimo) vs busca
+exaustiva com o modelo completo em todos os candidatos.
+Confere que o ótimo é o mesmo no caso de calibração de run_optimization.py
+(largura x Altura) e em cada pilar de um lote de linhas do CSV
+(optimize_building), e que nenhum candidato refinado saiu da tolerância
+(a hipótese que torna a poda exata); falha em qualquer um dos dois.
+Mostra tempo e fração de candidatos refinados.
+Uso: python scripts/check_coarse_to_fine.py --pillars 200 --iterations 200 --tolerance 0.3
+"""
+import argparse
+import logging
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import OPTIMIZER_COARSE_TOLERANCE
+from src.data_loader import load_dataset
+from src.optimizer import PillarOptimizer
+from src.predictor import PillarPredictor
+
+for name in ("src.data_loader", "src.predictor", "src.optimizer"):
+    logging.getLogger(name).setLevel(logging.ERROR)
+warnings.filterwarnings('ignore')
+
+# Caso de calibração de run_optimization.py (pilar real 30x95)
+FIXED_PARAMS = {'fck': 50, 'PeDireito': 235, 'Altura': 95, 'Cobrimento': 2.5}
+LOAD_VECTOR = {'N_top': 392, 'Mx_top': 129, 'My_top': -92, 'N_base': 392, 'Mx_base': 205, 'My_base': 430}
+COSTS = {'aco_kg': 12.00, 'concreto_m3': 450.00}
+BUILDING_SPACE = {'largura': np.arange(15, 81, 5), 'Altura': np.arange(20, 201, 10)}
+
+
+def run(optimizer, search):
+    optimizer.n_evaluations = optimizer.n_refined = optimizer.n_outside_tolerance = 0
+    start = time.perf_counter()
+    result = search(optimizer)
+    return result, time.perf_counter() - start, optimizer.n_refined / max(optimizer.n_evaluations, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pillars', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=200,
+                        help="iterações do regressor na passada grossa")
+    parser.add_argument('--tolerance', type=float, default=OPTIMIZER_COARSE_TOLERANCE,
+                        help="erro relativo admitido no aço da passada grossa")
+    args = parser.parse_args()
+
+    predictor = PillarPredictor()
+    exhaustive = PillarOptimizer(predictor, coarse_iterations=0)
+    coarse = PillarOptimizer(predictor, coarse_iterations=args.iterations,
+                             coarse_tolerance=args.tolerance)
+    print(f"Passada grossa: {coarse.coarse_iterations} de {predictor.regressor_iterations} iterações "
+          f"do regressor, tolerância {coarse.coarse_tolerance:.0%} no aço")
+
+    fixed_2d = {k: v for k, v in FIXED_PARAMS.items() if k != 'Altura'}
+    pillars = load_dataset().sample(args.pillars, random_state=0).reset_index(drop=True)
+    cases = {
+        'largura x Altura 0.5 x 1 cm (top 10)': lambda opt: opt.find_optimal_section(
+            fixed_2d, LOAD_VECTOR, {'largura': np.arange(15, 80.5, 0.5),
+                                    'Altura': np.arange(20, 201, 1)}, COSTS),
+        f'{args.pillars} pilares do CSV': lambda opt: opt.optimize_building(
+            pillars, BUILDING_SPACE, COSTS)[0],
+    }
+
+    failures = 0
+    # 'fora tol.': refinados cujo rho mudou mais que a tolerância (hipótese da poda violada)
+    print(f"\n  {'caso':<38} {'exaustivo':>10} {'grosso-fino':>12} {'refinados':>10} {'fora tol.':>10}  ótimo")
+    for name, search in cases.items():
+        expected, t_full, _ = run(exhaustive, search)
+        got, t_coarse, refined = run(coarse, search)
+        outside = coarse.n_outside_tolerance
+
+        if 'pilares' in name:
+            same = np.allclose(got['custo_total'], expected['custo_total'], rtol=1e-12) and \
+                got[['largura_otimo', 'Altura_otimo']].equals(expected[['largura_otimo', 'Altura_otimo']])
+            outcome = f"{(got['custo_total'] == expected['custo_total']).mean():.0%} dos pilares iguais"
+        else:
+            cols = ['largura', 'Altura', 'custo_total']
+            same = np.allclose(got[cols].to_numpy(float), expected[cols].to_numpy(float), rtol=1e-12)
+            outcome = f"{got.iloc[0]['largura']:.1f}x{got.iloc[0]['Altura']:.0f} cm, top 10 iguais"
+
+        failures += not same or outside > 0
+        print(f"  {name:<38} {t_full * 1e3:8.0f}ms {t_coarse * 1e3:10.0f}ms {refined:10.1%} {outside:10d}  "
+              f"{outcome if same else 'DIFERENTE do exaustivo'}")
+
+    if failures:
+        raise SystemExit(f"{failures} caso(s) com ótimo diferente do exaustivo ou refinados fora da "
+                         f"tolerância: a passada grossa não é exata com {args.iterations} iterações "
+                         f"e ±{args.tolerance:.0%}")
+    print("\nÓtimo igual ao da busca exaustiva e nenhum refinado fora da tolerância em todos os casos.")
+
+
+if __name__ == "__main__":
+    main()
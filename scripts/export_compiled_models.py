@@ -0,0 +1,67 @@
+"""
+Exporta os dois modelos LightGBM para o motor nativo (src/tree_engine.py) e
+verifica, linha a linha no CSV de treino, que o resultado bate com model.predict.
+Uso: python scripts/export_compiled_models.py
+"""
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import FEATURE_COLUMNS, MODEL_PATH_CLASSIFIER, MODEL_PATH_REGRESSOR
+from src.data_loader import load_dataset
+from src.model_trainer import load_model
+from src.tree_engine import CompiledEnsemble, export_compiled_model
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+
+RTOL, ATOL = 1e-9, 1e-12
+
+
+def verify(name, reference_fn, compiled, X):
+    expected = reference_fn(X)
+    got = compiled.predict(X.values)
+    max_diff = np.max(np.abs(got - expected))
+    print(f"{name:<12} árvores={compiled.n_trees:<5} profundidade={compiled.max_depth:<3} "
+          f"máx |diff| = {max_diff:.3e}")
+    np.testing.assert_allclose(got, expected, rtol=RTOL, atol=ATOL)
+
+    # Latência de uma linha: wrapper sklearn vs motor nativo
+    row = X.iloc[[0]]
+    row_values = row.values
+    n_repeat = 200
+    start = time.perf_counter()
+    for _ in range(n_repeat):
+        reference_fn(row)
+    t_ref = (time.perf_counter() - start) / n_repeat
+    start = time.perf_counter()
+    for _ in range(n_repeat):
+        compiled.predict(row_values)
+    t_native = (time.perf_counter() - start) / n_repeat
+    print(f"{'':<12} 1 pilar: sklearn {t_ref * 1e6:8.1f} µs | nativo {t_native * 1e6:8.1f} µs")
+
+
+def main():
+    classifier = load_model(MODEL_PATH_CLASSIFIER)
+    regressor = load_model(MODEL_PATH_REGRESSOR)
+
+    path_clf = export_compiled_model(classifier, MODEL_PATH_CLASSIFIER)
+    path_reg = export_compiled_model(regressor, MODEL_PATH_REGRESSOR)
+    print(f"Exportado: {path_clf}")
+    print(f"Exportado: {path_reg}")
+
+    df = load_dataset(engineer=True)
+    X = df[FEATURE_COLUMNS]
+
+    verify("Classifier", lambda data: classifier.predict_proba(data)[:, 1],
+           CompiledEnsemble.load(path_clf), X)
+    verify("Regressor", regressor.predict, CompiledEnsemble.load(path_reg), X)
+    print(f"\nOK: {len(X)} linhas idênticas (rtol={RTOL}, atol={ATOL}).")
+
+
+if __name__ == "__main__":
+    main()
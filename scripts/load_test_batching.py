@@ -0,0 +1,99 @@
+"""
+Teste de carga: PillarPredictor direto vs BatchingPredictor (threads e asyncio)
+com vários chamadores concorrentes de predict_single.
+Uso: python scripts/load_test_batching.py --callers 32 --calls 20
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_predict_arrays import make_candidates
+from src.batching import BatchingPredictor
+from src.config import INPUT_COLUMNS
+from src.predictor import PillarPredictor
+
+logging.getLogger("src.feature_engineering").setLevel(logging.ERROR)
+logging.getLogger("src.predictor").setLevel(logging.ERROR)
+
+
+def run_threads(predict_fn, pillars, n_callers):
+    """Cada chamador faz suas chamadas em sequência; retorna (latências ms, tempo total)."""
+    def caller(chunk):
+        latencies = []
+        for pillar in chunk:
+            t0 = time.perf_counter()
+            predict_fn(pillar)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return latencies
+
+    chunks = [pillars[i::n_callers] for i in range(n_callers)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_callers) as pool:
+        latencies = [lat for part in pool.map(caller, chunks) for lat in part]
+    return np.array(latencies), time.perf_counter() - start
+
+
+async def run_asyncio(batcher, pillars, n_callers):
+    async def caller(chunk):
+        latencies = []
+        for pillar in chunk:
+            t0 = time.perf_counter()
+            await batcher.predict_single_async(pillar)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return latencies
+
+    chunks = [pillars[i::n_callers] for i in range(n_callers)]
+    start = time.perf_counter()
+    parts = await asyncio.gather(*(caller(chunk) for chunk in chunks))
+    return np.array([lat for part in parts for lat in part]), time.perf_counter() - start
+
+
+def report(name, latencies, elapsed):
+    print(f"{name:<26} {len(latencies) / elapsed:>10.1f} {np.percentile(latencies, 50):>9.2f} "
+          f"{np.percentile(latencies, 99):>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--callers', type=int, default=32)
+    parser.add_argument('--calls', type=int, default=20, help="chamadas por chamador")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    n_total = args.callers * args.calls
+    columns = make_candidates(n_total)
+    pillars = [{col: float(columns[col][i]) for col in INPUT_COLUMNS} for i in range(n_total)]
+
+    predictor = PillarPredictor()
+
+    print(f"{args.callers} chamadores x {args.calls} chamadas")
+    print(f"{'Modo':<26} {'pilares/s':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    print("-" * 57)
+
+    latencies, elapsed = run_threads(predictor.predict_single, pillars, args.callers)
+    report("PillarPredictor", latencies, elapsed)
+
+    with BatchingPredictor(predictor, max_wait_ms=args.max_wait_ms) as batcher:
+        latencies, elapsed = run_threads(batcher.predict_single, pillars, args.callers)
+        report("BatchingPredictor (threads)", latencies, elapsed)
+        thread_stats = batcher.stats()
+
+    with BatchingPredictor(predictor, max_wait_ms=args.max_wait_ms) as batcher:
+        latencies, elapsed = asyncio.run(run_asyncio(batcher, pillars, args.callers))
+        report("BatchingPredictor (asyncio)", latencies, elapsed)
+        async_stats = batcher.stats()
+
+    print(f"\nLote médio: threads {thread_stats['mean_batch_size']:.1f} | "
+          f"asyncio {async_stats['mean_batch_size']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Request micro-batching in front of PillarPredictor.
+Concurrent callers are collected for a short window (or up to a maximum
+batch size) and scored with a single vectorized predict_batch call.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from .config import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS
+from .predictor import PillarPredictor
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+_STOP = object()
+
+
+class _Request:
+    """Rows of one caller plus the future resolved by the worker."""
+
+    def __init__(self, rows: list, single: bool):
+        self.rows = rows
+        self.single = single
+        self.future = Future()
+
+
+class BatchingPredictor:
+    """
+    Thread-safe wrapper that merges concurrent predictions into batches.
+
+    Thread front end:  submit()/submit_batch() return concurrent futures,
+                       predict_single()/predict_batch() block on them.
+    Asyncio front end: predict_single_async()/predict_batch_async().
+    """
+
+    def __init__(self, predictor: PillarPredictor, max_batch_size: int = BATCH_MAX_SIZE,
+                 max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.n_batches = 0
+        self.n_rows = 0
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="batching-predictor", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Thread front end
+    # ------------------------------------------------------------------
+    def submit(self, pillar_data: dict) -> Future:
+        """Queue one pillar; the future resolves to a predict_single-style dict."""
+        return self._enqueue(_Request([pillar_data], single=True))
+
+    def submit_batch(self, pillars_data: list) -> Future:
+        """Queue several pillars (kept in the same batch); resolves to a DataFrame."""
+        if not pillars_data:
+            raise ValueError("Empty pillar list.")
+        return self._enqueue(_Request(list(pillars_data), single=False))
+
+    def predict_single(self, pillar_data: dict) -> dict:
+        return self.submit(pillar_data).result()
+
+    def predict_batch(self, pillars_data: list) -> pd.DataFrame:
+        return self.submit_batch(pillars_data).result()
+
+    # ------------------------------------------------------------------
+    # Asyncio front end
+    # ------------------------------------------------------------------
+    async def predict_single_async(self, pillar_data: dict) -> dict:
+        return await asyncio.wrap_future(self.submit(pillar_data))
+
+    async def predict_batch_async(self, pillars_data: list) -> pd.DataFrame:
+        return await asyncio.wrap_future(self.submit_batch(pillars_data))
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            'batches': self.n_batches,
+            'rows': self.n_rows,
+            'mean_batch_size': self.n_rows / self.n_batches if self.n_batches else 0.0,
+        }
+
+    def close(self) -> None:
+        """Score whatever is pending and stop the worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _enqueue(self, request: _Request) -> Future:
+        # Checked under the lock so no request can land behind _STOP
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingPredictor is closed.")
+            self._queue.put(request)
+        return request.future
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            n_rows = len(first.rows)
+            deadline = time.perf_counter() + self.max_wait
+
+            while n_rows < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stop = True
+                    break
+                batch.append(request)
+                n_rows += len(request.rows)
+
+            self._score(batch)
+
+    def _score(self, batch: list) -> None:
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            df_results = self._predict(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Error scoring request: {e}", exc_info=True)
+                batch[0].future.set_exception(e)
+                return
+            # Re-score one by one so only the malformed request(s) fail
+            logger.warning(f"Batch of {len(batch)} requests failed ({e}); re-scoring individually.")
+            for request in batch:
+                try:
+                    self._resolve([request], self._predict([request]))
+                except Exception as e_request:
+                    logger.error(f"Error scoring request: {e_request}", exc_info=True)
+                    request.future.set_exception(e_request)
+            return
+
+        self._resolve(batch, df_results)
+
+    def _predict(self, batch: list) -> pd.DataFrame:
+        rows = [row for request in batch for row in request.rows]
+        df_results = self.predictor.predict_batch(rows)
+        self.n_batches += 1
+        self.n_rows += len(rows)
+        return df_results
+
+    @staticmethod
+    def _resolve(batch: list, df_results: pd.DataFrame) -> None:
+        offset = 0
+        for request in batch:
+            part = df_results.iloc[offset:offset + len(request.rows)].reset_index(drop=True)
+            offset += len(request.rows)
+            if request.single:
+                request.future.set_result(_single_result(part.iloc[0], request.rows[0]))
+            else:
+                request.future.set_result(part)
+
+
+def _single_result(row: pd.Series, pillar_data: dict) -> dict:
+    """Convert a predict_batch row into the dict returned by PillarPredictor.predict_single."""
+    result = {
+        'status': 'Feasible' if row['is_feasible'] == 1 else 'Infeasible',
+        'feasibility_prob': row['prob_feasible'],
+        'Ac': row['Ac'],
+        'As_actual': pillar_data.get('As', 0),
+        'rho_predicted': row['rho_predicted'],
+        'As_predicted': row['As_predicted'],
+    }
+    if row['is_feasible'] == 0:
+        result['message'] = "Pillar geometry/loads failed feasibility check."
+    elif result['As_actual'] > 0:
+        result['error'] = result['As_predicted'] - result['As_actual']
+        result['error_pct'] = (result['error'] / result['As_actual']) * 100
+    return result
@@ -13,6 +13,8 @@ LOGS_DIR = PROJECT_ROOT / "logs"
 # Paths for the two models
 MODEL_PATH_CLASSIFIER = PROJECT_ROOT / "models" / "modelo_classificador.pkl"
 MODEL_PATH_REGRESSOR = PROJECT_ROOT / "models" / "modelo_regressor.pkl"
+# Small student regressor distilled from the full one (src/distillation.py)
+MODEL_PATH_STUDENT = PROJECT_ROOT / "models" / "modelo_regressor_rapido.pkl"
 
 # Create directories if they don't exist
 LOGS_DIR.mkdir(exist_ok=True)
@@ -27,6 +29,12 @@ REQUIRED_COLUMNS = [
     'N_top', 'Mx_top', 'My_top', 'N_base', 'Mx_base', 'My_base', 'As'
 ]
 
+# Raw inputs consumed by the models (REQUIRED_COLUMNS without the target 'As')
+INPUT_COLUMNS = [col for col in REQUIRED_COLUMNS if col != 'As']
+
+# Rows per block in the streaming loader (data_loader.iter_dataset)
+DATA_CHUNK_SIZE = 200_000
+
 # =====================================================================
 # FEATURE COLUMNS FOR MODEL
 # =====================================================================
@@ -70,6 +78,27 @@ RANDOM_STATE = 42
 EARLY_STOPPING_ROUNDS = 50
 VERBOSE_EVAL = 50
 
+# Decision threshold applied to P(feasible) at inference time.
+# The classifier is scored once and 'is_feasible' is derived from this cutoff.
+CLASSIFIER_THRESHOLD = 0.5
+
+# Gated two-stage inference: the regressor only scores rows the classifier
+# accepts. Set to False to regress every row and mask afterwards.
+GATED_REGRESSION = True
+
+# Inference engine: 'lightgbm' (booster) or 'compiled' (NumPy tree evaluator
+# from tree_engine, reading models/*.npz exported next to the pickles)
+INFERENCE_ENGINE = 'lightgbm'
+
+# Regressor used by PillarPredictor: 'exact' (full model) or 'fast' (distilled
+# student at MODEL_PATH_STUDENT, only written by run_distillation.py when it
+# passes DISTILL_MAX_COST_GAP)
+INFERENCE_MODE = 'exact'
+
+# Precision of the columnar feature matrix (build_feature_matrix): 'float64'
+# reproduces create_engineered_features bit for bit, 'float32' halves its memory
+FEATURE_DTYPE = 'float64'
+
 # === CLASSIFIER PARAMETERS (Feasibility) ===
 CLASSIFIER_PARAMS = {
     'objective': 'binary',        # Binary classification (Pass/Fail)
@@ -94,4 +123,122 @@ REGRESSOR_PARAMS = {
     'bagging_freq': 5,
     'verbose': -1,
     'n_estimators': 2000
-}
\ No newline at end of file
+}
+
+# === STUDENT REGRESSOR PARAMETERS (distilled, 'fast' mode) ===
+# Fewer, smaller trees than REGRESSOR_PARAMS: ~10x the regressor throughput,
+# but ~6% mean As error against the full regressor with the defaults below
+# (more leaves/trees/samples only reach ~4% at no speedup), so the calibration
+# optimum misses DISTILL_MAX_COST_GAP and run_distillation.py does not save it
+STUDENT_PARAMS = {
+    'objective': 'regression',
+    'metric': 'rmse',
+    'num_leaves': 31,
+    'learning_rate': 0.1,
+    'min_child_samples': 40,
+    'verbose': -1,
+    'n_estimators': 500
+}
+
+# Distillation set: DISTILL_SAMPLES synthetic pillars around the CSV rows,
+# labelled by the full regressor. Loads and PeDireito are scaled by
+# exp(DISTILL_LOAD_JITTER * N(0, 1)); a DISTILL_GEOMETRY_FRACTION of the rows
+# get largura/Altura redrawn uniformly (the dimensions the sweeps vary)
+DISTILL_SAMPLES = 200_000
+DISTILL_LOAD_JITTER = 0.15
+DISTILL_GEOMETRY_FRACTION = 0.5
+DISTILL_HOLDOUT = 0.1
+# run_distillation.py fails, and leaves MODEL_PATH_STUDENT untouched, when the
+# fast-mode optimum, priced by the full model, costs more than this fraction
+# above the exact optimum
+DISTILL_MAX_COST_GAP = 0.02
+
+# =====================================================================
+# PREDICTION SERVICE
+# =====================================================================
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+
+# Micro-batching: concurrent requests arriving within BATCH_MAX_WAIT_MS
+# (or until BATCH_MAX_SIZE rows) are scored in one predict_batch call
+BATCH_MAX_SIZE = 1024
+BATCH_MAX_WAIT_MS = 5.0
+
+# Latency percentiles reported by /stats cover the most recent requests only
+SERVER_LATENCY_WINDOW = 10_000
+
+# =====================================================================
+# OPTIMIZER
+# =====================================================================
+# Candidates scored per predictor call in multi-dimensional searches
+OPTIMIZER_CHUNK_SIZE = 20_000
+
+# Coarse-to-fine scoring: every candidate is first scored with only the first
+# OPTIMIZER_COARSE_ITERATIONS regressor iterations (classifier in full). With
+# the steel cost known within ±OPTIMIZER_COARSE_TOLERANCE (relative), only the
+# candidates that can still be the cheapest are re-scored with the full model.
+# 0 disables the coarse pass (every candidate scored with the full model).
+# Off by default: the tolerance is not calibrated (with 200 iterations and
+# ±30%, ~6% of the refined candidates on CSV pillars exceed it), so the
+# pruning is not guaranteed to keep the exact optimum. Enable only with values
+# for which scripts/check_coarse_to_fine.py passes (no tolerance misses).
+OPTIMIZER_COARSE_ITERATIONS = 0
+OPTIMIZER_COARSE_TOLERANCE = 0.3
+
+# Process-pool execution of large grids (src/parallel.py)
+PARALLEL_WORKERS = None          # None = os.cpu_count()
+PARALLEL_CHUNK_SIZE = 25_000     # Candidates per shard sent to a worker
+
+# =====================================================================
+# CACHES
+# =====================================================================
+CACHE_DIR = PROJECT_ROOT / "cache"
+
+# Persistent cache of probability grids / frontier curves (src/frontier_cache.py)
+FRONTIER_CACHE_DIR = CACHE_DIR / "frontiers"
+FRONTIER_CACHE_MAX_MB = 256      # Least recently used entries are evicted above this
+
+# Memoized predictions (src/prediction_cache.py)
+PREDICTION_CACHE_SIZE = 100_000              # Rows kept in the in-memory LRU
+PREDICTION_CACHE_DECIMALS = 6                # Inputs are rounded to this many places for the key
+PREDICTION_CACHE_DB = CACHE_DIR / "predictions.sqlite"   # Optional disk tier
+
+# Binary columnar cache of the cleaned + engineered dataset (data_loader.load_dataset)
+DATASET_CACHE_DIR = CACHE_DIR / "dataset"
+DATASET_CACHE_ENABLED = True
+
+# Training artifacts reused across runs (src/training_data.py): float32 feature
+# matrix memory-mapped from disk + lgb.Dataset binaries for both stages
+TRAINING_CACHE_DIR = CACHE_DIR / "training"
+
+# =====================================================================
+# HYPERPARAMETER TUNING (src/tuning.py, run_tuning.py)
+# =====================================================================
+TUNING_DIR = PROJECT_ROOT / "models" / "tuning"   # best_params.json + one trials table per stage
+
+# Values sampled for each candidate (on top of CLASSIFIER_PARAMS / REGRESSOR_PARAMS)
+TUNING_SEARCH_SPACE = {
+    'num_leaves': [15, 31, 63, 100, 127],
+    'learning_rate': [0.02, 0.05, 0.1],
+    'feature_fraction': [0.7, 0.8, 0.9, 1.0],
+    'bagging_fraction': [0.7, 0.8, 0.9, 1.0],
+    'min_child_samples': [10, 20, 40],
+}
+
+# Successive halving: TUNING_CANDIDATES configs start with TUNING_MIN_ROUNDS
+# boosting rounds; each rung keeps the best 1/TUNING_ETA and multiplies the
+# rounds by TUNING_ETA (capped at TUNING_MAX_ROUNDS)
+TUNING_CANDIDATES = 27
+TUNING_ETA = 3
+TUNING_MIN_ROUNDS = 50
+TUNING_MAX_ROUNDS = 2000
+
+# =====================================================================
+# CROSS-VALIDATION (src/cross_validation.py, run_cv.py)
+# =====================================================================
+# Folds of both stages; every fold trains on a row subset of one Dataset
+# binned once per stage (stratified on is_feasible for the classifier)
+CV_FOLDS = 5
+# Share of each fold's training rows held out for early stopping (the fold's
+# validation rows are only used for the reported metrics)
+CV_EARLY_STOPPING_FRACTION = 0.1
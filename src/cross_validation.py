@@ -0,0 +1,190 @@
+"""
+K-fold cross-validation of both stages.
+The stage rows are binned into one lgb.Dataset, and every fold trains and
+early-stops on row subsets of it (Dataset.subset), so the histogram binning
+is paid once per stage instead of once per fold. As in lgb.cv, the bin
+boundaries therefore come from all rows of the stage. Early stopping
+watches an inner split carved out of each fold's training rows
+(CV_EARLY_STOPPING_FRACTION), so the held-out rows scored by
+evaluate_classifier / evaluate_regressor never pick the iteration count.
+Folds may run in worker processes.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+
+from .config import (
+    CLASSIFIER_PARAMS,
+    CV_EARLY_STOPPING_FRACTION,
+    CV_FOLDS,
+    EARLY_STOPPING_ROUNDS,
+    FEATURE_COLUMNS,
+    RANDOM_STATE,
+    REGRESSOR_PARAMS,
+)
+from .model_trainer import BoosterClassifier, BoosterRegressor, evaluate_classifier, evaluate_regressor
+from .training_data import DATASET_PARAMS, load_training_data
+from .utils import setup_logger, timed
+
+logger = setup_logger(__name__)
+
+STAGE_PARAMS = {'classifier': CLASSIFIER_PARAMS, 'regressor': REGRESSOR_PARAMS}
+
+# Estado do processo que treina os folds: artefatos de treino + Dataset do estágio
+_fold_state = None
+
+
+def stage_rows(data: dict, stage: str) -> tuple:
+    """Rows of X used by a stage and their labels (regressor: feasible rows, target rho)."""
+    labels = data['labels']
+    if stage == 'classifier':
+        return np.arange(len(data['X'])), labels['is_feasible']
+    rows = np.flatnonzero(labels['is_feasible'] == 1)
+    return rows, labels['rho'][rows]
+
+
+def make_folds(stage: str, y: np.ndarray, n_folds: int = CV_FOLDS,
+               random_state: int = RANDOM_STATE) -> list:
+    """(train_pos, val_pos) per fold, positions into the stage rows."""
+    # Mesmo critério de split_data: estratifica a classe no classificador
+    splitter = StratifiedKFold if stage == 'classifier' else KFold
+    folds = splitter(n_splits=n_folds, shuffle=True, random_state=random_state)
+    return list(folds.split(np.zeros(len(y)), y))
+
+
+def early_stopping_split(stage: str, train_pos: np.ndarray, y: np.ndarray,
+                         fraction: float = CV_EARLY_STOPPING_FRACTION,
+                         random_state: int = RANDOM_STATE) -> tuple:
+    """Split a fold's training positions into (fit_pos, stop_pos) for early stopping."""
+    stratify = y[train_pos] if stage == 'classifier' else None
+    fit_pos, stop_pos = train_test_split(train_pos, test_size=fraction, stratify=stratify,
+                                         random_state=random_state)
+    return np.sort(fit_pos), np.sort(stop_pos)
+
+
+def _init_worker(cache_dir, stage: str, dataset_path: str) -> None:
+    global _fold_state
+    data = load_training_data(cache_dir=cache_dir)
+    rows, y = stage_rows(data, stage)
+    # Binário salvo pelo processo principal: carregar não refaz o binning
+    full = lgb.Dataset(dataset_path, params=DATASET_PARAMS).construct()
+    _fold_state = {'data': data, 'rows': rows, 'y': y, 'full': full}
+
+
+def _run_fold(stage: str, params: dict, fold: int, train_pos: np.ndarray, val_pos: np.ndarray) -> dict:
+    """Train one fold on subsets of the stage Dataset and evaluate it on the held-out rows."""
+    state = _fold_state
+    params = dict(params)
+    num_boost_round = params.pop('n_estimators', 100)
+    # Early stopping em uma parte do treino: val_pos fica só para a avaliação
+    fit_pos, stop_pos = early_stopping_split(stage, train_pos, state['y'])
+
+    start = time.perf_counter()
+    booster = lgb.train(
+        params,
+        state['full'].subset(fit_pos),
+        num_boost_round=num_boost_round,
+        valid_sets=[state['full'].subset(stop_pos)],
+        callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = state['rows'][val_pos]
+    X_val = np.asarray(state['data']['X'][rows])
+    y_val = pd.Series(state['y'][val_pos])
+    # Os relatórios das funções de avaliação ficam de fora: só as métricas interessam
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stage == 'classifier':
+            metrics = evaluate_classifier(BoosterClassifier(booster), X_val, y_val)
+        else:
+            labels = state['data']['labels']
+            areas = pd.DataFrame({'Ac': labels['Ac'][rows], 'As': labels['As'][rows]})
+            metrics = evaluate_regressor(BoosterRegressor(booster), X_val, y_val, areas)
+    metrics.pop('confusion_matrix', None)
+
+    return {
+        'fold': fold,
+        'n_train': len(fit_pos),
+        'n_early_stopping': len(stop_pos),
+        'n_valid': len(val_pos),
+        'best_iteration': booster.best_iteration,
+        **metrics,
+        'train_seconds': train_seconds,
+        'eval_seconds': time.perf_counter() - start,
+    }
+
+
+def cross_validate(stage: str, params: dict = None, n_folds: int = CV_FOLDS, n_workers: int = None,
+                   cache_dir=None, timings: dict = None) -> pd.DataFrame:
+    """
+    K-fold cross-validation of one stage ('classifier' or 'regressor').
+
+    Args:
+        params: sklearn-style params (default: CLASSIFIER_PARAMS / REGRESSOR_PARAMS)
+        n_folds: Number of folds
+        n_workers: Processes training folds (default: min(n_folds, os.cpu_count()));
+                   1 trains in-process. Threads are split between the workers.
+        cache_dir: Training artifacts directory (default: TRAINING_CACHE_DIR)
+        timings: Optional dict accumulating seconds per phase ('binning', 'folds')
+
+    Returns:
+        DataFrame with one row per fold: sizes, best_iteration, the metrics of
+        evaluate_classifier / evaluate_regressor and train/eval seconds
+    """
+    timings = {} if timings is None else timings
+    data = load_training_data(cache_dir=cache_dir, timings=timings)
+    rows, y = stage_rows(data, stage)
+
+    with timed('binning', timings):
+        full = lgb.Dataset(np.asarray(data['X'][rows]), label=y, feature_name=FEATURE_COLUMNS,
+                           params=DATASET_PARAMS).construct()
+
+    n_workers = n_workers or min(n_folds, os.cpu_count() or 1)
+    threads = max(1, (os.cpu_count() or 1) // n_workers)
+    # Histogramas por coluna: os folds não dependem de quantas threads cada worker usa
+    params = {**(params or STAGE_PARAMS[stage]), 'num_threads': threads, 'force_col_wise': True,
+              'verbose': -1}
+    folds = make_folds(stage, y, n_folds)
+    jobs = [(stage, params, i, train_pos, val_pos) for i, (train_pos, val_pos) in enumerate(folds)]
+    logger.info(f"Cross-validation ({stage}): {n_folds} folds, {len(rows)} rows, "
+                f"{n_workers} worker(s) x {threads} thread(s)")
+
+    global _fold_state
+    with timed('folds', timings):
+        if n_workers == 1:
+            _fold_state = {'data': data, 'rows': rows, 'y': y, 'full': full}
+            try:
+                results = [_run_fold(*job) for job in jobs]
+            finally:
+                _fold_state = None
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                dataset_path = str(Path(tmp) / f"{stage}.bin")
+                full.save_binary(dataset_path)
+                # 'spawn': o LightGBM/OpenMP não é seguro após fork (ver src/parallel.py)
+                with ProcessPoolExecutor(max_workers=n_workers,
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_init_worker,
+                                         initargs=(cache_dir, stage, dataset_path)) as pool:
+                    results = list(pool.map(_run_fold, *zip(*jobs)))
+
+    return pd.DataFrame(results)
+
+
+def summarize_folds(folds: pd.DataFrame) -> pd.DataFrame:
+    """Mean, std, min and max of every fold column except the fold index and sizes."""
+    columns = [col for col in folds.columns
+               if col not in ('fold', 'n_train', 'n_early_stopping', 'n_valid')]
+    return folds[columns].agg(['mean', 'std', 'min', 'max']).T
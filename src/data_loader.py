@@ -1,56 +1,87 @@
 """
 Data loading module for pillar design dataset.
 """
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-from .config import DATA_PATH, REQUIRED_COLUMNS
-from .utils import setup_logger
+from .config import (
+    DATA_CHUNK_SIZE,
+    DATA_PATH,
+    DATASET_CACHE_DIR,
+    DATASET_CACHE_ENABLED,
+    REQUIRED_COLUMNS,
+)
+from .feature_engineering import create_engineered_features
+from .utils import file_fingerprint, setup_logger
 
 logger = setup_logger(__name__)
 
-def load_dataset() -> pd.DataFrame:
+# Formato do CSV exportado: ';' como separador, ',' decimal e uma linha de
+# metadados antes do cabeçalho
+_CSV_OPTIONS = dict(sep=';', decimal=',', skiprows=1, encoding='latin-1')
+
+# Nomes do cabeçalho (já desduplicados pelo pandas) -> nomes internos
+_RENAME_MAP = {
+    'Pe direito': 'PeDireito',
+    'N': 'N_top', 'Mx': 'Mx_top', 'My': 'My_top',
+    'N.1': 'N_base', 'Mx.1': 'Mx_base', 'My.1': 'My_base'
+}
+
+
+def load_dataset(path=None, engineer: bool = False, use_cache: bool = None) -> pd.DataFrame:
     """
     Load dataset, fix column names and flag unfeasible pillars (As=0).
+    
+    Args:
+        path: CSV file (default: DATA_PATH)
+        engineer: Also return the engineered features (create_engineered_features)
+        use_cache: Read/write the binary columnar cache (default: DATASET_CACHE_ENABLED).
+            The cache holds the cleaned + engineered frame as one .npy per column,
+            is validated against the CSV's size and mtime (SHA-256 confirms files
+            that were only touched) plus the loader/feature code, and is
+            memory-mapped on load.
     """
-    logger.info(f"Loading dataset from: {DATA_PATH}")
+    path = Path(path or DATA_PATH)
+    use_cache = DATASET_CACHE_ENABLED if use_cache is None else use_cache
+    
+    if use_cache:
+        df = _read_cache(path)
+        if df is None:
+            df = create_engineered_features(_parse_csv(path))
+            _write_cache(path, df)
+        if not engineer:
+            df = df[REQUIRED_COLUMNS + ['is_feasible']]
+        return df
+    
+    df = _parse_csv(path)
+    return create_engineered_features(df) if engineer else df
+
+
+def clear_dataset_cache(path=None) -> None:
+    """Remove the binary cache of one CSV file."""
+    shutil.rmtree(_cache_dir(Path(path or DATA_PATH)), ignore_errors=True)
+
+
+def _parse_csv(path: Path) -> pd.DataFrame:
+    logger.info(f"Loading dataset from: {path}")
     
     try:
         # 1. Carrega pulando a linha de metadados incorreta
-        df = pd.read_csv(
-            DATA_PATH,
-            sep=';',           
-            decimal=',',       
-            skiprows=1,
-            encoding='latin-1' 
-        )
+        df = pd.read_csv(path, **_CSV_OPTIONS)
         
         # 2. Renomeia colunas
-        rename_map = {
-            'Pe direito': 'PeDireito',
-            'N': 'N_top', 'Mx': 'Mx_top', 'My': 'My_top',
-            'N.1': 'N_base', 'Mx.1': 'Mx_base', 'My.1': 'My_base'
-        }
-        df = df.rename(columns=rename_map)
+        df = df.rename(columns=_RENAME_MAP)
         
         # 3. Seleciona colunas
         df = df[REQUIRED_COLUMNS].copy()
         
-        # 4. Converte numéricos
-        numeric_columns = [
-            'fck', 'PeDireito', 'largura', 'Altura', 'Cobrimento',
-            'N_top', 'Mx_top', 'My_top', 'N_base', 'Mx_base', 'My_base', 'As'
-        ]
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Remove erros de conversão (NaN)
-        df = df.dropna()
-
-        # === FLAG DE VIABILIDADE ===
-        # Se As > 0, o pilar é viável (1).
-        # Se As == 0, o pilar não passou (0).
-        df['is_feasible'] = np.where(df['As'] > 0, 1, 0)
+        # 4. Converte numéricos, remove erros e cria a flag de viabilidade
+        df = _clean_chunk(df)
         
         count_fail = len(df[df['is_feasible'] == 0])
         count_ok = len(df[df['is_feasible'] == 1])
@@ -63,8 +94,155 @@ def load_dataset() -> pd.DataFrame:
         logger.error(f"Error loading dataset: {e}", exc_info=True)
         raise
 
+
+def iter_dataset(path=None, chunksize: int = DATA_CHUNK_SIZE, engineer: bool = True):
+    """
+    Stream the dataset in blocks of `chunksize` rows.
+    
+    Only the REQUIRED_COLUMNS are parsed (usecols by position, since the
+    header repeats names such as 'Altura'). Each block goes through the same
+    cleaning as load_dataset (malformed cells coerced to NaN and their rows
+    dropped) and, if `engineer`,
+    through create_engineered_features, so memory stays bounded by one
+    block regardless of the file size.
+    
+    Yields:
+        DataFrame per block (original row index preserved)
+    """
+    path = path or DATA_PATH
+    logger.info(f"Streaming dataset from: {path} (chunks of {chunksize} rows)")
+    
+    usecols = _required_positions(path)
+    reader = pd.read_csv(path, **_CSV_OPTIONS, usecols=usecols, chunksize=chunksize)
+    
+    count_ok = count_fail = 0
+    with reader:
+        for chunk in reader:
+            chunk = chunk.rename(columns=_RENAME_MAP)[REQUIRED_COLUMNS]
+            chunk = _clean_chunk(chunk)
+            
+            n_ok = int(chunk['is_feasible'].sum())
+            count_ok += n_ok
+            count_fail += len(chunk) - n_ok
+            
+            yield create_engineered_features(chunk) if engineer else chunk
+    
+    logger.info(f"Data Streamed: {count_ok} Feasible (As>0), {count_fail} Failed (As=0)")
+
+
+def _clean_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce REQUIRED_COLUMNS to numbers, drop bad rows and set is_feasible."""
+    for col in REQUIRED_COLUMNS:
+        if col in df.columns:
+            values = df[col]
+            if not pd.api.types.is_numeric_dtype(values):
+                # Uma célula inválida deixa a coluna como texto e o pandas não
+                # aplica decimal=',' nas demais: converte antes de coagir
+                values = values.astype(str).str.replace(',', '.', regex=False)
+            df[col] = pd.to_numeric(values, errors='coerce')
+    
+    # Remove erros de conversão (NaN)
+    df = df.dropna()
+
+    # === FLAG DE VIABILIDADE ===
+    # Se As > 0, o pilar é viável (1).
+    # Se As == 0, o pilar não passou (0).
+    df['is_feasible'] = np.where(df['As'] > 0, 1, 0)
+    return df
+
+
+def _cache_dir(path: Path) -> Path:
+    # Um diretório por CSV de origem
+    return DATASET_CACHE_DIR / hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:16]
+
+
+def _code_version() -> str:
+    """Hash of the cleaning + feature code; editing either invalidates the cache."""
+    here = Path(__file__)
+    return (file_fingerprint(here)[:16]
+            + file_fingerprint(here.with_name('feature_engineering.py'))[:16])
+
+
+def _read_cache(path: Path):
+    """Return the cached frame (memory-mapped columns) or None when missing/stale."""
+    cache_dir = _cache_dir(path)
+    meta_path = cache_dir / 'meta.json'
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    
+    stat = path.stat()
+    if meta.get('code_version') != _code_version() or meta.get('size') != stat.st_size:
+        logger.info("Dataset cache is stale; reparsing CSV.")
+        return None
+    if meta.get('mtime_ns') != stat.st_mtime_ns:
+        # Arquivo tocado mas possivelmente igual: confirma pelo conteúdo
+        if meta.get('sha256') != file_fingerprint(path):
+            logger.info("Dataset cache is stale; reparsing CSV.")
+            return None
+        meta['mtime_ns'] = stat.st_mtime_ns
+        _write_json(meta_path, meta)
+    
+    try:
+        # mmap_mode='c': páginas lidas sob demanda; escritas ficam só na memória do processo.
+        # np.asarray devolve ndarray comum apontando para o mesmo mapeamento (sem cópia)
+        index = np.load(cache_dir / '_index.npy')
+        columns = {col: np.asarray(np.load(cache_dir / f"{i}.npy", mmap_mode='c'))
+                   for i, col in enumerate(meta['columns'])}
+    except (FileNotFoundError, ValueError):
+        return None
+    
+    logger.info(f"Dataset loaded from cache: {cache_dir} ({len(index)} rows)")
+    return pd.DataFrame(columns, index=pd.Index(index), copy=False)
+
+
+def _write_cache(path: Path, df: pd.DataFrame) -> None:
+    cache_dir = _cache_dir(path)
+    meta_path = cache_dir / 'meta.json'
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # meta.json é escrito por último: sem ele o cache nunca é considerado válido
+        meta_path.unlink(missing_ok=True)
+        
+        np.save(cache_dir / '_index.npy', df.index.to_numpy())
+        for i, col in enumerate(df.columns):
+            np.save(cache_dir / f"{i}.npy", df[col].to_numpy())
+        
+        stat = path.stat()
+        _write_json(meta_path, {
+            'source': str(path.resolve()),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': file_fingerprint(path),
+            'code_version': _code_version(),
+            'columns': list(df.columns),
+        })
+        logger.info(f"Dataset cache written: {cache_dir}")
+    except OSError as e:
+        # Cache é só otimização: falha de escrita não interrompe o carregamento
+        logger.warning(f"Could not write dataset cache: {e}")
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def _required_positions(path) -> list:
+    """Column positions of REQUIRED_COLUMNS in the CSV header (first occurrence)."""
+    header = pd.read_csv(path, **_CSV_OPTIONS, nrows=0).rename(columns=_RENAME_MAP).columns
+    positions = []
+    for col in REQUIRED_COLUMNS:
+        if col not in header:
+            raise KeyError(f"Column '{col}' not found in {path}")
+        positions.append(header.get_loc(col))
+    return positions
+
+
 def get_data_info(df: pd.DataFrame) -> None:
     print(f"\n--- Data Info ---")
     print(f"Total Rows: {len(df)}")
     print(f"Feasible (Pass): {df['is_feasible'].sum()}")
-    print(f"Unfeasible (Fail): {len(df) - df['is_feasible'].sum()}")
\ No newline at end of file
+    print(f"Unfeasible (Fail): {len(df) - df['is_feasible'].sum()}")
@@ -0,0 +1,171 @@
+"""
+Distillation of the steel-area regressor into a small student model.
+Dense synthetic pillars are sampled around the CSV rows, the ones the
+classifier accepts are labelled with the full regressor (the teacher), and
+a LightGBM model with few shallow trees (STUDENT_PARAMS) learns to
+reproduce the teacher's rho. PillarPredictor(mode='fast') loads the student
+in place of the full regressor.
+"""
+
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from .config import (
+    DISTILL_GEOMETRY_FRACTION,
+    DISTILL_HOLDOUT,
+    DISTILL_LOAD_JITTER,
+    DISTILL_SAMPLES,
+    EARLY_STOPPING_ROUNDS,
+    FEATURE_COLUMNS,
+    INPUT_COLUMNS,
+    MODEL_PATH_STUDENT,
+    RANDOM_STATE,
+    STUDENT_PARAMS,
+)
+from .data_loader import load_dataset
+from .feature_engineering import build_feature_matrix
+from .model_trainer import save_model
+from .predictor import PillarPredictor
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Dimensões varridas pelo otimizador e pelos gráficos: redesenhadas no intervalo do CSV
+_GEOMETRY = ('largura', 'Altura')
+# Grandezas contínuas perturbadas por um fator log-normal (zeros continuam zeros)
+_SCALED = ('PeDireito', 'N_top', 'Mx_top', 'My_top', 'N_base', 'Mx_base', 'My_base')
+
+
+def sample_inputs(df: pd.DataFrame, n_samples: int = DISTILL_SAMPLES,
+                  load_jitter: float = DISTILL_LOAD_JITTER,
+                  geometry_fraction: float = DISTILL_GEOMETRY_FRACTION,
+                  seed: int = RANDOM_STATE) -> dict:
+    """
+    Synthetic pillars around the rows of df.
+
+    Every sample starts from a random CSV row (fck and Cobrimento are kept),
+    loads and PeDireito are scaled by exp(load_jitter * N(0, 1)), and
+    largura/Altura are redrawn uniformly over the CSV range for a
+    geometry_fraction of the samples.
+
+    Returns:
+        dict {column: array} over INPUT_COLUMNS, ready for build_feature_matrix
+    """
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, len(df), size=n_samples)
+    columns = {col: df[col].to_numpy(dtype=np.float64)[base] for col in INPUT_COLUMNS}
+
+    for col in _SCALED:
+        columns[col] = columns[col] * np.exp(load_jitter * rng.standard_normal(n_samples))
+
+    redraw = rng.random(n_samples) < geometry_fraction
+    for col in _GEOMETRY:
+        low, high = df[col].min(), df[col].max()
+        columns[col][redraw] = rng.uniform(low, high, size=redraw.sum())
+    return columns
+
+
+def teacher_labels(teacher: PillarPredictor, columns: dict) -> tuple:
+    """
+    Feature matrix, Ac and teacher rho of the samples the classifier accepts
+    (the only rows the regressor scores in gated inference).
+    """
+    X, Ac = build_feature_matrix(columns, dtype=teacher.feature_dtype)
+    feasibility, _ = teacher.classify_features(X)
+    mask = feasibility == 1
+    X, Ac = X[mask], Ac[mask]
+    return X, Ac, teacher.regress_features(X)
+
+
+def train_student(X: np.ndarray, rho: np.ndarray, Ac: np.ndarray, params: dict = None,
+                  holdout: float = DISTILL_HOLDOUT, seed: int = RANDOM_STATE) -> tuple:
+    """
+    Fit the student on (X, teacher rho), early-stopping on a random holdout.
+    Rows are weighted by Ac, so the loss follows the As error (rho * Ac)
+    instead of treating small and large sections alike.
+
+    Returns:
+        Tuple (student, holdout_idx): LGBMRegressor and the holdout rows of X
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(X))
+    n_holdout = int(len(X) * holdout)
+    val_idx, train_idx = np.sort(order[:n_holdout]), np.sort(order[n_holdout:])
+
+    student = lgb.LGBMRegressor(**(params or STUDENT_PARAMS))
+    student.fit(
+        pd.DataFrame(X[train_idx], columns=FEATURE_COLUMNS), rho[train_idx], sample_weight=Ac[train_idx],
+        eval_set=[(pd.DataFrame(X[val_idx], columns=FEATURE_COLUMNS), rho[val_idx])],
+        eval_sample_weight=[Ac[val_idx]],
+        callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+    return student, val_idx
+
+
+def compare_to_teacher(teacher_engine, student_engine, X: np.ndarray, Ac: np.ndarray,
+                       repeat: int = 3) -> dict:
+    """
+    As error of the student versus the teacher (cm²) and regressor throughput
+    of both (rows/s, best of `repeat`) on the same rows.
+    """
+    def best(engine):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rho = engine.predict(X)
+            times.append(time.perf_counter() - start)
+        return rho, min(times)
+
+    rho_teacher, t_teacher = best(teacher_engine)
+    rho_student, t_student = best(student_engine)
+    error = np.abs(rho_student - rho_teacher) * Ac
+    return {
+        'rows': len(X),
+        'As_mae_cm2': float(error.mean()),
+        'As_p95_cm2': float(np.percentile(error, 95)),
+        'As_max_cm2': float(error.max()),
+        'As_mae_pct': float(100 * error.sum() / np.abs(rho_teacher * Ac).sum()),
+        'teacher_rows_per_s': len(X) / t_teacher,
+        'student_rows_per_s': len(X) / t_student,
+        'speedup': t_teacher / t_student,
+    }
+
+
+def distill(teacher: PillarPredictor = None, n_samples: int = DISTILL_SAMPLES, params: dict = None,
+            output_path=None, seed: int = RANDOM_STATE) -> dict:
+    """
+    Sample, label, train and save the student regressor.
+
+    Args:
+        teacher: Exact-mode predictor supplying both models (default: PillarPredictor(mode='exact'))
+        n_samples: Synthetic pillars drawn before the feasibility filter
+        params: Student params (default: STUDENT_PARAMS)
+        output_path: Where to save the student (default: MODEL_PATH_STUDENT)
+
+    Returns:
+        dict with the student, its path and compare_to_teacher reports on the
+        synthetic holdout ('holdout') and on the CSV rows the classifier
+        accepts ('csv'), plus the sample counts
+    """
+    teacher = teacher or PillarPredictor(mode='exact')
+    output_path = output_path or MODEL_PATH_STUDENT
+    df = load_dataset()
+
+    logger.info(f"Distillation: labelling {n_samples} synthetic pillars with the full regressor")
+    X, Ac, rho = teacher_labels(teacher, sample_inputs(df, n_samples, seed=seed))
+    student, val_idx = train_student(X, rho, Ac, params, seed=seed)
+    save_model(student, output_path)
+
+    X_csv, Ac_csv, _ = teacher_labels(teacher, {col: df[col].to_numpy() for col in INPUT_COLUMNS})
+    return {
+        'student': student,
+        'path': output_path,
+        'samples': n_samples,
+        'feasible_samples': len(X),
+        'n_trees': student.booster_.num_trees(),
+        'holdout': compare_to_teacher(teacher.regressor_engine, student.booster_, X[val_idx], Ac[val_idx]),
+        'csv': compare_to_teacher(teacher.regressor_engine, student.booster_, X_csv, Ac_csv),
+    }
@@ -6,6 +6,7 @@ Creates engineered features from raw data.
 import numpy as np
 import pandas as pd
 
+from .config import FEATURE_COLUMNS, INPUT_COLUMNS
 from .utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -125,6 +126,196 @@ def create_engineered_features(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def build_feature_matrix(columns: dict, dtype=np.float64, out: np.ndarray = None) -> tuple:
+    """
+    Build the FEATURE_COLUMNS matrix directly from raw input arrays.
+    
+    Columnar counterpart of create_engineered_features: no DataFrame is
+    created and every feature is computed with in-place ufuncs (out=) into
+    one preallocated 2-D array in FEATURE_COLUMNS order, using a handful of
+    1-D scratch buffers. The matrix is column-major (order='F') so each
+    feature is a contiguous column; LightGBM reads it without a copy.
+    Scalars are broadcast against the arrays, so fixed parameters can be
+    passed as plain numbers.
+    
+    Sweeps (some inputs smaller than the broadcast shape, e.g. scalar loads
+    with a vector of widths, or N as a column and M as a row vector) go
+    through _sweep_features instead: every sub-expression is computed once
+    in the shape of the inputs it depends on and only broadcast when it is
+    written into X, so the cost follows the varying part of the sweep.
+    
+    Args:
+        columns: Mapping with every name in INPUT_COLUMNS (arrays or scalars)
+        dtype: np.float64 (bit-identical to create_engineered_features) or
+               np.float32 (half the memory)
+        out: Optional preallocated (n_rows, len(FEATURE_COLUMNS)) array to fill
+        
+    Returns:
+        Tuple (X, Ac) with X of shape (n_rows, len(FEATURE_COLUMNS))
+    """
+    missing = set(INPUT_COLUMNS) - set(columns)
+    if missing:
+        raise KeyError(f"Missing input columns: {missing}")
+    
+    shape = np.broadcast_shapes(*(np.shape(columns[name]) for name in INPUT_COLUMNS))
+    n_rows = int(np.prod(shape))
+    
+    if out is None:
+        X = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=dtype, order='F')
+    else:
+        if out.shape != (n_rows, len(FEATURE_COLUMNS)):
+            raise ValueError(f"out has shape {out.shape}, expected {(n_rows, len(FEATURE_COLUMNS))}")
+        X = out
+        dtype = X.dtype
+    f = {name: X[:, i] for i, name in enumerate(FEATURE_COLUMNS)}
+    
+    if any(np.size(columns[name]) < n_rows for name in INPUT_COLUMNS):
+        features, Ac = _sweep_features(columns)
+        for name, values in features.items():
+            np.copyto(f[name].reshape(shape), values, casting='same_kind')
+        return X, np.broadcast_to(Ac, shape).ravel()
+    
+    # 1. Dados básicos e esforços brutos (broadcast direto na coluna de destino)
+    for name in INPUT_COLUMNS:
+        np.copyto(f[name].reshape(shape), columns[name], casting='same_kind')
+    
+    largura, altura = f['largura'], f['Altura']
+    N_top, N_base = f['N_top'], f['N_base']
+    Mx_top, Mx_base = f['Mx_top'], f['Mx_base']
+    My_top, My_base = f['My_top'], f['My_base']
+    
+    # Buffers temporários reaproveitados ao longo do kernel
+    N_max, Mx_max, My_max, fcd, tmp = (np.empty(n_rows, dtype=dtype) for _ in range(5))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 2. Médias e variações
+        for med, top, base in (('N_med', N_top, N_base), ('Mx_med', Mx_top, Mx_base),
+                               ('My_med', My_top, My_base)):
+            np.add(top, base, out=f[med])
+            np.divide(f[med], 2, out=f[med])
+        np.subtract(N_base, N_top, out=f['dN'])
+        np.subtract(Mx_base, Mx_top, out=f['dMx'])
+        np.subtract(My_base, My_top, out=f['dMy'])
+        
+        # 3. Esforços máximos
+        for target, top, base in ((N_max, N_top, N_base), (Mx_max, Mx_top, Mx_base),
+                                  (My_max, My_top, My_base)):
+            np.abs(top, out=target)
+            np.abs(base, out=tmp)
+            np.maximum(target, tmp, out=target)
+        
+        # 4. Variáveis físicas (mesma ordem de operações de create_engineered_features)
+        np.divide(f['fck'], 1.4, out=fcd)
+        np.divide(fcd, 10.0, out=fcd)
+        Ac = np.multiply(largura, altura)
+        
+        np.multiply(Ac, fcd, out=tmp)
+        np.multiply(N_max, 1.4, out=f['nu'])
+        np.divide(f['nu'], tmp, out=f['nu'])
+        
+        for mu, moment, arm in (('mu_x', Mx_max, altura), ('mu_y', My_max, largura)):
+            np.multiply(Ac, arm, out=tmp)
+            np.multiply(tmp, fcd, out=tmp)
+            np.multiply(moment, 1.4, out=f[mu])
+            np.multiply(f[mu], 100, out=f[mu])
+            np.divide(f[mu], tmp, out=f[mu])
+        
+        np.square(f['mu_x'], out=tmp)
+        np.square(f['mu_y'], out=f['mu_total'])
+        np.add(tmp, f['mu_total'], out=f['mu_total'])
+        np.sqrt(f['mu_total'], out=f['mu_total'])
+        
+        for lam, side in (('lambda_x', largura), ('lambda_y', altura)):
+            np.multiply(f['PeDireito'], 3.46, out=f[lam])
+            np.divide(f[lam], side, out=f[lam])
+        
+        # 5. Excentricidades (0 quando N_max == 0)
+        nonzero = N_max != 0
+        for e, moment in (('e_x', Mx_max), ('e_y', My_max)):
+            f[e][:] = 0
+            np.divide(moment, N_max, out=f[e], where=nonzero)
+        
+        # 6. Features avançadas
+        eps = 1e-6
+        for ratio, top, base in (('ratio_M_x', Mx_top, Mx_base), ('ratio_M_y', My_top, My_base)):
+            np.add(base, eps, out=tmp)
+            np.divide(top, tmp, out=f[ratio])
+        
+        for index, lam in (('index_2nd_order_x', 'lambda_x'), ('index_2nd_order_y', 'lambda_y')):
+            np.square(f[lam], out=tmp)
+            np.multiply(f['nu'], tmp, out=f[index])
+        
+        np.divide(altura, largura, out=tmp)
+        np.divide(largura, altura, out=f['aspect_ratio'])
+        np.maximum(tmp, f['aspect_ratio'], out=f['aspect_ratio'])
+        
+        np.arctan2(f['mu_y'], f['mu_x'], out=f['theta_moment'])
+    
+    return X, Ac
+
+
+def _sweep_features(columns: dict) -> tuple:
+    """
+    Features of a sweep, each one in the broadcast shape of its own inputs.
+    
+    Load-only terms (N_med, dN, e_x, ratio_M_x, ...) keep the shape of the
+    loads, geometry-only terms (Ac, lambda_x, aspect_ratio, ...) the shape of
+    the geometry, and only mixed terms (nu, mu_x, theta_moment, ...) take the
+    combined shape. Same operations and order as create_engineered_features,
+    computed in float64.
+    
+    Returns:
+        Tuple (features, Ac): dict FEATURE_COLUMNS -> unbroadcast array, and Ac
+    """
+    raw = {name: np.asarray(columns[name], dtype=np.float64) for name in INPUT_COLUMNS}
+    largura, altura = raw['largura'], raw['Altura']
+    N_top, N_base = raw['N_top'], raw['N_base']
+    Mx_top, Mx_base = raw['Mx_top'], raw['Mx_base']
+    My_top, My_base = raw['My_top'], raw['My_base']
+    
+    features = dict(raw)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Só cargas
+        features['N_med'] = (N_top + N_base) / 2
+        features['Mx_med'] = (Mx_top + Mx_base) / 2
+        features['My_med'] = (My_top + My_base) / 2
+        features['dN'] = N_base - N_top
+        features['dMx'] = Mx_base - Mx_top
+        features['dMy'] = My_base - My_top
+        
+        N_max = np.maximum(np.abs(N_top), np.abs(N_base))
+        Mx_max = np.maximum(np.abs(Mx_top), np.abs(Mx_base))
+        My_max = np.maximum(np.abs(My_top), np.abs(My_base))
+        
+        features['e_x'] = np.where(N_max != 0, Mx_max / N_max, 0.0)
+        features['e_y'] = np.where(N_max != 0, My_max / N_max, 0.0)
+        features['ratio_M_x'] = Mx_top / (Mx_base + 1e-6)
+        features['ratio_M_y'] = My_top / (My_base + 1e-6)
+        
+        # Só geometria (e materiais)
+        fcd = (raw['fck'] / 1.4) / 10.0
+        Ac = largura * altura
+        lambda_x = (raw['PeDireito'] * 3.46) / largura
+        lambda_y = (raw['PeDireito'] * 3.46) / altura
+        features['lambda_x'] = lambda_x
+        features['lambda_y'] = lambda_y
+        features['aspect_ratio'] = np.maximum(altura / largura, largura / altura)
+        
+        # Termos mistos
+        nu = (N_max * 1.4) / (Ac * fcd)
+        mu_x = ((Mx_max * 1.4) * 100) / ((Ac * altura) * fcd)
+        mu_y = ((My_max * 1.4) * 100) / ((Ac * largura) * fcd)
+        features['nu'] = nu
+        features['mu_x'] = mu_x
+        features['mu_y'] = mu_y
+        features['mu_total'] = np.sqrt(np.square(mu_x) + np.square(mu_y))
+        features['index_2nd_order_x'] = nu * np.square(lambda_x)
+        features['index_2nd_order_y'] = nu * np.square(lambda_y)
+        features['theta_moment'] = np.arctan2(mu_y, mu_x)
+    
+    return features, Ac
+
+
 def create_target_variable(df: pd.DataFrame) -> pd.DataFrame:
     """
     Create the target variable rho (steel ratio).
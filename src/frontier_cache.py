@@ -0,0 +1,126 @@
+"""
+Persistent on-disk cache of probability grids and frontier curves.
+Each entry is one .npz file named by a hash of the query (base pillar,
+grid ranges, resolution, model fingerprint). Reads refresh the file's
+mtime, and the least recently used entries are evicted above a size cap.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .config import FRONTIER_CACHE_DIR, FRONTIER_CACHE_MAX_MB
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class FrontierCache:
+    """
+    LRU cache of named NumPy arrays stored as .npz files.
+
+    Usage:
+        cache = FrontierCache()
+        key = cache.key(kind='interaction', base=base_pillar, model=predictor.model_fingerprint)
+        arrays = cache.get(key)
+        if arrays is None:
+            arrays = {...}
+            cache.put(key, arrays)
+    """
+
+    def __init__(self, cache_dir=None, max_mb: float = FRONTIER_CACHE_MAX_MB):
+        self.cache_dir = Path(cache_dir or FRONTIER_CACHE_DIR)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(**params) -> str:
+        """Stable hash of the query parameters (dicts, tuples, NumPy scalars)."""
+        text = json.dumps(params, sort_keys=True, default=_to_json)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """Return the stored dict of arrays, or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (FileNotFoundError, OSError, ValueError):
+            # Ausente, truncado por uma escrita interrompida ou removido por outra eviction
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # marca como usado recentemente (ordem do LRU)
+        except FileNotFoundError:
+            # Removido por outro processo entre a leitura e o toque
+            self.misses += 1
+            return None
+        self.hits += 1
+        return arrays
+
+    def put(self, key: str, arrays: dict) -> None:
+        """Store a dict of arrays and evict old entries above the size cap."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Escrita atômica: arquivo temporário no mesmo diretório + rename
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def clear(self) -> None:
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            'entries': len(entries),
+            'size_mb': sum(p.stat().st_size for p in entries) / (1024 * 1024),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def _entries(self) -> list:
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob('*.npz'))
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Evicted frontier cache entry {path.name}")
+
+
+def _to_json(value):
+    """json.dumps fallback for NumPy values and other sequences."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, range)):
+        return np.asarray(value).tolist()
+    return str(value)
@@ -7,14 +7,14 @@ from .utils import print_separator, setup_logger
 
 logger = setup_logger(__name__)
 
-def example_single_prediction():
+def example_single_prediction(predictor: PillarPredictor = None):
     """
     Test: Predict for a SINGLE REAL PILLAR from the dataset.
     We use a known row to compare the Model vs Reality.
     """
     print_separator("TEST 1: SINGLE PILLAR PREDICTION (REAL DATA)")
     
-    predictor = PillarPredictor()
+    predictor = predictor or PillarPredictor()
     
     # === DADOS REAIS DO CSV (Linha com As=4.7) ===
     # Pilar: 200x45x15 (PeDireito x Largura x Altura)
@@ -51,12 +51,12 @@ def example_single_prediction():
         print("ALERTA: O modelo classificou este pilar real como INVIÁVEL.")
 
 
-def example_batch_test():
+def example_batch_test(predictor: PillarPredictor = None):
     """
     Test: Predict for a batch including the real pillar and a hypothetical fail case.
     """
     print_separator("TEST 2: BATCH PREDICTION")
-    predictor = PillarPredictor()
+    predictor = predictor or PillarPredictor()
     pillars = [
         # 1. O Pilar Real (deve passar)
         {'fck': 50, 'PeDireito': 235, 'largura': 30, 'Altura': 95, 'Cobrimento': 2.5,   
@@ -80,14 +80,14 @@ def example_batch_test():
         print(f"{cases[i]:<10} {status:<12} {row['prob_feasible']:.1%}   {row['As_predicted']:<10.2f} {row['As_actual']:<10.2f}")
 
 
-def example_compare_variations():
+def example_compare_variations(predictor: PillarPredictor = None):
     """
     Test: Compare predictions for same loads with different dimensions.
     Using the REAL LOADS from the CSV pillar.
     """
     print_separator("TEST 3: OTIMIZAÇÃO (VARIAÇÃO DE SEÇÃO)")
     
-    predictor = PillarPredictor()
+    predictor = predictor or PillarPredictor()
     
     # Cargas do Pilar Real
     base_loads = {
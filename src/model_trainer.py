@@ -137,6 +137,79 @@ def print_feature_importance(model, feature_columns: list, top_n: int = 15) -> N
     print(feature_importance_df.head(top_n).to_string(index=False))
 
 
+class BoosterClassifier:
+    """
+    LGBMClassifier-compatible view of a binary Booster trained with lgb.train.
+    Exposes what the rest of the project uses: booster_, predict,
+    predict_proba and feature_importances_.
+    """
+
+    def __init__(self, booster: lgb.Booster):
+        self.booster_ = booster
+
+    @property
+    def best_iteration_(self) -> int:
+        return self.booster_.best_iteration
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.booster_.feature_importance()
+
+    def predict_proba(self, X) -> np.ndarray:
+        prob = self.booster_.predict(X)
+        return np.column_stack([1 - prob, prob])
+
+    def predict(self, X) -> np.ndarray:
+        # Mesmo critério do LGBMClassifier (argmax das probabilidades)
+        return (self.booster_.predict(X) > 0.5).astype(int)
+
+
+class BoosterRegressor:
+    """LGBMRegressor-compatible view of a Booster trained with lgb.train."""
+
+    def __init__(self, booster: lgb.Booster):
+        self.booster_ = booster
+
+    @property
+    def best_iteration_(self) -> int:
+        return self.booster_.best_iteration
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.booster_.feature_importance()
+
+    def predict(self, X) -> np.ndarray:
+        return self.booster_.predict(X)
+
+
+def train_booster(params: dict, train_set: lgb.Dataset, valid_set: lgb.Dataset,
+                  classifier: bool):
+    """
+    Train with lgb.train on prebuilt Datasets (same early stopping/logging as
+    the sklearn path) and wrap the Booster in BoosterClassifier/BoosterRegressor.
+    
+    Args:
+        params: sklearn-style parameter dict (CLASSIFIER_PARAMS/REGRESSOR_PARAMS)
+        train_set, valid_set: Datasets (e.g. loaded from .bin files)
+        classifier: True for the feasibility stage
+    """
+    params = dict(params)
+    # n_estimators é do wrapper sklearn; 100 é o padrão dele
+    num_boost_round = params.pop('n_estimators', 100)
+    
+    booster = lgb.train(
+        params,
+        train_set,
+        num_boost_round=num_boost_round,
+        valid_sets=[valid_set],
+        callbacks=[
+            lgb.early_stopping(EARLY_STOPPING_ROUNDS),
+            lgb.log_evaluation(VERBOSE_EVAL)
+        ]
+    )
+    return BoosterClassifier(booster) if classifier else BoosterRegressor(booster)
+
+
 def save_model(model, file_path: str) -> None:
     """Save trained model to disk (path is now mandatory)."""
     logger.info(f"Saving model to: {file_path}")
@@ -6,17 +6,92 @@ Encontra a largura/seção que minimiza o Custo Global (Concreto + Aço).
 import numpy as np
 import pandas as pd
 import itertools
+from .config import (
+    INPUT_COLUMNS,
+    OPTIMIZER_CHUNK_SIZE,
+    OPTIMIZER_COARSE_ITERATIONS,
+    OPTIMIZER_COARSE_TOLERANCE,
+)
 from .predictor import PillarPredictor
-from .utils import setup_logger, print_separator
+from .utils import setup_logger, print_separator, timed
 
 logger = setup_logger(__name__)
 
+# Eixos que podem ser varridos por find_optimal_section
+SECTION_AXES = ['largura', 'Altura', 'fck', 'Cobrimento']
+
+
+def concrete_cost(largura, altura, pe_direito, fck, costs: dict):
+    """
+    Custo do concreto: V = b * h * L (tudo convertido para metros) * preço/m³.
+    costs['concreto_m3'] pode ser um preço único ou um dict {fck: preço}.
+    """
+    vol_concreto = (largura/100) * (altura/100) * (pe_direito/100)
+    price = costs['concreto_m3']
+    if isinstance(price, dict):
+        price = pd.Series(np.broadcast_to(fck, np.shape(vol_concreto))).map(price).values
+    return vol_concreto * price
+
+
+def steel_cost(As, pe_direito, costs: dict):
+    """
+    Custo do aço: Peso = As (cm²) * Comprimento (m) * Densidade Linear Aprox.
+    Densidade do aço ~ 7850 kg/m³.
+    1 cm² de aço em 1 m de barra = 1e-4 m² * 1 m * 7850 kg/m³ = 0.785 kg
+    """
+    peso_aco = As * (pe_direito/100) * 0.785
+    return peso_aco * costs['aco_kg']
+
+
+def _constraint_mask(largura, altura, fck, N_max, constraints: dict) -> np.ndarray:
+    """Candidatos que respeitam as restrições {'min_dimension', 'min_area', 'max_aspect_ratio', 'max_nu'}."""
+    keep = np.ones(np.shape(largura), dtype=bool)
+    if 'min_dimension' in constraints:
+        keep &= np.minimum(largura, altura) >= constraints['min_dimension']
+    if 'min_area' in constraints:
+        keep &= largura * altura >= constraints['min_area']
+    if 'max_aspect_ratio' in constraints:
+        keep &= np.maximum(largura / altura, altura / largura) <= constraints['max_aspect_ratio']
+    if 'max_nu' in constraints:
+        # Normal reduzida (mesma definição de create_engineered_features)
+        nu = (N_max * 1.4) / (largura * altura * (fck / 1.4) / 10.0)
+        keep &= nu <= constraints['max_nu']
+    return keep
+
+
 class PillarOptimizer:
-    def __init__(self, predictor: PillarPredictor):
+    def __init__(self, predictor: PillarPredictor, coarse_iterations: int = None,
+                 coarse_tolerance: float = None):
+        """
+        Args:
+            predictor: PillarPredictor (ou CachedPredictor/ParallelPredictor)
+            coarse_iterations: Iterações do regressor na passada grossa das buscas
+                               em grid; 0 = modelo completo em todos os candidatos
+                               (padrão: OPTIMIZER_COARSE_ITERATIONS; 0 com predictor
+                               em modo 'fast', cuja tolerância não foi calibrada)
+            coarse_tolerance: Erro relativo admitido no custo do aço da passada
+                              grossa (padrão: OPTIMIZER_COARSE_TOLERANCE)
+        """
         self.predictor = predictor
+        if coarse_iterations is None:
+            # O aluno destilado já é o modelo rápido: truncá-lo sai da tolerância
+            # calibrada no regressor completo
+            fast = getattr(predictor, 'mode', 'exact') == 'fast'
+            coarse_iterations = 0 if fast else OPTIMIZER_COARSE_ITERATIONS
+        self.coarse_iterations = coarse_iterations
+        self.coarse_tolerance = (OPTIMIZER_COARSE_TOLERANCE if coarse_tolerance is None
+                                 else coarse_tolerance)
+        self.last_search_stats = {}
+        # Linhas enviadas ao predictor (para comparar estratégias de busca)
+        self.n_evaluations = 0
+        # Linhas pontuadas com o regressor completo (todas, sem a passada grossa)
+        self.n_refined = 0
+        # Refinadas cujo rho mudou mais que coarse_tolerance em relação à passada grossa
+        self.n_outside_tolerance = 0
         
     def find_optimal_width(self, fixed_params: dict, loads: dict, 
-                          constraints: dict, costs: dict) -> pd.DataFrame:
+                          constraints: dict, costs: dict, search: str = 'grid',
+                          frontier_window: int = 3) -> pd.DataFrame:
         """
         Para um conjunto de cargas e altura fixos, encontra a LARGURA ideal.
         
@@ -25,6 +100,9 @@ class PillarOptimizer:
             loads: Dict com vetor de cargas {'N_top', 'Mx_top', ...}
             constraints: Limites {'min_largura': 15, 'max_largura': 80, 'step': 5}
             costs: Preços {'aco_kg': 12.0, 'concreto_m3': 450.0}
+            search: 'grid' (avalia todas as larguras) ou 'bisect' (bissecção na
+                    fronteira de viabilidade + custo só a partir dela)
+            frontier_window: Larguras avaliadas por rodada a partir da fronteira ('bisect')
             
         Returns:
             DataFrame com todas as opções ordenadas pelo menor custo.
@@ -37,57 +115,42 @@ class PillarOptimizer:
                          constraints['max_largura'] + 1, 
                          constraints['step'])
         
-        candidates = []
-        for b in larguras:
-            # Monta o candidato mesclando Cargas + Parâmetros Fixos
-            candidate = {**fixed_params, **loads}
-            
-            # Define a geometria variável
-            candidate['largura'] = b
-            
-            # Se 'Altura' não foi fixada, assumimos que é igual à largura (pilar quadrado)
-            # ou o usuário deve passar um range de Alturas também (aqui simplificado para largura)
-            if 'Altura' not in candidate:
-                candidate['Altura'] = b 
-                
-            # Dummy As para o modelo rodar (será previsto depois)
-            candidate['As'] = 0 
-            candidates.append(candidate)
-            
-        # 2. Predição em Massa (IA)
-        # O modelo calcula a viabilidade e a área de aço para todas as larguras de uma vez
-        df_results = self.predictor.predict_batch(candidates)
+        if search == 'bisect':
+            return self._find_optimal_width_bisect(fixed_params, loads, list(larguras),
+                                                   costs, frontier_window)
+        if search != 'grid':
+            raise ValueError(f"Unknown search mode: {search}")
         
-        # Recupera as dimensões para cálculo de custo
-        df_results['largura'] = [c['largura'] for c in candidates]
-        df_results['Altura']  = [c['Altura'] for c in candidates]
-        # PeDireito e fck são constantes neste loop, pegamos do primeiro
-        pe_direito = fixed_params['PeDireito']
+        # Cargas e parâmetros fixos entram como escalares: as features que só
+        # dependem deles são calculadas uma vez e propagadas por broadcast
+        b = np.asarray(larguras, dtype=np.float64)
         
-        # 3. Cálculo de Quantitativos e Custos
+        # Se 'Altura' não foi fixada, assumimos que é igual à largura (pilar quadrado)
+        # ou o usuário deve passar um range de Alturas também (aqui simplificado para largura)
+        h = np.broadcast_to(np.asarray(fixed_params.get('Altura', b), dtype=np.float64), b.shape)
         
-        # A. Volume de Concreto (m³)
-        # V = b * h * L (tudo convertido para metros)
-        vol_concreto = (df_results['largura']/100) * (df_results['Altura']/100) * (pe_direito/100)
-        cost_concreto = vol_concreto * costs['concreto_m3']
+        # 2. Predição em Massa (IA)
+        # O modelo calcula a viabilidade e a área de aço para todas as larguras de uma vez
+        # (As = 0 é só um valor dummy; a armadura é prevista). Sempre o modelo
+        # completo: a tabela devolvida traz o custo exato de todas as larguras
+        df_results = self.predictor.predict_arrays(**{**fixed_params, **loads,
+                                                      'largura': b, 'Altura': h, 'As': 0})
+        self.n_evaluations += len(b)
+        self.n_refined += len(b)
         
-        # B. Peso de Aço (kg)
-        # Peso = As (cm²) * Comprimento (m) * Densidade Linear Aprox
-        # Densidade do aço ~ 7850 kg/m³. 
-        # 1 cm² de aço em 1 m de barra = 1e-4 m² * 1 m * 7850 kg/m³ = 0.785 kg
-        peso_aco = df_results['As_predicted'] * (pe_direito/100) * 0.785
-        cost_aco = peso_aco * costs['aco_kg']
+        # Recupera as dimensões para cálculo de custo
+        df_results['largura'] = b
+        df_results['Altura'] = h
         
-        # 4. Composição do Custo Total
-        df_results['custo_concreto'] = cost_concreto
-        df_results['custo_aco'] = cost_aco
-        df_results['custo_total'] = cost_concreto + cost_aco
+        # 3/4. Quantitativos, custos e custo total
+        self._add_costs(df_results, fixed_params, costs)
         
         # 5. Penalização (Pilar Inviável)
         # Se o classificador (Fiscal) disse que não passa, custo vira infinito
         # Se a probabilidade for muito baixa (<50%), também penalizamos
 # 5. Penalização (Pilar Inviável)
-        mask_inviavel = (df_results['is_feasible'] == 0) | (df_results['prob_feasible'] < 0.5)
+        # (o limiar de probabilidade já é aplicado pelo predictor em 'is_feasible')
+        mask_inviavel = df_results['is_feasible'] == 0
         
         # === DEBUG: VER O QUE ESTÁ ACONTECENDO ===
         print("\n--- DEBUG OTIMIZADOR (Primeiras 10 tentativas) ---")
@@ -102,4 +165,473 @@ class PillarOptimizer:
         # 6. Ordenação
         df_final = df_results.sort_values('custo_total').reset_index(drop=True)
         
-        return df_final
\ No newline at end of file
+        return df_final
+
+    def optimize_building(self, pillars: pd.DataFrame, search_space: dict, costs: dict,
+                          constraints: dict = None,
+                          chunk_size: int = OPTIMIZER_CHUNK_SIZE) -> tuple:
+        """
+        Otimiza todos os pilares de um edifício em uma passada vetorizada.
+        
+        O grid de candidatos (search_space) é expandido para cada pilar em uma
+        grande matriz de candidatos, avaliada em blocos de até chunk_size
+        linhas (memória limitada; grids maiores que chunk_size são divididos
+        entre blocos), e cada pilar é reduzido à seção viável mais
+        barata com um groupby-argmin.
+        
+        Args:
+            pillars: Tabela com uma linha por pilar: cargas e parâmetros fixos
+                     (todas as colunas de INPUT_COLUMNS que não forem varridas)
+            search_space: Valores por eixo de SECTION_AXES, ex: {'largura': ..., 'Altura': ...}
+            costs: Preços {'aco_kg': 12.0, 'concreto_m3': 450.0 ou {fck: preço}}
+            constraints: Podas opcionais (ver find_optimal_section)
+            chunk_size: Máximo de candidatos por chamada ao predictor
+            
+        Returns:
+            (DataFrame com a tabela de pilares + '<eixo>_otimo' e custos,
+             dict com o tempo em segundos de cada fase)
+        """
+        logger.info(f"Otimização em lote: {len(pillars)} pilares...")
+        timings = {}
+        constraints = constraints or {}
+        
+        with timed('expand', timings):
+            axes = [axis for axis in SECTION_AXES if axis in search_space]
+            mesh = np.meshgrid(*[np.asarray(search_space[a], dtype=np.float64) for a in axes],
+                               indexing='ij')
+            grid = {axis: values.ravel() for axis, values in zip(axes, mesh)}
+            n_grid = mesh[0].size
+            
+            fixed_columns = [col for col in INPUT_COLUMNS if col not in grid]
+            missing = set(fixed_columns) - set(pillars.columns)
+            if missing:
+                raise KeyError(f"Missing pillar columns: {missing}")
+            pillar_values = {col: pillars[col].to_numpy(dtype=np.float64) for col in fixed_columns}
+        
+        n_pillars = len(pillars)
+        # Grids maiores que chunk_size são divididos: um bloco nunca passa de chunk_size
+        grid_per_chunk = min(n_grid, chunk_size)
+        pillars_per_chunk = max(1, chunk_size // n_grid)
+        result_columns = axes + ['prob_feasible', 'As_predicted',
+                                 'custo_concreto', 'custo_aco', 'custo_total']
+        best_parts = []
+        
+        for start in range(0, n_pillars, pillars_per_chunk):
+            stop = min(start + pillars_per_chunk, n_pillars)
+            for grid_start in range(0, n_grid, grid_per_chunk):
+                grid_stop = min(grid_start + grid_per_chunk, n_grid)
+                
+                # 1. Expansão pilares x candidatos
+                with timed('expand', timings):
+                    pillar_idx = np.repeat(np.arange(start, stop), grid_stop - grid_start)
+                    columns = {col: values[pillar_idx] for col, values in pillar_values.items()}
+                    columns.update({axis: np.tile(values[grid_start:grid_stop], stop - start)
+                                    for axis, values in grid.items()})
+                    
+                    N_max = np.maximum(np.abs(columns['N_top']), np.abs(columns['N_base']))
+                    keep = _constraint_mask(columns['largura'], columns['Altura'], columns['fck'],
+                                            N_max, constraints)
+                    if not keep.any():
+                        continue
+                    columns = {col: values[keep] for col, values in columns.items()}
+                    pillar_idx = pillar_idx[keep]
+                
+                # 2. Predição do bloco inteiro (grosso-fino por pilar)
+                with timed('predict', timings):
+                    concrete = concrete_cost(columns['largura'], columns['Altura'],
+                                             columns['PeDireito'], columns['fck'], costs)
+                    df_chunk = self._score(columns, concrete, columns['PeDireito'], costs,
+                                           groups=pillar_idx - start)
+                
+                # 3. Custos + groupby-argmin por pilar
+                with timed('reduce', timings):
+                    for axis in axes:
+                        df_chunk[axis] = columns[axis]
+                    df_chunk['pillar'] = pillar_idx
+                    df_chunk['custo_concreto'] = concrete
+                    df_chunk['custo_aco'] = steel_cost(df_chunk['As_predicted'], columns['PeDireito'], costs)
+                    df_chunk['custo_total'] = df_chunk['custo_concreto'] + df_chunk['custo_aco']
+                    
+                    feasible = df_chunk[df_chunk['is_feasible'] == 1]
+                    best_idx = feasible.groupby('pillar')['custo_total'].idxmin()
+                    best_parts.append(feasible.loc[best_idx, ['pillar'] + result_columns])
+        
+        with timed('reduce', timings):
+            if best_parts:
+                # Um pilar pode aparecer em vários blocos quando o grid foi dividido
+                best = pd.concat(best_parts, ignore_index=True)
+                best = best.loc[best.groupby('pillar')['custo_total'].idxmin()].set_index('pillar')
+            else:
+                best = pd.DataFrame(columns=result_columns)
+            best = best.reindex(range(n_pillars))
+            best['custo_total'] = best['custo_total'].fillna(float('inf'))
+            
+            df_final = pillars.reset_index(drop=True).copy()
+            for col in result_columns:
+                name = f"{col}_otimo" if col in axes else col
+                df_final[name] = best[col].values
+        
+        timings['total'] = timings.get('expand', 0) + timings.get('predict', 0) + timings.get('reduce', 0)
+        n_found = np.isfinite(df_final['custo_total']).sum()
+        logger.info(f"Otimização em lote concluída: {n_found}/{n_pillars} pilares com solução viável.")
+        return df_final, timings
+
+    def find_section_frontier(self, fixed_params: dict, loads: dict,
+                              larguras, alturas) -> pd.DataFrame:
+        """
+        Caminha pela fronteira de viabilidade no plano largura x Altura.
+        
+        Para cargas fixas a viabilidade é (essencialmente) monotônica no
+        tamanho da seção: para cada altura, em ordem crescente, a menor
+        largura viável é encontrada por bissecção, e como essa fronteira
+        não cresce com a altura, a largura da altura anterior serve de
+        limite superior para a seguinte.
+        
+        Returns:
+            DataFrame com 'Altura', 'largura_min' (NaN se nenhuma largura
+            passa) e 'idx_largura' (índice em larguras ordenadas, -1 se nenhuma).
+        """
+        larguras = sorted(larguras)
+        base = {**fixed_params, **loads}
+        
+        hi, hi_known_feasible = len(larguras) - 1, False
+        rows = []
+        for h in sorted(alturas):
+            idx = self._first_feasible(
+                lambda i: self._is_feasible(base, largura=larguras[i], Altura=h),
+                0, hi, hi_known_feasible,
+            )
+            if idx is None:
+                rows.append({'Altura': h, 'largura_min': np.nan, 'idx_largura': -1})
+                continue
+            rows.append({'Altura': h, 'largura_min': larguras[idx], 'idx_largura': idx})
+            hi, hi_known_feasible = idx, True
+        
+        return pd.DataFrame(rows)
+
+    def find_optimal_section_bisect(self, fixed_params: dict, loads: dict, larguras, alturas,
+                                    costs: dict, frontier_window: int = 3) -> pd.DataFrame:
+        """
+        Versão 2D da busca por bissecção: localiza a fronteira com
+        find_section_frontier e só calcula custo a partir dela (ver
+        _walk_from_frontier), em vez de avaliar o grid inteiro.
+        
+        Returns:
+            DataFrame com as seções avaliadas ordenadas pelo menor custo.
+        """
+        larguras = np.array(sorted(larguras), dtype=np.float64)
+        frontier = self.find_section_frontier(fixed_params, loads, larguras, alturas)
+        
+        rows = [
+            (larguras[idx:], np.full(len(larguras) - idx, h, dtype=np.float64))
+            for h, idx in zip(frontier['Altura'], frontier['idx_largura']) if idx >= 0
+        ]
+        if not rows:
+            logger.warning("Nenhuma seção viável encontrada; retornando a maior.")
+            rows = [(larguras[-1:], np.array([max(alturas)], dtype=np.float64))]
+        return self._walk_from_frontier(fixed_params, loads, rows, costs, frontier_window)
+
+    def find_optimal_section(self, fixed_params: dict, loads: dict, search_space: dict,
+                             costs: dict, constraints: dict = None, top_k: int = 10,
+                             chunk_size: int = OPTIMIZER_CHUNK_SIZE) -> pd.DataFrame:
+        """
+        Busca conjunta da seção mais barata em largura x Altura x fck x Cobrimento.
+        
+        Args:
+            fixed_params: Dict com 'PeDireito' e os eixos que não serão varridos
+            loads: Dict com vetor de cargas {'N_top', 'Mx_top', ...}
+            search_space: Valores por eixo, ex: {'largura': range(15, 81, 5),
+                          'Altura': range(15, 121, 5), 'fck': [25, 30, 40], 'Cobrimento': [2.5, 3.0]}
+            costs: Preços {'aco_kg': 12.0, 'concreto_m3': 450.0 ou {fck: preço}}
+            constraints: Podas opcionais {'min_dimension', 'min_area', 'max_aspect_ratio', 'max_nu'}
+            top_k: Quantidade de seções viáveis retornadas
+            chunk_size: Candidatos avaliados por chamada ao predictor
+            
+        Returns:
+            DataFrame com as top_k seções viáveis ordenadas pelo menor custo.
+        """
+        best = None
+        for best in self.iter_optimal_sections(fixed_params, loads, search_space, costs,
+                                               constraints, top_k, chunk_size):
+            pass
+        return best
+
+    def iter_optimal_sections(self, fixed_params: dict, loads: dict, search_space: dict,
+                              costs: dict, constraints: dict = None, top_k: int = 10,
+                              chunk_size: int = OPTIMIZER_CHUNK_SIZE):
+        """
+        Versão em streaming de find_optimal_section: produz o top-K parcial
+        após cada bloco avaliado.
+        
+        Todos os candidatos que passam nas restrições são avaliados: o custo
+        do concreto como limite inferior não poda nada com preços realistas
+        (o aço domina as seções pequenas). O tempo cresce linearmente com o
+        grid, da ordem de dezenas de segundos para ~10⁵ candidatos em um
+        núcleo; para grids grandes use as restrições, o ParallelPredictor ou
+        find_optimal_section_bisect.
+        """
+        logger.info("Iniciando otimização multidimensional de seção...")
+        pe_direito = fixed_params['PeDireito']
+        
+        # 1. Grid completo + podas por restrições
+        grid, n_total = self._section_grid(fixed_params, loads, search_space, constraints or {})
+        n_grid = len(grid['largura'])
+        
+        # 2. Custo do concreto de cada candidato
+        concrete = np.asarray(
+            concrete_cost(grid['largura'], grid['Altura'], pe_direito, grid['fck'], costs),
+            dtype=np.float64,
+        )
+        
+        columns = SECTION_AXES + ['prob_feasible', 'As_predicted',
+                                  'custo_concreto', 'custo_aco', 'custo_total']
+        best = pd.DataFrame(columns=columns)
+        n_evaluated = 0
+        
+        for start in range(0, n_grid, chunk_size):
+            chunk = {axis: values[start:start + chunk_size] for axis, values in grid.items()}
+            df_chunk = self._score({**fixed_params, **loads, **chunk},
+                                   concrete[start:start + chunk_size], pe_direito, costs,
+                                   top_k=top_k,
+                                   best_known=best['custo_total'].to_numpy(dtype=np.float64))
+            n_evaluated += len(df_chunk)
+            
+            for axis in SECTION_AXES:
+                df_chunk[axis] = chunk[axis]
+            df_chunk['custo_concreto'] = concrete[start:start + chunk_size]
+            df_chunk['custo_aco'] = steel_cost(df_chunk['As_predicted'], pe_direito, costs)
+            df_chunk['custo_total'] = df_chunk['custo_concreto'] + df_chunk['custo_aco']
+            
+            feasible = df_chunk.loc[df_chunk['is_feasible'] == 1, columns]
+            if len(feasible):
+                merged = feasible if best.empty else pd.concat([best, feasible])
+                best = merged.nsmallest(top_k, 'custo_total').reset_index(drop=True)
+            yield best
+        
+        self.last_search_stats = {
+            'candidates': n_total,
+            'after_constraints': n_grid,
+            'evaluated': n_evaluated,
+        }
+        logger.info(f"Busca concluída: {self.last_search_stats}")
+        if n_evaluated == 0:
+            yield best
+
+    def _find_optimal_width_bisect(self, fixed_params: dict, loads: dict, larguras: list,
+                                   costs: dict, frontier_window: int) -> pd.DataFrame:
+        """
+        Bissecção na largura: encontra a menor largura viável com O(log n)
+        avaliações e só calcula custo a partir dela (ver _walk_from_frontier).
+        """
+        base = {**fixed_params, **loads}
+        
+        def geometry(b):
+            # Mesma convenção do grid: sem 'Altura' fixa, o pilar é quadrado
+            return {'largura': b, 'Altura': fixed_params.get('Altura', b)}
+        
+        idx = self._first_feasible(
+            lambda i: self._is_feasible(base, **geometry(larguras[i])), 0, len(larguras) - 1
+        )
+        if idx is None:
+            logger.warning("Nenhuma largura viável no intervalo; retornando a maior.")
+            idx = len(larguras) - 1
+        
+        b = np.array(larguras[idx:], dtype=np.float64)
+        h = np.array([geometry(w)['Altura'] for w in larguras[idx:]], dtype=np.float64)
+        return self._walk_from_frontier(fixed_params, loads, [(b, h)], costs, frontier_window)
+
+    def _walk_from_frontier(self, fixed_params: dict, loads: dict, rows: list,
+                            costs: dict, step: int) -> pd.DataFrame:
+        """
+        Avalia o custo partindo da fronteira de viabilidade.
+        
+        Cada linha é um par (larguras, alturas) em ordem crescente de seção,
+        começando na menor seção viável. A cada rodada são avaliadas até
+        `step` seções por linha, em um único lote; uma linha é encerrada
+        quando o custo do concreto (limite inferior do custo total, pois
+        aço >= 0) já não pode superar o melhor custo encontrado. Com
+        viabilidade monotônica o resultado é o mesmo do grid exaustivo.
+        """
+        pe_direito = fixed_params['PeDireito']
+        rows = [
+            (b, h, np.asarray(concrete_cost(b, h, pe_direito, fixed_params.get('fck'), costs)))
+            for b, h in rows
+        ]
+        positions = [0] * len(rows)
+        best_total = float('inf')
+        evaluated = []
+        
+        while True:
+            batch_b, batch_h = [], []
+            for r, (b, h, lower_bound) in enumerate(rows):
+                segment = slice(positions[r], positions[r] + step)
+                n_keep = int((lower_bound[segment] < best_total).sum())
+                batch_b.append(b[segment][:n_keep])
+                batch_h.append(h[segment][:n_keep])
+                # Concreto cresce ao longo da linha: se algo foi podado, a linha acabou
+                done = n_keep < len(lower_bound[segment])
+                positions[r] = len(b) if done else positions[r] + step
+            
+            batch_b, batch_h = np.concatenate(batch_b), np.concatenate(batch_h)
+            if batch_b.size == 0:
+                break
+            df_round = self._evaluate_sections(fixed_params, loads, batch_b, batch_h, costs)
+            evaluated.append(df_round)
+            best_total = min(best_total, df_round['custo_total'].min())
+        
+        return pd.concat(evaluated).sort_values('custo_total').reset_index(drop=True)
+
+    def _score(self, columns: dict, concrete, pe_direito, costs: dict, groups: np.ndarray = None,
+               top_k: int = 1, best_known: np.ndarray = None) -> pd.DataFrame:
+        """
+        predict_arrays com refinamento grosso-fino.
+        
+        A passada grossa usa só as primeiras coarse_iterations iterações do
+        regressor (o classificador é completo: is_feasible é exato). Com o
+        aço conhecido a menos de ±coarse_tolerance, cada candidato viável tem
+        custo entre concreto + aço * (1 - tol) e concreto + aço * (1 + tol);
+        só os que ainda podem estar entre os top_k mais baratos (por grupo,
+        ex. por pilar) são repontuados com o modelo completo. Os demais
+        (viáveis, 'refined' False) ficam com rho/As NaN: o valor da passada
+        grossa não é exato e não deve aparecer em tabelas de custo. Se o erro
+        da passada grossa respeitar a tolerância, nenhum deles supera o ótimo
+        refinado; refinados cujo rho mudou mais que a tolerância são
+        contados em n_outside_tolerance e registrados em aviso.
+        
+        Args:
+            columns: Entradas de predict_arrays (arrays de mesmo tamanho ou escalares)
+            concrete: Custo do concreto de cada candidato
+            groups: Índice 0..G-1 do grupo de cada candidato (None = um grupo)
+            top_k: Candidatos a preservar por grupo (só sem groups)
+            best_known: Custos totais exatos já encontrados (só sem groups)
+        
+        Returns:
+            DataFrame de predict_arrays + 'refined' (rho do modelo completo;
+            NaN nos viáveis descartados pela passada grossa)
+        """
+        n_iter = self.coarse_iterations
+        if not n_iter or n_iter >= getattr(self.predictor, 'regressor_iterations', np.inf):
+            df = self.predictor.predict_arrays(**columns)
+            self.n_evaluations += len(df)
+            self.n_refined += len(df)
+            df['refined'] = True
+            return df
+        
+        df = self.predictor.predict_arrays(num_iteration=n_iter, **columns)
+        self.n_evaluations += len(df)
+        
+        feasible = df['is_feasible'].to_numpy() == 1
+        steel = np.asarray(steel_cost(df['As_predicted'].to_numpy(), pe_direito, costs))
+        lower = concrete + steel * (1 - self.coarse_tolerance)
+        upper = np.where(feasible, concrete + steel * (1 + self.coarse_tolerance), np.inf)
+        
+        # Limite superior do k-ésimo melhor custo (por grupo)
+        if groups is None:
+            pool = upper if best_known is None else np.concatenate([upper, best_known])
+            k = min(top_k, len(pool))
+            bound = np.partition(pool, k - 1)[k - 1]
+        else:
+            bound = np.full(groups.max() + 1, np.inf)
+            np.minimum.at(bound, groups, upper)
+            bound = bound[groups]
+        refine = feasible & (lower <= bound)
+        
+        idx = np.flatnonzero(refine)
+        if len(idx):
+            fine = self.predictor.predict_arrays(
+                **{col: value[idx] if np.ndim(value) else value for col, value in columns.items()}
+            )
+            self.n_refined += len(idx)
+            
+            # Confere a hipótese da poda: |rho fino - rho grosso| <= tol * rho grosso
+            coarse_rho = df['rho_predicted'].to_numpy()[idx]
+            fine_rho = fine['rho_predicted'].to_numpy()
+            outside = np.abs(fine_rho - coarse_rho) > self.coarse_tolerance * np.abs(coarse_rho)
+            if outside.any():
+                self.n_outside_tolerance += int(outside.sum())
+                worst = np.max(np.abs(fine_rho - coarse_rho) / np.maximum(np.abs(coarse_rho), 1e-12))
+                logger.warning(f"Passada grossa fora da tolerância em {outside.sum()}/{len(idx)} "
+                               f"candidatos refinados (erro relativo máx {worst:.0%} > "
+                               f"{self.coarse_tolerance:.0%}): o ótimo pode não ser exato")
+        
+        # Viáveis não refinados: o custo da passada grossa não é exato, fica em branco
+        for col in ('rho_predicted', 'As_predicted'):
+            values = df[col].to_numpy(dtype=np.float64).copy()
+            values[feasible & ~refine] = np.nan
+            if len(idx):
+                values[idx] = fine[col].to_numpy()
+            df[col] = values
+        df['refined'] = refine
+        return df
+
+    def _evaluate_sections(self, fixed_params: dict, loads: dict, larguras: np.ndarray,
+                           alturas: np.ndarray, costs: dict) -> pd.DataFrame:
+        """Avalia seções (largura, Altura) em lote e ordena pelo custo (inviável = inf)."""
+        df_results = self.predictor.predict_arrays(
+            **{**fixed_params, **loads, 'largura': larguras, 'Altura': alturas}
+        )
+        self.n_evaluations += len(df_results)
+        df_results['largura'] = larguras
+        df_results['Altura'] = alturas
+        
+        self._add_costs(df_results, fixed_params, costs)
+        df_results.loc[df_results['is_feasible'] == 0, 'custo_total'] = float('inf')
+        return df_results.sort_values('custo_total').reset_index(drop=True)
+
+    def _add_costs(self, df_results: pd.DataFrame, fixed_params: dict, costs: dict) -> None:
+        """Adiciona custo_concreto, custo_aco e custo_total (fck e PeDireito fixos)."""
+        pe_direito = fixed_params['PeDireito']
+        cost_concreto = concrete_cost(df_results['largura'], df_results['Altura'],
+                                      pe_direito, fixed_params.get('fck'), costs)
+        cost_aco = steel_cost(df_results['As_predicted'], pe_direito, costs)
+        
+        df_results['custo_concreto'] = cost_concreto
+        df_results['custo_aco'] = cost_aco
+        df_results['custo_total'] = cost_concreto + cost_aco
+
+    def _is_feasible(self, base: dict, **geometry) -> bool:
+        """Avalia um único candidato (só o classificador, uma chamada ao modelo)."""
+        probs = self.predictor.predict_feasibility_arrays(**{**base, **geometry})
+        self.n_evaluations += 1
+        return bool(probs[0] >= self.predictor.threshold)
+
+    @staticmethod
+    def _first_feasible(is_feasible_at, lo: int, hi: int, hi_known_feasible: bool = False):
+        """
+        Menor índice em [lo, hi] viável, assumindo viabilidade monotônica
+        (inviável ... inviável, viável ... viável). None se nem hi passa.
+        """
+        if not hi_known_feasible and not is_feasible_at(hi):
+            return None
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if is_feasible_at(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return hi
+
+    def _section_grid(self, fixed_params: dict, loads: dict, search_space: dict,
+                      constraints: dict) -> tuple:
+        """
+        Monta o produto cartesiano dos eixos e aplica as podas.
+        Returns: (dict eixo -> array de candidatos, total antes das podas)
+        """
+        axes = []
+        for axis in SECTION_AXES:
+            if axis in search_space:
+                axes.append(np.asarray(search_space[axis], dtype=np.float64))
+            elif axis in fixed_params:
+                axes.append(np.array([fixed_params[axis]], dtype=np.float64))
+            else:
+                raise KeyError(f"'{axis}' must be given in search_space or fixed_params")
+        
+        mesh = np.meshgrid(*axes, indexing='ij')
+        grid = {axis: values.ravel() for axis, values in zip(SECTION_AXES, mesh)}
+        n_total = len(grid['largura'])
+        
+        N_max = max(abs(loads['N_top']), abs(loads['N_base']))
+        keep = _constraint_mask(grid['largura'], grid['Altura'], grid['fck'], N_max, constraints)
+        
+        logger.info(f"Grid de seções: {n_total} candidatos, {keep.sum()} após as restrições")
+        return {axis: values[keep] for axis, values in grid.items()}, n_total
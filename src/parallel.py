@@ -0,0 +1,162 @@
+"""
+Process-pool parallel execution for large prediction grids.
+Candidate arrays are sharded across worker processes, each holding its own
+warm PillarPredictor (loaded once by the pool initializer), and the results
+are concatenated back in order.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .config import PARALLEL_CHUNK_SIZE, PARALLEL_WORKERS
+from .predictor import PillarPredictor
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Predictor do processo worker (criado uma vez pelo initializer)
+_worker_predictor = None
+
+
+def _init_worker(predictor_kwargs: dict, threads_per_worker: int) -> None:
+    global _worker_predictor
+    # Evita sobreassinatura: cada worker usa só a sua fatia de núcleos no OpenMP do LightGBM
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(limits=threads_per_worker)
+    _worker_predictor = PillarPredictor(**predictor_kwargs)
+
+
+def _predict_shard(columns: dict, num_iteration: int = None) -> pd.DataFrame:
+    return _worker_predictor.predict_arrays(num_iteration=num_iteration, **columns)
+
+
+def _predict_feasibility_shard(columns: dict) -> np.ndarray:
+    return _worker_predictor.predict_feasibility_arrays(**columns)
+
+
+def _predict_single(pillar_data: dict) -> dict:
+    return _worker_predictor.predict_single(pillar_data)
+
+
+def _predictor_info() -> dict:
+    return {
+        'mode': _worker_predictor.mode,
+        'threshold': _worker_predictor.threshold,
+        'model_fingerprint': _worker_predictor.model_fingerprint,
+        'regressor_iterations': _worker_predictor.regressor_iterations,
+    }
+
+
+class ParallelPredictor:
+    """
+    Drop-in replacement for PillarPredictor in large sweeps.
+
+    predict_arrays/predict_batch/predict_feasibility_arrays split the
+    candidates into shards of chunk_size rows and score them on a
+    ProcessPoolExecutor; threshold, model_fingerprint, mode and
+    regressor_iterations are read from a worker. The optimizer and the visualization functions (including the
+    frontier cache) can use it unchanged.
+    """
+
+    def __init__(self, n_workers: int = PARALLEL_WORKERS, chunk_size: int = PARALLEL_CHUNK_SIZE,
+                 **predictor_kwargs):
+        """
+        Args:
+            n_workers: Worker processes (default: os.cpu_count())
+            chunk_size: Candidates per shard
+            predictor_kwargs: Forwarded to PillarPredictor in every worker
+        """
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.n_workers)
+
+        logger.info(f"Starting {self.n_workers} prediction workers "
+                    f"({threads_per_worker} thread(s) each)...")
+        # 'spawn': o LightGBM/OpenMP não é seguro após fork de um processo que já o usou
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(predictor_kwargs, threads_per_worker),
+        )
+        self._info = None
+
+    def warm_up(self) -> None:
+        """Start every worker now, so model loading stays out of the first sweep."""
+        futures = [self._pool.submit(os.getpid) for _ in range(self.n_workers)]
+        for future in futures:
+            future.result()
+
+    @property
+    def threshold(self) -> float:
+        return self._predictor_info()['threshold']
+
+    @property
+    def model_fingerprint(self) -> str:
+        return self._predictor_info()['model_fingerprint']
+
+    @property
+    def mode(self) -> str:
+        return self._predictor_info()['mode']
+
+    @property
+    def regressor_iterations(self) -> int:
+        return self._predictor_info()['regressor_iterations']
+
+    def predict_arrays(self, num_iteration: int = None, **columns) -> pd.DataFrame:
+        """Same contract as PillarPredictor.predict_arrays, scored in parallel shards."""
+        parts = self._map_shards(_predict_shard, columns, num_iteration)
+        return pd.concat(parts, ignore_index=True)
+
+    def predict_feasibility_arrays(self, **columns) -> np.ndarray:
+        """Same contract as PillarPredictor.predict_feasibility_arrays, scored in parallel shards."""
+        return np.concatenate(self._map_shards(_predict_feasibility_shard, columns))
+
+    def predict_batch(self, pillars_data: list) -> pd.DataFrame:
+        """Same contract as PillarPredictor.predict_batch."""
+        df = pd.DataFrame(pillars_data)
+        return self.predict_arrays(**{col: df[col].to_numpy() for col in df.columns})
+
+    def predict_single(self, pillar_data: dict) -> dict:
+        return self._pool.submit(_predict_single, pillar_data).result()
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def _predictor_info(self) -> dict:
+        # Mesmos kwargs em todos os workers: basta perguntar a um deles, uma vez
+        if self._info is None:
+            self._info = self._pool.submit(_predictor_info).result()
+        return self._info
+
+    def _map_shards(self, fn, columns: dict, *args) -> list:
+        """Run fn on shards of chunk_size rows; returns the per-shard results in order."""
+        scalars = {col: value for col, value in columns.items() if np.ndim(value) == 0}
+        arrays = {col: np.asarray(value) for col, value in columns.items() if col not in scalars}
+
+        if not arrays:
+            return [self._pool.submit(fn, columns, *args).result()]
+
+        # Escalares seguem como escalares (menos dados serializados); arrays são achatados
+        shape = np.broadcast_shapes(*[value.shape for value in arrays.values()])
+        arrays = {col: np.broadcast_to(value, shape).ravel() for col, value in arrays.items()}
+        n_rows = int(np.prod(shape))
+
+        futures = [
+            self._pool.submit(fn, {
+                **scalars,
+                **{col: value[start:start + self.chunk_size] for col, value in arrays.items()},
+            }, *args)
+            for start in range(0, n_rows, self.chunk_size)
+        ]
+        return [future.result() for future in futures]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,261 @@
+"""
+Memoized predictions in front of PillarPredictor.
+Rows are keyed on their quantized raw inputs plus a fingerprint of both
+model files; repeated rows are served from an in-memory LRU (and an optional
+SQLite tier on disk) and only cache misses are sent to the models.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .batching import _single_result
+from .config import INPUT_COLUMNS, PREDICTION_CACHE_DECIMALS, PREDICTION_CACHE_SIZE
+from .predictor import PillarPredictor
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Parâmetros por consulta no SELECT ... IN (...) do SQLite
+_SQL_CHUNK = 500
+
+
+class PredictionCache:
+    """
+    Two-tier store of (prob_feasible, rho_predicted) per input key.
+
+    Memory tier: OrderedDict LRU with at most max_entries keys.
+    Disk tier (optional): SQLite table shared between sessions; disk hits are
+    promoted to memory.
+    """
+
+    def __init__(self, max_entries: int = PREDICTION_CACHE_SIZE, disk_path=None):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if disk_path is not None:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(disk_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions (key BLOB PRIMARY KEY, prob REAL, rho REAL)"
+            )
+            self._db.commit()
+
+    def lookup(self, keys: list) -> tuple:
+        """
+        Returns:
+            Tuple (values, found): values (n, 2) with [prob, rho] per key
+            (NaN where missing) and the boolean mask of keys found.
+        """
+        values = np.full((len(keys), 2), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._memory.get(key)
+                if value is not None:
+                    self._memory.move_to_end(key)
+                    values[i] = value
+                    found[i] = True
+
+            n_memory = int(found.sum())
+            if self._db is not None and not found.all():
+                missing = {keys[i]: i for i in np.flatnonzero(~found)}
+                from_disk = self._read_disk(list(missing))
+                for key, value in from_disk.items():
+                    values[missing[key]] = value
+                    found[missing[key]] = True
+                    self._memory[key] = value
+                self._trim()
+                self.disk_hits += len(from_disk)
+
+            self.hits += n_memory
+            self.misses += len(keys) - int(found.sum())
+        return values, found
+
+    def store(self, keys: list, values: np.ndarray) -> None:
+        """Insert [prob, rho] rows for the given keys in both tiers."""
+        with self._lock:
+            # Chaves novas (misses) entram no fim da ordem do LRU
+            self._memory.update(zip(keys, values.tolist()))
+            self._trim()
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+                    [(key, float(prob), float(rho)) for key, (prob, rho) in zip(keys, values)],
+                )
+                self._db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._memory),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self, disk: bool = False) -> None:
+        with self._lock:
+            self._memory.clear()
+            if disk and self._db is not None:
+                self._db.execute("DELETE FROM predictions")
+                self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _trim(self) -> None:
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: list) -> dict:
+        result = {}
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start:start + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, prob, rho FROM predictions WHERE key IN ({placeholders})", chunk
+            )
+            result.update({key: (prob, rho) for key, prob, rho in rows})
+        return result
+
+
+class CachedPredictor:
+    """
+    Drop-in wrapper exposing predict_single/predict_batch/predict_arrays with
+    the same outputs as PillarPredictor, backed by a PredictionCache.
+
+    Inputs are rounded to `decimals` places to build the key; misses are
+    scored on the raw inputs, with duplicate rows inside a call scored once.
+    Truncated scores (num_iteration, the optimizer's coarse pass) are cached
+    too, under a namespace of their own per iteration count.
+    """
+
+    def __init__(self, predictor: PillarPredictor, cache: PredictionCache = None,
+                 decimals: int = PREDICTION_CACHE_DECIMALS):
+        self.predictor = predictor
+        self.cache = cache or PredictionCache()
+        self.decimals = decimals
+
+        # Namespace das chaves: modelos + limiar (que decide is_feasible e zera rho) + precisão das features
+        self._namespace = f"{predictor.model_fingerprint}:{predictor.threshold}:{predictor.feature_dtype}"
+        self._prefixes = {}
+
+    @property
+    def threshold(self) -> float:
+        return self.predictor.threshold
+
+    @property
+    def model_fingerprint(self) -> str:
+        return self.predictor.model_fingerprint
+
+    @property
+    def mode(self) -> str:
+        return self.predictor.mode
+
+    @property
+    def regressor_iterations(self) -> int:
+        return self.predictor.regressor_iterations
+
+    def predict_single(self, pillar_data: dict) -> dict:
+        row = self.predict_batch([pillar_data]).iloc[0]
+        return _single_result(row, pillar_data)
+
+    def predict_batch(self, pillars_data: list) -> pd.DataFrame:
+        df = pd.DataFrame(pillars_data)
+        columns = {col: df[col].values for col in df.columns}
+        return self.predict_arrays(**columns)
+
+    def predict_arrays(self, num_iteration: int = None, **columns) -> pd.DataFrame:
+        if num_iteration is not None and num_iteration >= self.regressor_iterations:
+            num_iteration = None  # o predictor já limita à melhor iteração: é o modelo completo
+
+        missing = set(INPUT_COLUMNS) - set(columns)
+        if missing:
+            raise KeyError(f"Missing input columns: {sorted(missing)}")
+
+        arrays = np.broadcast_arrays(*(np.asarray(columns[col], dtype=np.float64)
+                                       for col in INPUT_COLUMNS))
+        raw = np.column_stack([a.ravel() for a in arrays])
+
+        keys = self._keys(raw, num_iteration)
+        values, found = self.cache.lookup(keys)
+
+        if not found.all():
+            miss_rows = np.flatnonzero(~found)
+            # Linhas repetidas dentro da mesma chamada vão ao modelo uma vez só
+            unique_keys, first, inverse = _unique_keys([keys[i] for i in miss_rows])
+            to_score = raw[miss_rows[first]]
+            df_scored = self.predictor.predict_arrays(
+                num_iteration=num_iteration,
+                **{col: to_score[:, j] for j, col in enumerate(INPUT_COLUMNS)}
+            )
+            scored = df_scored[['prob_feasible', 'rho_predicted']].values
+            self.cache.store(unique_keys, scored)
+            values[miss_rows] = scored[inverse]
+
+        probs, rho = values[:, 0], values[:, 1]
+        Ac = raw[:, INPUT_COLUMNS.index('largura')] * raw[:, INPUT_COLUMNS.index('Altura')]
+
+        As_actual = np.zeros_like(Ac)
+        As_actual[:] = np.ravel(columns.get('As', 0))
+
+        return pd.DataFrame({
+            'is_feasible': (probs >= self.threshold).astype(int),
+            'prob_feasible': probs,
+            'rho_predicted': rho,
+            'As_predicted': rho * Ac,
+            'As_actual': As_actual,
+            'Ac': Ac,
+        })
+
+    def predict_feasibility_arrays(self, **columns) -> np.ndarray:
+        # Sem cache: o caminho só-classificador não produz rho para armazenar
+        return self.predictor.predict_feasibility_arrays(**columns)
+
+    def _prefix(self, num_iteration: int = None) -> float:
+        """Namespace hash as one float64: full model, or (models, num_iteration) for truncated scores."""
+        prefix = self._prefixes.get(num_iteration)
+        if prefix is None:
+            namespace = self._namespace if num_iteration is None else f"{self._namespace}:{num_iteration}"
+            digest = hashlib.sha256(namespace.encode('utf-8')).digest()[:8]
+            prefix = self._prefixes[num_iteration] = np.frombuffer(digest, dtype=np.float64)[0]
+        return prefix
+
+    def _keys(self, raw: np.ndarray, num_iteration: int = None) -> list:
+        """One bytes key per row: namespace + quantized inputs."""
+        quantized = np.empty((len(raw), raw.shape[1] + 1))
+        quantized[:, 0] = self._prefix(num_iteration)
+        np.round(raw, self.decimals, out=quantized[:, 1:])
+        quantized[:, 1:] += 0.0  # normaliza -0.0, que teria bytes diferentes de 0.0
+        # Cada linha vira um único escalar np.void; tolist() devolve os bytes
+        return quantized.view(np.dtype((np.void, quantized.shape[1] * 8))).ravel().tolist()
+
+
+def _unique_keys(keys: list) -> tuple:
+    """Returns (unique keys, index of first occurrence, inverse map)."""
+    position = {}
+    first = []
+    inverse = np.empty(len(keys), dtype=np.intp)
+    for i, key in enumerate(keys):
+        j = position.get(key)
+        if j is None:
+            j = position[key] = len(first)
+            first.append(i)
+        inverse[i] = j
+    return list(position), np.array(first, dtype=np.intp), inverse
@@ -0,0 +1,176 @@
+"""
+Local prediction service.
+Loads both models once and serves predictions over HTTP (stdlib only).
+Concurrent requests are micro-batched into a single predict_batch call.
+
+Uso: python -m src.prediction_server --port 8765
+
+Endpoints:
+    POST /predict  {"pillar": {...}} ou {"pillars": [{...}, ...]}
+    GET  /health
+    GET  /stats
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .batching import BatchingPredictor
+from .config import (
+    BATCH_MAX_SIZE,
+    BATCH_MAX_WAIT_MS,
+    INPUT_COLUMNS,
+    SERVER_HOST,
+    SERVER_LATENCY_WINDOW,
+    SERVER_PORT,
+)
+from .predictor import PillarPredictor
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PredictionServer(ThreadingHTTPServer):
+    """HTTP server holding a warm PillarPredictor and its micro-batcher."""
+
+    daemon_threads = True
+
+    def __init__(self, address, predictor: PillarPredictor,
+                 max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        super().__init__(address, _PredictionHandler)
+        self.predictor = predictor
+        self.batcher = BatchingPredictor(predictor, max_batch_size, max_wait_ms)
+        self.n_requests = 0
+        self._latencies_ms = deque(maxlen=SERVER_LATENCY_WINDOW)
+        self._stats_lock = threading.Lock()
+
+    def record_latency(self, latency_ms: float) -> None:
+        with self._stats_lock:
+            self.n_requests += 1
+            self._latencies_ms.append(latency_ms)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            n_requests = self.n_requests
+            latencies = np.array(self._latencies_ms)
+        stats = {'requests': n_requests, **self.batcher.stats()}
+        if latencies.size:
+            stats['latency_ms_mean'] = float(latencies.mean())
+            stats['latency_ms_p50'] = float(np.percentile(latencies, 50))
+            stats['latency_ms_p99'] = float(np.percentile(latencies, 99))
+        return stats
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+class _PredictionHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == '/stats':
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            rows, single = _parse_payload(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        try:
+            records = self.server.batcher.predict_batch(rows).to_dict(orient='records')
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.server.record_latency(latency_ms)
+        logger.debug(f"{len(rows)} pillar(s) in {latency_ms:.2f} ms")
+
+        body = {'latency_ms': latency_ms}
+        if single:
+            body['result'] = records[0]
+        else:
+            body['results'] = records
+        self._send_json(200, body)
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def _parse_payload(payload: dict) -> tuple:
+    """Return (rows, single) from a {"pillar": ...} or {"pillars": [...]} payload."""
+    if 'pillar' in payload:
+        rows, single = [payload['pillar']], True
+    elif 'pillars' in payload:
+        rows, single = list(payload['pillars']), False
+    else:
+        raise KeyError("Payload must contain 'pillar' or 'pillars'.")
+
+    if not rows:
+        raise ValueError("Empty 'pillars' list.")
+    for row in rows:
+        missing = set(INPUT_COLUMNS) - set(row)
+        if missing:
+            raise KeyError(f"Missing input columns: {sorted(missing)}")
+    return rows, single
+
+
+def request_prediction(payload: dict, host: str = SERVER_HOST, port: int = SERVER_PORT) -> dict:
+    """Small client helper: POST a payload to a running server and return the JSON reply."""
+    request = urllib.request.Request(
+        f"http://{host}:{port}/predict",
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def serve(host: str = SERVER_HOST, port: int = SERVER_PORT, **predictor_kwargs) -> None:
+    """Load the models once and serve until interrupted."""
+    predictor = PillarPredictor(**predictor_kwargs)
+    server = PredictionServer((host, port), predictor)
+    logger.info(f"Prediction server listening on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down prediction server.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local pillar prediction server.")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--engine', default=None, help="'lightgbm' ou 'compiled'")
+    parser.add_argument('--mode', default=None, help="'exact' ou 'fast' (regressor destilado)")
+    args = parser.parse_args()
+    serve(args.host, args.port, engine=args.engine, mode=args.mode)
@@ -2,13 +2,26 @@
 Predictor module for Two-Stage Inference (Classifier + Regressor).
 """
 
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
-from .config import FEATURE_COLUMNS, MODEL_PATH_CLASSIFIER, MODEL_PATH_REGRESSOR
-from .feature_engineering import create_engineered_features
+from .config import (
+    CLASSIFIER_THRESHOLD,
+    FEATURE_COLUMNS,
+    GATED_REGRESSION,
+    FEATURE_DTYPE,
+    INFERENCE_ENGINE,
+    INFERENCE_MODE,
+    MODEL_PATH_CLASSIFIER,
+    MODEL_PATH_REGRESSOR,
+    MODEL_PATH_STUDENT,
+)
+from .feature_engineering import build_feature_matrix, create_engineered_features
 from .model_trainer import load_model
-from .utils import setup_logger
+from .tree_engine import load_or_compile
+from .utils import file_fingerprint, setup_logger
 
 logger = setup_logger(__name__)
 
@@ -20,20 +33,71 @@ class PillarPredictor:
     2. Steel Area Calculation (Regressor)
     """
     
-    def __init__(self, classifier_path=None, regressor_path=None):
+    def __init__(self, classifier_path=None, regressor_path=None, threshold=None,
+                 gated=None, engine=None, feature_dtype=None, mode=None):
         """
         Initialize predictor by loading both models.
+        
+        Args:
+            regressor_path: Regressor pickle (default: MODEL_PATH_REGRESSOR, or
+                            MODEL_PATH_STUDENT in 'fast' mode)
+            threshold: Cutoff on P(feasible) (default: CLASSIFIER_THRESHOLD)
+            gated: Run the regressor only on feasible rows (default: GATED_REGRESSION)
+            engine: 'lightgbm' or 'compiled' (default: INFERENCE_ENGINE)
+            feature_dtype: 'float64' or 'float32' feature matrix (default: FEATURE_DTYPE)
+            mode: 'exact' (full regressor) or 'fast' (distilled student from
+                  run_distillation.py) (default: INFERENCE_MODE)
         """
         logger.info("Initializing PillarPredictor...")
         
+        self.mode = mode or INFERENCE_MODE
+        if self.mode not in ('exact', 'fast'):
+            raise ValueError(f"Unknown inference mode: {self.mode}")
+        
         path_clf = classifier_path or MODEL_PATH_CLASSIFIER
-        path_reg = regressor_path or MODEL_PATH_REGRESSOR
+        path_reg = regressor_path or (MODEL_PATH_STUDENT if self.mode == 'fast' else MODEL_PATH_REGRESSOR)
+        if not Path(path_reg).exists() and self.mode == 'fast':
+            raise FileNotFoundError(f"No student regressor at {path_reg}; run run_distillation.py first.")
         
         self.classifier = load_model(path_clf)
         self.regressor = load_model(path_reg)
+        self.classifier_path = Path(path_clf)
+        self.regressor_path = Path(path_reg)
+        self.threshold = CLASSIFIER_THRESHOLD if threshold is None else threshold
+        self.gated = GATED_REGRESSION if gated is None else gated
+        self.engine = engine or INFERENCE_ENGINE
+        self.feature_dtype = np.dtype(feature_dtype or FEATURE_DTYPE)
+        
+        # Scoring backends: anything exposing predict(X) on the feature matrix
+        if self.engine == 'compiled':
+            self._classifier_engine = load_or_compile(self.classifier, path_clf)
+            self._regressor_engine = load_or_compile(self.regressor, path_reg)
+        elif self.engine == 'lightgbm':
+            self._classifier_engine = self.classifier.booster_
+            self._regressor_engine = self.regressor.booster_
+        else:
+            raise ValueError(f"Unknown inference engine: {self.engine}")
         
         logger.info("Both models loaded successfully.")
     
+    @property
+    def regressor_iterations(self) -> int:
+        """Boosting iterations the regressor uses in full scoring (its best iteration)."""
+        engine = self._regressor_engine
+        if hasattr(engine, 'n_trees'):
+            return engine.n_trees
+        return engine.best_iteration or engine.current_iteration()
+    
+    @property
+    def regressor_engine(self):
+        """Backend scoring rho from the feature matrix (LightGBM booster or compiled ensemble)."""
+        return self._regressor_engine
+    
+    @property
+    def model_fingerprint(self) -> str:
+        """Hash of both model files; changes whenever either model is retrained."""
+        return file_fingerprint(self.classifier_path)[:16] + file_fingerprint(self.regressor_path)[:16]
+    
     def predict_single(self, pillar_data: dict) -> dict:
         """
         Predict for a single pillar.
@@ -47,8 +111,9 @@ class PillarPredictor:
             Ac = df_eng['Ac'].values[0]
             
             # --- STAGE 1: CLASSIFIER ---
-            is_feasible = self.classifier.predict(X)[0]
-            prob_feasible = self.classifier.predict_proba(X)[0][1]
+            feasibility, probs = self._classify(X)
+            is_feasible = feasibility[0]
+            prob_feasible = probs[0]
             
             result = {
                 'status': 'Feasible' if is_feasible == 1 else 'Infeasible',
@@ -64,7 +129,7 @@ class PillarPredictor:
                 result['message'] = "Pillar geometry/loads failed feasibility check."
             else:
                 # --- STAGE 2: REGRESSOR ---
-                rho_pred = self.regressor.predict(X)[0]
+                rho_pred = self._regressor_engine.predict(X)[0]
                 As_pred = rho_pred * Ac
                 
                 result['rho_predicted'] = rho_pred
@@ -92,17 +157,11 @@ class PillarPredictor:
             Ac = df_eng['Ac'].values
             
             # 1. Classify all
-            feasibility = self.classifier.predict(X)
-            probs = self.classifier.predict_proba(X)[:, 1]
-            
-            # 2. Regress all (we can filter later, but predicting all is vector-efficient)
-            rho_preds = self.regressor.predict(X)
-            As_preds = rho_preds * Ac
+            feasibility, probs = self._classify(X)
             
-            # 3. Mask unfeasible results
-            # If not feasible, set As to 0 (or NaN)
-            final_As = np.where(feasibility == 1, As_preds, 0)
-            final_rho = np.where(feasibility == 1, rho_preds, 0)
+            # 2. Regress (feasible rows only when gated; infeasible rows get 0)
+            final_rho = self._regress(X, feasibility)
+            final_As = final_rho * Ac
             
             results_df = pd.DataFrame({
                 'is_feasible': feasibility,
@@ -119,6 +178,103 @@ class PillarPredictor:
             logger.error(f"Error in batch prediction: {e}", exc_info=True)
             raise
     
+    def predict_arrays(self, num_iteration: int = None, **columns) -> pd.DataFrame:
+        """
+        Columnar fast path for large sweeps.
+        
+        Takes one array (or scalar) per raw input, e.g.
+        predict_arrays(fck=50, PeDireito=235, largura=widths, Altura=95, ...),
+        builds the feature matrix directly with NumPy and scores it with the
+        underlying boosters, skipping the dict/DataFrame round trip.
+        Returns the same columns as predict_batch.
+        
+        num_iteration scores rho with only the first N regressor iterations
+        (a cheap, approximate pass; see PillarOptimizer coarse-to-fine).
+        The classifier is always scored in full, so is_feasible is exact.
+        """
+        try:
+            X, Ac = build_feature_matrix(columns, dtype=self.feature_dtype)
+            
+            # 1. Classify all
+            feasibility, probs = self._classify(X)
+            
+            # 2. Regress (feasible rows only when gated; infeasible rows get 0)
+            final_rho = self._regress(X, feasibility, num_iteration)
+            final_As = final_rho * Ac
+            
+            As_actual = np.zeros_like(Ac)
+            As_actual[:] = np.ravel(columns.get('As', 0))
+            
+            return pd.DataFrame({
+                'is_feasible': feasibility,
+                'prob_feasible': probs,
+                'rho_predicted': final_rho,
+                'As_predicted': final_As,
+                'As_actual': As_actual,
+                'Ac': Ac
+            })
+            
+        except Exception as e:
+            logger.error(f"Error in array prediction: {e}", exc_info=True)
+            raise
+    
+    def predict_feasibility_arrays(self, **columns) -> np.ndarray:
+        """
+        Classifier-only columnar path: returns P(feasible) per row.
+        
+        Used by dense sweeps (e.g. decision-boundary plots) that only need the
+        probability surface, so the regressor is never evaluated.
+        """
+        X, _ = build_feature_matrix(columns, dtype=self.feature_dtype)
+        _, probs = self._classify(X)
+        return probs
+    
+    def classify_features(self, X) -> tuple:
+        """
+        Classifier on an already built feature matrix (build_feature_matrix).
+        
+        Returns:
+            Tuple (feasibility, probs) as in the other predict_* paths
+        """
+        return self._classify(X)
+    
+    def regress_features(self, X, num_iteration: int = None) -> np.ndarray:
+        """Regressor rho for every row of an already built feature matrix (no gating)."""
+        return self._regressor_engine.predict(X, num_iteration=num_iteration)
+    
+    def _classify(self, X) -> tuple:
+        """
+        Score the classifier once and derive labels from the probability.
+        
+        Returns:
+            Tuple (feasibility, probs): 1/0 labels (prob >= threshold) and P(feasible)
+        """
+        # Binary booster returns P(feasible) directly, no second pass over the trees
+        probs = self._classifier_engine.predict(X)
+        feasibility = (probs >= self.threshold).astype(int)
+        return feasibility, probs
+    
+    def _regress(self, X, feasibility: np.ndarray, num_iteration: int = None) -> np.ndarray:
+        """
+        Predict rho for feasible rows and 0 for the rest.
+        
+        Gated mode compacts the feasible subset, runs the regressor only on it
+        and scatters the results back; otherwise every row is regressed and
+        the infeasible ones are masked afterwards.
+        """
+        if num_iteration is not None:
+            # Nunca além da melhor iteração (o que o modelo completo usa)
+            num_iteration = min(num_iteration, self.regressor_iterations)
+        
+        mask = feasibility == 1
+        if not self.gated:
+            return np.where(mask, self._regressor_engine.predict(X, num_iteration=num_iteration), 0.0)
+        
+        rho = np.zeros(len(mask), dtype=np.float64)
+        if mask.any():
+            rho[mask] = self._regressor_engine.predict(X[mask], num_iteration=num_iteration)
+        return rho
+    
     def _process_pillar_data(self, df: pd.DataFrame) -> pd.DataFrame:
         df_processed = df.copy()
         df_processed = create_engineered_features(df_processed)
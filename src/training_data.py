@@ -0,0 +1,182 @@
+"""
+Training artifacts reused across runs.
+Materializes the float32 feature matrix once as a memory-mapped file and
+saves the constructed lgb.Dataset binaries (train/valid of both stages), so
+later runs and hyperparameter sweeps skip CSV parsing, feature engineering
+and histogram binning.
+
+Layout of TRAINING_CACHE_DIR:
+    features.npy                      X (n_rows x n_features), float32, opened with mmap
+    labels.npz                        is_feasible, rho, Ac, As
+    {classifier,regressor}_split.npz  train/valid row positions
+    {classifier,regressor}_{train,valid}.bin   lgb.Dataset binaries
+    meta.json                         source CSV + version key (written last)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from .config import DATA_PATH, FEATURE_COLUMNS, RANDOM_STATE, TEST_SIZE, TRAINING_CACHE_DIR
+from .data_loader import load_dataset
+from .feature_engineering import create_target_variable, prepare_features
+from .model_trainer import split_data
+from .utils import file_fingerprint, setup_logger, timed
+
+logger = setup_logger(__name__)
+
+STAGES = ('classifier', 'regressor')
+
+# Parâmetros de construção do Dataset (binning). feature_pre_filter=False permite
+# variar min_data_in_leaf numa varredura sem reconstruir os binários.
+DATASET_PARAMS = {'max_bin': 255, 'feature_pre_filter': False, 'verbose': -1}
+
+
+def load_training_data(path=None, cache_dir=None, timings: dict = None) -> dict:
+    """
+    Return the training artifacts, rebuilding them when missing or stale.
+
+    Args:
+        path: Source CSV (default: DATA_PATH)
+        cache_dir: Artifact directory (default: TRAINING_CACHE_DIR)
+        timings: Optional dict accumulating seconds per phase
+
+    Returns:
+        dict with
+            'X':        memory-mapped float32 feature matrix
+            'labels':   dict of 1-D arrays (is_feasible, rho, Ac, As)
+            'classifier' / 'regressor': dict with 'train'/'valid' lgb.Dataset
+                        and 'train_idx'/'val_idx' row positions in X
+            'rebuilt':  True when the artifacts were (re)built in this call
+    """
+    path = Path(path or DATA_PATH)
+    cache_dir = Path(cache_dir or TRAINING_CACHE_DIR)
+    timings = {} if timings is None else timings
+
+    rebuilt = not _is_valid(cache_dir, path)
+    if rebuilt:
+        logger.info(f"Building training artifacts in {cache_dir}")
+        _build(path, cache_dir, timings)
+    else:
+        logger.info(f"Reusing training artifacts from {cache_dir}")
+
+    with timed('load_artifacts', timings):
+        data = _load(cache_dir)
+    data['rebuilt'] = rebuilt
+    return data
+
+
+def clear_training_data(cache_dir=None) -> None:
+    shutil.rmtree(Path(cache_dir or TRAINING_CACHE_DIR), ignore_errors=True)
+
+
+def _version_key() -> str:
+    """Everything besides the CSV that changes the artifacts."""
+    here = Path(__file__)
+    payload = {
+        'code': [file_fingerprint(here.with_name(name)) for name in
+                 ('data_loader.py', 'feature_engineering.py', 'training_data.py')],
+        'features': FEATURE_COLUMNS,
+        'split': [TEST_SIZE, RANDOM_STATE],
+        'dataset_params': DATASET_PARAMS,
+        'lightgbm': lgb.__version__,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _is_valid(cache_dir: Path, path: Path) -> bool:
+    try:
+        meta = json.loads((cache_dir / 'meta.json').read_text())
+    except (FileNotFoundError, ValueError):
+        return False
+
+    stat = path.stat()
+    if meta.get('version') != _version_key() or meta.get('size') != stat.st_size:
+        return False
+    # Mesmo critério do cache do dataset: mtime igual, ou conteúdo igual
+    return meta.get('mtime_ns') == stat.st_mtime_ns or meta.get('sha256') == file_fingerprint(path)
+
+
+def _build(path: Path, cache_dir: Path, timings: dict) -> None:
+    with timed('load_data', timings):
+        df = load_dataset(path, engineer=True)
+        df = create_target_variable(df)
+
+    with timed('features', timings):
+        X_df, _ = prepare_features(df, FEATURE_COLUMNS)
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / 'meta.json').unlink(missing_ok=True)
+
+        X = np.lib.format.open_memmap(cache_dir / 'features.npy', mode='w+', dtype=np.float32,
+                                      shape=X_df.shape)
+        X[:] = X_df.to_numpy(dtype=np.float32)
+        X.flush()
+
+        labels = {
+            'is_feasible': df['is_feasible'].to_numpy(dtype=np.int8),
+            'rho': df['rho'].to_numpy(dtype=np.float64),
+            'Ac': df['Ac'].to_numpy(dtype=np.float64),
+            'As': df['As'].to_numpy(dtype=np.float64),
+        }
+        np.savez(cache_dir / 'labels.npz', **labels)
+
+    with timed('binning', timings):
+        positions = np.arange(len(X))
+        feasible = np.flatnonzero(labels['is_feasible'] == 1)
+        stage_rows = {
+            # Mesmos splits do caminho sklearn (split_data com o mesmo random_state)
+            'classifier': (positions, labels['is_feasible']),
+            'regressor': (feasible, labels['rho'][feasible]),
+        }
+        for stage, (rows, y) in stage_rows.items():
+            train_idx, val_idx, _, _ = split_data(pd.Series(rows), pd.Series(y))
+            train_idx, val_idx = train_idx.to_numpy(), val_idx.to_numpy()
+            np.savez(cache_dir / f"{stage}_split.npz", train_idx=train_idx, val_idx=val_idx)
+
+            label = labels['is_feasible'] if stage == 'classifier' else labels['rho']
+            train = lgb.Dataset(X[train_idx], label=label[train_idx], feature_name=FEATURE_COLUMNS,
+                                params=DATASET_PARAMS, free_raw_data=True)
+            valid = lgb.Dataset(X[val_idx], label=label[val_idx], params=DATASET_PARAMS,
+                                reference=train)
+            for part, dataset in (('train', train), ('valid', valid)):
+                target = cache_dir / f"{stage}_{part}.bin"
+                target.unlink(missing_ok=True)  # save_binary não sobrescreve
+                dataset.save_binary(str(target))
+
+    stat = path.stat()
+    tmp = cache_dir / 'meta.json.tmp'
+    tmp.write_text(json.dumps({
+        'source': str(path.resolve()),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': file_fingerprint(path),
+        'version': _version_key(),
+        'shape': list(X.shape),
+    }, indent=2))
+    os.replace(tmp, cache_dir / 'meta.json')
+
+
+def _load(cache_dir: Path) -> dict:
+    data = {
+        'X': np.load(cache_dir / 'features.npy', mmap_mode='r'),
+        'labels': dict(np.load(cache_dir / 'labels.npz')),
+    }
+    for stage in STAGES:
+        split = np.load(cache_dir / f"{stage}_split.npz")
+        train = lgb.Dataset(str(cache_dir / f"{stage}_train.bin"), params=DATASET_PARAMS)
+        valid = lgb.Dataset(str(cache_dir / f"{stage}_valid.bin"), params=DATASET_PARAMS,
+                            reference=train)
+        data[stage] = {
+            'train': train,
+            'valid': valid,
+            'train_idx': split['train_idx'],
+            'val_idx': split['val_idx'],
+        }
+    return data
@@ -0,0 +1,246 @@
+"""
+Native tree-evaluation engine for the LightGBM models.
+Flattens a booster (from booster_.dump_model()) into contiguous NumPy arrays
+and scores batches without going through the sklearn wrapper.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# LightGBM missing value handling (tree.h: MissingType)
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+_MISSING_CODES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+_ZERO_THRESHOLD = 1e-35
+
+# Limite de células (linhas x árvores) avaliadas por bloco, para limitar memória
+_CHUNK_CELLS = 1 << 22
+
+_IDENTITY_OBJECTIVES = ('regression', 'huber', 'fair', 'quantile', 'mape')
+_EXP_OBJECTIVES = ('poisson', 'gamma', 'tweedie')
+
+
+class CompiledEnsemble:
+    """
+    LightGBM ensemble flattened into node arrays.
+
+    Every tree is stored in the same global node table. Leaves point to
+    themselves, so each row walks all trees in lockstep for max_depth steps
+    and ends on its leaf without any per-node branching in Python.
+    """
+
+    def __init__(self, split_feature, threshold, children, default_left,
+                 missing_type, value, roots, max_depth, objective,
+                 n_features, average_output=False):
+        self.split_feature = split_feature
+        self.threshold = threshold
+        self.children = children
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.objective = str(objective)
+        self.n_features = int(n_features)
+        self.average_output = bool(average_output)
+        self._has_zero_missing = bool((missing_type == MISSING_ZERO).any())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def sigmoid(self) -> float:
+        """Sigmoid scale of a binary objective ('binary sigmoid:1')."""
+        for token in self.objective.split()[1:]:
+            if token.startswith('sigmoid:'):
+                return float(token.split(':')[1])
+        return 1.0
+
+    @classmethod
+    def from_model(cls, model) -> "CompiledEnsemble":
+        """
+        Compile a fitted LightGBM model (sklearn wrapper or Booster).
+        Uses the booster's best iteration, same as model.predict.
+        """
+        booster = getattr(model, 'booster_', model)
+        dump = booster.dump_model()
+
+        if dump.get('num_tree_per_iteration', 1) != 1:
+            raise NotImplementedError("Multiclass models are not supported.")
+
+        tables = {
+            'feature': [], 'threshold': [], 'left': [], 'right': [],
+            'default_left': [], 'missing': [], 'value': [],
+        }
+        roots = []
+        max_depth = 0
+        for tree in dump['tree_info']:
+            root, depth = _append_node(tree['tree_structure'], tables, 0)
+            roots.append(root)
+            max_depth = max(max_depth, depth)
+
+        return cls(
+            split_feature=np.asarray(tables['feature'], dtype=np.intp),
+            threshold=np.asarray(tables['threshold'], dtype=np.float64),
+            children=np.column_stack([
+                np.asarray(tables['left'], dtype=np.intp),
+                np.asarray(tables['right'], dtype=np.intp),
+            ]),
+            default_left=np.asarray(tables['default_left'], dtype=bool),
+            missing_type=np.asarray(tables['missing'], dtype=np.int8),
+            value=np.asarray(tables['value'], dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            objective=dump.get('objective', 'regression'),
+            n_features=dump['max_feature_idx'] + 1,
+            average_output=dump.get('average_output', False),
+        )
+
+    def predict_raw(self, X, num_iteration=None) -> np.ndarray:
+        """Sum of leaf values (raw score) for every row of X."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected X with {self.n_features} columns, got shape {X.shape}"
+            )
+
+        roots = self.roots if num_iteration is None else self.roots[:num_iteration]
+        n_rows, n_trees = X.shape[0], len(roots)
+        raw = np.zeros(n_rows, dtype=np.float64)
+        if n_trees == 0:
+            return raw
+
+        chunk = max(1, _CHUNK_CELLS // n_trees)
+        for start in range(0, n_rows, chunk):
+            X_chunk = X[start:start + chunk]
+            rows = np.arange(len(X_chunk))[:, None]
+            node = np.tile(roots, (len(X_chunk), 1))
+            handle_missing = self._has_zero_missing or np.isnan(X_chunk).any()
+
+            for _ in range(self.max_depth):
+                x = X_chunk[rows, self.split_feature[node]]
+                if handle_missing:
+                    go_right = self._decide_with_missing(x, node)
+                else:
+                    go_right = x > self.threshold[node]
+                node = self.children[node, go_right.view(np.int8)]
+
+            raw[start:start + chunk] = self.value[node].sum(axis=1)
+
+        if self.average_output:
+            raw /= n_trees
+        return raw
+
+    def predict(self, X, num_iteration=None) -> np.ndarray:
+        """Transformed output, same as Booster.predict (P(class 1) for binary)."""
+        return self.transform(self.predict_raw(X, num_iteration=num_iteration))
+
+    def transform(self, raw):
+        """Map raw scores to the objective's output scale (sigmoid, exp or identity)."""
+        name = self.objective.split()[0]
+
+        if name == 'binary':
+            return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+        if name.startswith(_IDENTITY_OBJECTIVES):
+            return raw
+        if name.startswith(_EXP_OBJECTIVES):
+            return np.exp(raw)
+        raise NotImplementedError(f"Objective not supported: {self.objective}")
+
+    def _decide_with_missing(self, x: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """LightGBM NumericalDecision, including Zero/NaN default directions."""
+        missing = self.missing_type[node]
+        is_nan = np.isnan(x)
+        x = np.where(is_nan & (missing != MISSING_NAN), 0.0, x)
+
+        use_default = (
+            ((missing == MISSING_ZERO) & (np.abs(x) <= _ZERO_THRESHOLD))
+            | ((missing == MISSING_NAN) & is_nan)
+        )
+        return np.where(use_default, ~self.default_left[node], x > self.threshold[node])
+
+    def save(self, file_path) -> None:
+        """Save the flattened arrays to a .npz file."""
+        logger.info(f"Saving compiled ensemble to: {file_path}")
+        np.savez(
+            file_path,
+            split_feature=self.split_feature,
+            threshold=self.threshold,
+            children=self.children,
+            default_left=self.default_left,
+            missing_type=self.missing_type,
+            value=self.value,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            objective=self.objective,
+            n_features=self.n_features,
+            average_output=self.average_output,
+        )
+
+    @classmethod
+    def load(cls, file_path) -> "CompiledEnsemble":
+        """Load an ensemble saved with save()."""
+        logger.info(f"Loading compiled ensemble from: {file_path}")
+        with np.load(file_path) as data:
+            arrays = {key: data[key] for key in data.files}
+        for key in ('max_depth', 'objective', 'n_features', 'average_output'):
+            arrays[key] = arrays[key].item()
+        return cls(**arrays)
+
+
+def _append_node(node: dict, tables: dict, depth: int) -> tuple:
+    """Append a dumped tree node (recursively) to the tables. Returns (index, depth)."""
+    index = len(tables['feature'])
+    for column in tables.values():
+        column.append(0)
+
+    if 'leaf_value' in node:
+        # Folha: aponta para si mesma
+        tables['left'][index] = index
+        tables['right'][index] = index
+        tables['value'][index] = node['leaf_value']
+        return index, depth
+
+    if node['decision_type'] != '<=':
+        raise NotImplementedError("Categorical splits are not supported.")
+
+    tables['feature'][index] = node['split_feature']
+    tables['threshold'][index] = node['threshold']
+    tables['default_left'][index] = node['default_left']
+    tables['missing'][index] = _MISSING_CODES[node['missing_type']]
+
+    left, depth_left = _append_node(node['left_child'], tables, depth + 1)
+    right, depth_right = _append_node(node['right_child'], tables, depth + 1)
+    tables['left'][index] = left
+    tables['right'][index] = right
+    return index, max(depth_left, depth_right)
+
+
+def compiled_path_for(model_path) -> Path:
+    """Default location of the compiled arrays for a pickled model."""
+    return Path(model_path).with_suffix('.npz')
+
+
+def export_compiled_model(model, model_path) -> Path:
+    """Compile a model and save it next to its pickle."""
+    target = compiled_path_for(model_path)
+    CompiledEnsemble.from_model(model).save(target)
+    return target
+
+
+def load_or_compile(model, model_path) -> CompiledEnsemble:
+    """
+    Load the exported arrays for model_path, or compile the loaded model
+    in memory when the export is missing or older than the pickle.
+    """
+    target = compiled_path_for(model_path)
+    if target.exists() and target.stat().st_mtime >= Path(model_path).stat().st_mtime:
+        return CompiledEnsemble.load(target)
+
+    logger.warning(f"No up-to-date compiled model at {target}; compiling in memory.")
+    return CompiledEnsemble.from_model(model)
@@ -0,0 +1,265 @@
+"""
+Hyperparameter search for both stages by successive halving.
+Candidates sampled from TUNING_SEARCH_SPACE are trained on the shared
+pre-binned lgb.Dataset binaries (src/training_data.py) in worker processes.
+Every rung keeps the best 1/eta of the configs and gives the survivors eta
+times more boosting rounds, so poor configs are dropped after a few cheap
+rounds. Each trial also records its inference cost (trees x leaves and
+measured latency) next to its validation metric.
+"""
+
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from .config import (
+    CLASSIFIER_PARAMS,
+    EARLY_STOPPING_ROUNDS,
+    RANDOM_STATE,
+    REGRESSOR_PARAMS,
+    TUNING_CANDIDATES,
+    TUNING_DIR,
+    TUNING_ETA,
+    TUNING_MAX_ROUNDS,
+    TUNING_MIN_ROUNDS,
+    TUNING_SEARCH_SPACE,
+)
+from .training_data import load_training_data
+from .utils import setup_logger
+
+logger = setup_logger(__name__)
+
+STAGE_PARAMS = {'classifier': CLASSIFIER_PARAMS, 'regressor': REGRESSOR_PARAMS}
+
+# Métricas do LightGBM em que maior é melhor
+_HIGHER_IS_BETTER = ('auc', 'average_precision', 'ndcg', 'map')
+
+# Artefatos de treino do processo worker (carregados uma vez pelo initializer)
+_worker_data = None
+
+
+def _init_worker(cache_dir) -> None:
+    global _worker_data
+    _worker_data = load_training_data(cache_dir=cache_dir)
+
+
+def _train_trial(stage: str, params: dict, num_boost_round: int) -> dict:
+    """Train one config for num_boost_round rounds (with early stopping) on the worker's Datasets."""
+    data = _worker_data[stage]
+    metric = params['metric']
+
+    start = time.perf_counter()
+    booster = lgb.train(
+        params,
+        data['train'],
+        num_boost_round=num_boost_round,
+        valid_sets=[data['valid']],
+        callbacks=[lgb.early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+    return {
+        metric: booster.best_score['valid_0'][metric],
+        'best_iteration': booster.best_iteration,
+        'train_seconds': time.perf_counter() - start,
+        'model': booster.model_to_string(num_iteration=booster.best_iteration),
+    }
+
+
+def sample_candidates(base_params: dict, n_candidates: int, search_space: dict = None,
+                      seed: int = RANDOM_STATE) -> list:
+    """
+    The current params (baseline) plus n_candidates - 1 distinct configs from the grid.
+
+    Returns:
+        list of (overrides, params) with params = base_params + overrides
+    """
+    search_space = search_space or TUNING_SEARCH_SPACE
+    base = {key: value for key, value in base_params.items() if key != 'n_estimators'}
+
+    names = list(search_space)
+    grid = list(itertools.product(*(search_space[name] for name in names)))
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(grid), size=min(n_candidates - 1, len(grid)), replace=False)
+
+    # Baseline: mostra na tabela os valores atuais dos parâmetros buscados
+    candidates = [({name: base[name] for name in names if name in base}, base)]
+    for i in picks:
+        overrides = dict(zip(names, grid[i]))
+        candidates.append((overrides, {**base, **overrides}))
+    return candidates
+
+
+def successive_halving(stage: str, n_candidates: int = TUNING_CANDIDATES, eta: int = TUNING_ETA,
+                       min_rounds: int = TUNING_MIN_ROUNDS, max_rounds: int = TUNING_MAX_ROUNDS,
+                       n_workers: int = None, search_space: dict = None,
+                       cache_dir=None) -> tuple:
+    """
+    Tune one stage ('classifier' or 'regressor').
+
+    Args:
+        n_candidates: Configs in the first rung (the baseline is one of them)
+        eta: Fraction kept per rung (1/eta) and growth of the rounds per rung
+        min_rounds, max_rounds: Boosting rounds of the first and last rungs
+        n_workers: Training processes (default: os.cpu_count()); 1 trains in-process
+        search_space: Values per parameter (default: TUNING_SEARCH_SPACE)
+        cache_dir: Training artifacts directory (default: TRAINING_CACHE_DIR)
+
+    Returns:
+        Tuple (best_params, trials): params of the winner (n_estimators = its
+        early-stopped best iteration at the last rung) and a DataFrame with one
+        row per config at the last rung it reached, including inference cost,
+        latency and a Pareto flag computed among configs of the same rung.
+    """
+    data = load_training_data(cache_dir=cache_dir)  # constrói os binários antes de abrir os workers
+    base_params = STAGE_PARAMS[stage]
+    metric = base_params['metric']
+    higher_is_better = metric.startswith(_HIGHER_IS_BETTER)
+
+    n_workers = n_workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // n_workers)
+    candidates = sample_candidates(base_params, n_candidates, search_space)
+    for _, params in candidates:
+        # Cada treino usa só a sua fatia de núcleos; seed fixa para resultados reprodutíveis
+        params.update({'num_threads': threads, 'seed': RANDOM_STATE, 'verbose': -1})
+
+    logger.info(f"Successive halving ({stage}): {len(candidates)} configs, eta={eta}, "
+                f"{min_rounds}-{max_rounds} rounds, {n_workers} worker(s)")
+
+    if n_workers == 1:
+        _init_worker(cache_dir)
+        pool = None
+        run = lambda jobs: [_train_trial(*job) for job in jobs]  # noqa: E731
+    else:
+        # 'spawn': o LightGBM/OpenMP não é seguro após fork (ver src/parallel.py)
+        pool = ProcessPoolExecutor(max_workers=n_workers,
+                                   mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(cache_dir,))
+        run = lambda jobs: list(pool.map(_train_trial, *zip(*jobs)))  # noqa: E731
+
+    results = {}
+    alive = list(range(len(candidates)))
+    rung, rounds = 0, min_rounds
+    try:
+        while True:
+            jobs = [(stage, candidates[i][1], rounds) for i in alive]
+            for i, result in zip(alive, run(jobs)):
+                results[i] = {'rung': rung, 'rounds': rounds, **result}
+
+            scores = np.array([results[i][metric] for i in alive])
+            order = np.argsort(-scores if higher_is_better else scores, kind='stable')
+            logger.info(f"  rung {rung}: {len(alive)} configs x {rounds} rounds, "
+                        f"best {metric}={scores[order[0]]:.5f}")
+
+            if len(alive) == 1 or rounds >= max_rounds:
+                alive = [alive[order[0]]]
+                break
+            alive = [alive[j] for j in order[:max(1, len(alive) // eta)]]
+            rung, rounds = rung + 1, min(rounds * eta, max_rounds)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    winner = alive[0]
+    trials = _trials_table(stage, candidates, results, winner, data, metric, higher_is_better)
+
+    best_params = {key: value for key, value in candidates[winner][1].items()
+                   if key not in ('num_threads', 'seed')}
+    best_params['n_estimators'] = results[winner]['best_iteration'] or results[winner]['rounds']
+    return best_params, trials
+
+
+def _trials_table(stage, candidates, results, winner, data, metric, higher_is_better) -> pd.DataFrame:
+    """One row per config: overrides, last rung, metric, model size and latency."""
+    X_val = np.asarray(data['X'][data[stage]['val_idx']], dtype=np.float64)
+    rows = []
+    for i, result in results.items():
+        booster = lgb.Booster(model_str=result['model'])
+        dump = booster.dump_model()
+        n_leaves = sum(tree['num_leaves'] for tree in dump['tree_info'])
+
+        # Latência de inferência em lote (melhor de 3), por linha
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            booster.predict(X_val)
+            times.append(time.perf_counter() - start)
+
+        rows.append({
+            'trial': i,
+            'baseline': i == 0,
+            **candidates[i][0],
+            'rung': result['rung'],
+            'rounds': result['rounds'],
+            'best_iteration': result['best_iteration'],
+            metric: result[metric],
+            'n_trees': booster.num_trees(),
+            'total_leaves': n_leaves,
+            'latency_us_per_row': min(times) / len(X_val) * 1e6,
+            'train_seconds': result['train_seconds'],
+            'selected': i == winner,
+        })
+
+    trials = pd.DataFrame(rows)
+    # Fronteira de Pareto entre qualidade e latência (nenhum trial é melhor nas duas),
+    # só entre trials da mesma rung: modelos de rungs diferentes tiveram orçamentos
+    # diferentes e os eliminados cedo seriam sempre "rápidos"
+    trials['pareto'] = False
+    for _, group in trials.groupby('rung'):
+        quality = group[metric] if higher_is_better else -group[metric]
+        latency = group['latency_us_per_row']
+        trials.loc[group.index, 'pareto'] = [
+            not (((quality > q) & (latency <= l)) | ((quality >= q) & (latency < l))).any()
+            for q, l in zip(quality, latency)
+        ]
+    return trials.sort_values(['rung', metric], ascending=[False, not higher_is_better]) \
+                 .reset_index(drop=True)
+
+
+def save_tuning_results(best_params: dict, trials: dict, output_dir=None) -> Path:
+    """
+    Write best_params.json ({stage: params}) and {stage}_trials.csv.
+    Stages already in best_params.json and not re-tuned are kept.
+    """
+    output_dir = Path(output_dir or TUNING_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    params_path = output_dir / 'best_params.json'
+    merged = load_tuned_params(params_path) if params_path.exists() else {}
+    merged.update(best_params)
+    params_path.write_text(json.dumps(merged, indent=2))
+
+    for stage, table in trials.items():
+        table.to_csv(output_dir / f"{stage}_trials.csv", index=False)
+    logger.info(f"Tuning results saved to {output_dir}")
+    return params_path
+
+
+def load_tuned_params(path=None) -> dict:
+    """Read {stage: params} written by save_tuning_results."""
+    path = Path(path or TUNING_DIR / 'best_params.json')
+    return json.loads(path.read_text())
+
+
+def rung_schedule(n_candidates: int = TUNING_CANDIDATES, eta: int = TUNING_ETA,
+                  min_rounds: int = TUNING_MIN_ROUNDS, max_rounds: int = TUNING_MAX_ROUNDS) -> list:
+    """(configs, rounds) per rung, e.g. for printing the plan before a run."""
+    schedule = []
+    n, rounds = n_candidates, min_rounds
+    while True:
+        schedule.append((n, rounds))
+        if n == 1 or rounds >= max_rounds:
+            return schedule
+        n, rounds = max(1, n // eta), min(rounds * eta, max_rounds)
+
+
+def total_rounds(schedule: list) -> int:
+    """Upper bound of boosting rounds of a schedule (early stopping only lowers it)."""
+    return sum(n * rounds for n, rounds in schedule)
+
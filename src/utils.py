@@ -2,7 +2,10 @@
 Utility functions for the pillar design prediction model.
 """
 
+import hashlib
 import logging
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -79,4 +82,46 @@ def validate_dataframe(df: pd.DataFrame, required_columns: list) -> bool:
     if missing_columns:
         print(f"Missing columns: {missing_columns}")
         return False
-    return True
\ No newline at end of file
+    return True
+
+
+@contextmanager
+def timed(label: str, timings: dict):
+    """
+    Context manager that adds the elapsed wall time of the block to timings[label].
+    
+    Args:
+        label: Phase name
+        timings: Dict accumulating seconds per phase
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[label] = timings.get(label, 0.0) + time.perf_counter() - start
+
+
+# Hashes already computed, keyed by (path, mtime, size)
+_FINGERPRINTS = {}
+
+
+def file_fingerprint(path) -> str:
+    """
+    SHA-256 of a file's contents, memoized while its mtime and size are unchanged.
+    
+    Args:
+        path: File to hash (e.g. a model pickle)
+        
+    Returns:
+        Hex digest
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key not in _FINGERPRINTS:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _FINGERPRINTS[key] = digest.hexdigest()
+    return _FINGERPRINTS[key]
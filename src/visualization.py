@@ -3,55 +3,236 @@ Visualization module for Pillar Design.
 Generates decision boundary plots (Interaction Diagrams and Design Maps).
 """
 
+import json
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from .adaptive_boundary import refine_boundary
+from .frontier_cache import FrontierCache
 from .predictor import PillarPredictor
 from .utils import setup_logger, print_separator
 
 logger = setup_logger(__name__)
 
-def plot_interaction_diagram(predictor, base_pillar, n_range, m_range, n_points=50):
+
+def _grid_shape(n_points, resolution):
+    """Resolve (n_linhas, n_colunas) do grid a partir de n_points ou resolution (int ou tupla)."""
+    if resolution is None:
+        return n_points, n_points
+    if np.ndim(resolution) == 0:
+        return int(resolution), int(resolution)
+    return int(resolution[0]), int(resolution[1])
+
+
+def compute_interaction_grid(predictor, base_pillar, n_range, m_range, n_points=50, resolution=None,
+                             cache: FrontierCache = None):
+    """
+    Calcula a probabilidade de viabilidade no grid Normal x Momento.
+    
+    O grid é passado como eixos em broadcast (N em coluna, M em linha) ao
+    caminho colunar do predictor (predict_feasibility_arrays), sem dicts
+    por ponto e sem avaliar o regressor.
+    
+    cache: FrontierCache opcional; grids já calculados para os mesmos
+           parâmetros e modelos são lidos do disco.
+    
+    Returns:
+        (N_values, M_values, Z) com Z[i, j] = P(viável) em (N_values[i], M_values[j])
+    """
+    n_rows, n_cols = _grid_shape(n_points, resolution)
+    params = dict(kind='interaction_grid', base=base_pillar, n_range=n_range, m_range=m_range,
+                  shape=(n_rows, n_cols))
+    return _cached_grid(cache, predictor, params,
+                        lambda: _score_interaction_grid(predictor, base_pillar, n_range, m_range,
+                                                        n_rows, n_cols))
+
+
+def _score_interaction_grid(predictor, base_pillar, n_range, m_range, n_rows, n_cols):
+    # 1. Criar o Grid de Cargas
+    N_values = np.linspace(n_range[0], n_range[1], n_rows)
+    M_values = np.linspace(m_range[0], m_range[1], n_cols)
+    # N em coluna e M em linha: o broadcast forma o grid [iN, jM] e as
+    # sub-expressões que dependem só de N (ou só de M) são calculadas uma vez por eixo
+    N_grid, M_grid = N_values[:, None], M_values[None, :]
+    
+    # Aplica a carga no topo e base (simplificação para o gráfico):
+    # momento constante ao longo do pilar
+    inputs = {**base_pillar, 'N_top': N_grid, 'N_base': N_grid, 'Mx_top': M_grid, 'Mx_base': M_grid}
+    
+    # 2. Fazer Predição em Lote (só o classificador: o gráfico usa apenas a probabilidade)
+    probs = predictor.predict_feasibility_arrays(**inputs)
+    
+    # 3. Matriz Z = Probabilidade de Viabilidade
+    Z = probs.reshape(n_rows, n_cols)
+    return N_values, M_values, Z
+
+
+def compute_section_grid(predictor, base_loads, w_range, h_range, n_points=50, resolution=None,
+                         cache: FrontierCache = None):
+    """
+    Calcula a probabilidade de viabilidade no grid Largura x Altura.
+    
+    Returns:
+        (W_values, H_values, Z) com Z[i, j] = P(viável) em (W_values[j], H_values[i])
+    """
+    n_rows, n_cols = _grid_shape(n_points, resolution)
+    params = dict(kind='section_grid', base=base_loads, w_range=w_range, h_range=h_range,
+                  shape=(n_rows, n_cols))
+    return _cached_grid(cache, predictor, params,
+                        lambda: _score_section_grid(predictor, base_loads, w_range, h_range,
+                                                    n_rows, n_cols))
+
+
+def _score_section_grid(predictor, base_loads, w_range, h_range, n_rows, n_cols):
+    # 1. Criar o Grid de Geometria
+    W_values = np.linspace(w_range[0], w_range[1], n_cols) # Larguras (X, colunas)
+    H_values = np.linspace(h_range[0], h_range[1], n_rows) # Alturas (Y, linhas)
+    H_grid, W_grid = H_values[:, None], W_values[None, :]  # grid [iH, jW] por broadcast
+    
+    inputs = {**base_loads, 'largura': W_grid, 'Altura': H_grid}
+    
+    # 2. Fazer Predição (só o classificador)
+    probs = predictor.predict_feasibility_arrays(**inputs)
+    
+    # 3. Preparar Matriz Z
+    Z = probs.reshape(n_rows, n_cols)
+    return W_values, H_values, Z
+
+
+def compute_interaction_boundary(predictor, base_pillar, n_range, m_range, n_points=17, levels=4,
+                                 cache: FrontierCache = None):
+    """
+    Fronteira de 50% no plano Normal x Momento por refinamento adaptativo.
+    
+    x = Momento, y = Normal. Retorna o dict de refine_boundary
+    (polylines, samples, stats).
+    """
+    def prob_fn(M, N):
+        inputs = {**base_pillar, 'N_top': N, 'N_base': N, 'Mx_top': M, 'Mx_base': M}
+        return predictor.predict_feasibility_arrays(**inputs)
+    
+    params = dict(kind='interaction_boundary', base=base_pillar, n_range=n_range, m_range=m_range,
+                  n_points=n_points, levels=levels, threshold=predictor.threshold)
+    return _cached_boundary(cache, predictor, params,
+                            lambda: refine_boundary(prob_fn, m_range, n_range, coarse=n_points,
+                                                    levels=levels, threshold=predictor.threshold))
+
+
+def compute_section_boundary(predictor, base_loads, w_range, h_range, n_points=17, levels=4,
+                             cache: FrontierCache = None):
+    """
+    Fronteira de 50% no plano Largura x Altura por refinamento adaptativo.
+    
+    x = Largura, y = Altura. Retorna o dict de refine_boundary
+    (polylines, samples, stats).
+    """
+    def prob_fn(W, H):
+        return predictor.predict_feasibility_arrays(**{**base_loads, 'largura': W, 'Altura': H})
+    
+    params = dict(kind='section_boundary', base=base_loads, w_range=w_range, h_range=h_range,
+                  n_points=n_points, levels=levels, threshold=predictor.threshold)
+    return _cached_boundary(cache, predictor, params,
+                            lambda: refine_boundary(prob_fn, w_range, h_range, coarse=n_points,
+                                                    levels=levels, threshold=predictor.threshold))
+
+
+def _cached_grid(cache, predictor, params, compute):
+    """Lê (x, y, Z) do cache em disco ou calcula e grava."""
+    if cache is None:
+        return compute()
+    
+    key = cache.key(**params, model=predictor.model_fingerprint)
+    arrays = cache.get(key)
+    if arrays is not None:
+        return arrays['x'], arrays['y'], arrays['Z']
+    
+    x_values, y_values, Z = compute()
+    cache.put(key, {'x': x_values, 'y': y_values, 'Z': Z})
+    return x_values, y_values, Z
+
+
+def _cached_boundary(cache, predictor, params, compute):
+    """Lê o resultado de refine_boundary do cache em disco ou calcula e grava."""
+    if cache is None:
+        return compute()
+    
+    key = cache.key(**params, model=predictor.model_fingerprint)
+    arrays = cache.get(key)
+    if arrays is not None:
+        points = arrays['points']
+        return {
+            'polylines': np.split(points, arrays['offsets']) if len(points) else [],
+            'samples': pd.DataFrame({'x': arrays['x'], 'y': arrays['y'], 'prob': arrays['prob']}),
+            'stats': json.loads(str(arrays['stats'])),
+        }
+    
+    result = compute()
+    # Polilinhas concatenadas + posições de corte (np.split na leitura)
+    lengths = [len(line) for line in result['polylines']]
+    samples = result['samples']
+    cache.put(key, {
+        'points': np.concatenate(result['polylines']) if lengths else np.empty((0, 2)),
+        'offsets': np.cumsum(lengths)[:-1],
+        'x': samples['x'].values,
+        'y': samples['y'].values,
+        'prob': samples['prob'].values,
+        'stats': np.array(json.dumps(result['stats'])),
+    })
+    return result
+
+
+def _plot_adaptive(result, label):
+    """Nuvem de amostras coloridas pela probabilidade + polilinhas da fronteira."""
+    samples = result['samples']
+    plt.scatter(samples['x'], samples['y'], c=samples['prob'], cmap='RdYlGn',
+                vmin=0, vmax=1, s=4, alpha=0.8)
+    plt.colorbar(label='Probabilidade de Viabilidade')
+    for i, line in enumerate(result['polylines']):
+        plt.plot(line[:, 0], line[:, 1], color='black', linewidth=2,
+                 label=label if i == 0 else None)
+    if result['polylines']:
+        plt.legend(loc='best')
+    
+    stats = result['stats']
+    print(f"Refinamento adaptativo: {stats['n_evaluations']} avaliações vs "
+          f"{stats['uniform_equivalent']} do grid uniforme {stats['resolution'][0]}x{stats['resolution'][1]} "
+          f"({stats['fraction_of_uniform']:.1%})")
+
+
+def plot_interaction_diagram(predictor, base_pillar, n_range, m_range, n_points=50, resolution=None,
+                             adaptive=False, levels=4, cache: FrontierCache = None):
     """
     Gera um Diagrama de Interação (Normal x Momento) para um pilar fixo.
     Mostra a região de segurança (Viável) vs Falha.
+    
+    resolution: int ou (n_N, n_M); substitui n_points (ex: 500 para 500x500).
+    adaptive: refina só perto da fronteira; n_points vira o grid inicial e
+              levels o número de subdivisões (ver refine_boundary).
+    cache: FrontierCache opcional para reaproveitar grids/fronteiras já calculados.
     """
     print_separator("GERANDO DIAGRAMA DE INTERAÇÃO (N x M)")
     
-    # 1. Criar o Grid de Cargas
-    N_values = np.linspace(n_range[0], n_range[1], n_points)
-    M_values = np.linspace(m_range[0], m_range[1], n_points)
-    
-    batch_data = []
-    for N in N_values:
-        for M in M_values:
-            # Copia o pilar base e altera as cargas
-            pilar = base_pillar.copy()
-            # Aplica a carga no topo e base (simplificação para o gráfico)
-            pilar['N_top'] = N
-            pilar['N_base'] = N
-            pilar['Mx_top'] = M
-            pilar['Mx_base'] = M # Considerando momento constante para simplificar visualização
-            batch_data.append(pilar)
-            
-    # 2. Fazer Predição em Lote
-    df_results = predictor.predict_batch(batch_data)
-    
-    # 3. Preparar dados para o Heatmap
-    # Queremos uma matriz onde Z = Probabilidade de Viabilidade
-    Z = df_results['prob_feasible'].values.reshape(n_points, n_points)
-    
-    # 4. Plotar
     plt.figure(figsize=(10, 8))
     
-    # Heatmap de Probabilidade
-    plt.contourf(M_values, N_values, Z, levels=20, cmap='RdYlGn', alpha=0.8)
-    plt.colorbar(label='Probabilidade de Sucesso (%)')
-    
-    # Linha de Fronteira (Probabilidade = 50%)
-    cs = plt.contour(M_values, N_values, Z, levels=[0.5], colors='black', linewidths=2)
-    plt.clabel(cs, fmt='Fronteira (50%%)', inline=True)
+    if adaptive:
+        result = compute_interaction_boundary(predictor, base_pillar, n_range, m_range,
+                                              n_points=n_points, levels=levels, cache=cache)
+        _plot_adaptive(result, 'Fronteira (50%)')
+    else:
+        N_values, M_values, Z = compute_interaction_grid(
+            predictor, base_pillar, n_range, m_range, n_points, resolution, cache=cache
+        )
+        result = (N_values, M_values, Z)
+        
+        # Heatmap de Probabilidade
+        plt.contourf(M_values, N_values, Z, levels=20, cmap='RdYlGn', alpha=0.8)
+        plt.colorbar(label='Probabilidade de Sucesso (%)')
+        
+        # Linha de Fronteira (Probabilidade = 50%)
+        cs = plt.contour(M_values, N_values, Z, levels=[0.5], colors='black', linewidths=2)
+        plt.clabel(cs, fmt='Fronteira (50%%)', inline=True)
     
     plt.title(f"Fronteira de Resistência - Pilar {base_pillar['largura']}x{base_pillar['Altura']} cm")
     plt.xlabel('Momento Fletor (kNm)')
@@ -62,46 +243,43 @@ def plot_interaction_diagram(predictor, base_pillar, n_range, m_range, n_points=
     plt.savefig(filename)
     print(f"Gráfico salvo como: {filename}")
     plt.close()
+    
+    return result
 
 
-def plot_section_boundary(predictor, base_loads, w_range, h_range, n_points=50):
+def plot_section_boundary(predictor, base_loads, w_range, h_range, n_points=50, resolution=None,
+                          adaptive=False, levels=4, cache: FrontierCache = None):
     """
     Gera um Mapa de Otimização (Largura x Altura) para cargas fixas.
     Mostra qual seção mínima é necessária.
+    
+    resolution: int ou (n_H, n_W); substitui n_points (ex: 500 para 500x500).
+    adaptive: refina só perto da fronteira; n_points vira o grid inicial e
+              levels o número de subdivisões (ver refine_boundary).
+    cache: FrontierCache opcional para reaproveitar grids/fronteiras já calculados.
     """
     print_separator("GERANDO MAPA DE OTIMIZAÇÃO (Seção B x H)")
     
-    # 1. Criar o Grid de Geometria
-    W_values = np.linspace(w_range[0], w_range[1], n_points) # Larguras
-    H_values = np.linspace(h_range[0], h_range[1], n_points) # Alturas
-    
-    batch_data = []
-    for H in H_values: # Y axis (rows)
-        for W in W_values: # X axis (cols)
-            pilar = base_loads.copy()
-            pilar['largura'] = W
-            pilar['Altura'] = H
-            # As precisa existir no dicionário, mesmo que seja dummy para predição
-            if 'As' not in pilar: pilar['As'] = 0 
-            batch_data.append(pilar)
-            
-    # 2. Fazer Predição
-    df_results = predictor.predict_batch(batch_data)
-    
-    # 3. Preparar Matriz Z
-    Z_prob = df_results['prob_feasible'].values.reshape(n_points, n_points)
-    
-    # 4. Plotar
     plt.figure(figsize=(10, 8))
     
-    # Heatmap
-    # Nota: Usamos 'RdYlGn' (Vermelho=Ruim, Verde=Bom)
-    plt.contourf(W_values, H_values, Z_prob, levels=20, cmap='RdYlGn', alpha=0.8)
-    plt.colorbar(label='Probabilidade de Viabilidade')
-    
-    # Linha de Decisão
-    cs = plt.contour(W_values, H_values, Z_prob, levels=[0.5], colors='black', linewidths=2, linestyles='--')
-    plt.clabel(cs, fmt='Limiar 50%%', inline=True)
+    if adaptive:
+        result = compute_section_boundary(predictor, base_loads, w_range, h_range,
+                                          n_points=n_points, levels=levels, cache=cache)
+        _plot_adaptive(result, 'Limiar 50%')
+    else:
+        W_values, H_values, Z_prob = compute_section_grid(
+            predictor, base_loads, w_range, h_range, n_points, resolution, cache=cache
+        )
+        result = (W_values, H_values, Z_prob)
+        
+        # Heatmap
+        # Nota: Usamos 'RdYlGn' (Vermelho=Ruim, Verde=Bom)
+        plt.contourf(W_values, H_values, Z_prob, levels=20, cmap='RdYlGn', alpha=0.8)
+        plt.colorbar(label='Probabilidade de Viabilidade')
+        
+        # Linha de Decisão
+        cs = plt.contour(W_values, H_values, Z_prob, levels=[0.5], colors='black', linewidths=2, linestyles='--')
+        plt.clabel(cs, fmt='Limiar 50%%', inline=True)
     
     plt.title(f"Fronteira de Design - Carga N={base_loads['N_top']}kN, M={base_loads['Mx_top']}kNm")
     plt.xlabel('Largura (cm)')
@@ -112,6 +290,8 @@ def plot_section_boundary(predictor, base_loads, w_range, h_range, n_points=50):
     plt.savefig(filename)
     print(f"Gráfico salvo como: {filename}")
     plt.close()
+    
+    return result
 
 if __name__ == "__main__":
     # Teste rápido se rodar o arquivo diretamente
@@ -119,7 +299,7 @@ if __name__ == "__main__":
     
     # Cargas de Teste (Pilar Real do seu CSV)
     cargas_reais = {
-        'fck': 50, 'PeDireito': 200,
+        'fck': 50, 'PeDireito': 200, 'Cobrimento': 2.5,
         'N_top': 27, 'Mx_top': 3, 'My_top': -28,
         'N_base': 27, 'Mx_base': -19, 'My_base': 0,
         'As': 0
@@ -133,4 +313,4 @@ if __name__ == "__main__":
     pilar_base['largura'] = 20
     pilar_base['Altura'] = 20
     # Variando Normal de 0 a 2000 kN, Momento de 0 a 200 kNm
-    plot_interaction_diagram(predictor, pilar_base, n_range=(0, 3000), m_range=(0, 300))
\ No newline at end of file
+    plot_interaction_diagram(predictor, pilar_base, n_range=(0, 3000), m_range=(0, 300))